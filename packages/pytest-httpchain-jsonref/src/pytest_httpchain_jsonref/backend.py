@@ -0,0 +1,161 @@
+"""Pluggable JSON encoding/decoding backends.
+
+The standard library json module is always available and used by default.
+Accelerated parsers (orjson, msgspec) are used if installed and selected,
+either explicitly by name or with "auto" for the first installed one. They
+differ from json on edge cases, so results may change when switching:
+
+- integers beyond 64 bits are rejected or parsed as floats;
+- NaN, Infinity and out of range floats like 1e400 are rejected when parsing,
+  orjson encodes NaN as null where json raises ValueError;
+- dict keys other than strings and integers beyond 64 bits raise TypeError when encoding.
+
+All backends raise json.JSONDecodeError (or UnicodeDecodeError for undecodable
+bytes) on invalid input, so callers don't need to know which backend is active.
+"""
+
+import importlib.util
+import json
+from typing import Any
+
+
+class JsonBackend:
+    """Stdlib JSON backend and base class for other backends."""
+
+    name = "json"
+    module: str | None = None
+
+    @classmethod
+    def available(cls) -> bool:
+        """Check if the backend's library is installed."""
+        return cls.module is None or importlib.util.find_spec(cls.module) is not None
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode JSON document.
+
+        Args:
+            data: JSON document as text or UTF-8 encoded bytes
+
+        Returns:
+            Decoded Python object
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode Python object as compact UTF-8 JSON.
+
+        Args:
+            obj: Object to encode
+
+        Returns:
+            Encoded JSON document
+
+        Raises:
+            TypeError: If the object is not JSON-serializable
+            ValueError: If the object contains out of range floats
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+
+class OrjsonBackend(JsonBackend):
+    """JSON backend using orjson."""
+
+    name = "orjson"
+    module = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+
+class MsgspecBackend(JsonBackend):
+    """JSON backend using msgspec."""
+
+    name = "msgspec"
+    module = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decode_error = msgspec.DecodeError
+        self._encode_error = msgspec.EncodeError
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: str | bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as e:
+            raise json.JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except self._encode_error as e:
+            raise TypeError(str(e)) from e
+
+
+# Known backends, in order of preference for "auto"
+BACKENDS: dict[str, type[JsonBackend]] = {
+    OrjsonBackend.name: OrjsonBackend,
+    MsgspecBackend.name: MsgspecBackend,
+    JsonBackend.name: JsonBackend,
+}
+
+_current: JsonBackend | None = None
+
+
+def create_backend(name: str = JsonBackend.name) -> JsonBackend:
+    """Create a backend instance.
+
+    Args:
+        name: Backend name from BACKENDS, or "auto" for the first available one
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend is unknown or its library is not installed
+    """
+    if name == "auto":
+        backend_cls = next(cls for cls in BACKENDS.values() if cls.available())
+        return backend_cls()
+
+    backend_cls = BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(f"Unknown JSON backend '{name}', expected one of: auto, {', '.join(BACKENDS)}")
+    if not backend_cls.available():
+        raise ValueError(f"JSON backend '{name}' requires '{backend_cls.module}' package to be installed")
+    return backend_cls()
+
+
+def set_backend(name: str = JsonBackend.name) -> JsonBackend:
+    """Select the backend used by get_backend().
+
+    Args:
+        name: Backend name from BACKENDS, or "auto" for the first available one
+
+    Returns:
+        Selected backend instance
+
+    Raises:
+        ValueError: If the backend is unknown or its library is not installed
+    """
+    global _current
+    _current = create_backend(name)
+    return _current
+
+
+def get_backend() -> JsonBackend:
+    """Get the active backend, selecting the stdlib one if none was set."""
+    return _current if _current is not None else set_backend()
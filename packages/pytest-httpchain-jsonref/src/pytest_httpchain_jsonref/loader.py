@@ -1,17 +1,20 @@
 """JSON file loading with reference resolution."""
 
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
+from pytest_httpchain_jsonref.plumbing.cache import DocumentCache
 from pytest_httpchain_jsonref.plumbing.reference import ReferenceResolver
 
 
-def load_json(path: Path, max_parent_traversal_depth: int = 3) -> dict[str, Any]:
+def load_json(path: Path, max_parent_traversal_depth: int = 3, cache: DocumentCache | None = None) -> dict[str, Any]:
     """Load JSON from file and resolve all $ref statements with circular reference protection.
 
     Args:
         path: Path to the JSON file to load
         max_parent_traversal_depth: Maximum number of parent directory traversals allowed in $ref paths
+        cache: Document cache to share parsed referenced files between calls
 
     Returns:
         Dictionary with all $ref statements resolved
@@ -19,5 +22,45 @@ def load_json(path: Path, max_parent_traversal_depth: int = 3) -> dict[str, Any]
     Raises:
         ReferenceResolverError: If the file cannot be loaded or parsed, if merge conflicts occur, or if circular references are detected
     """
-    resolver = ReferenceResolver(max_parent_traversal_depth)
-    return resolver.resolve_file(path)
+    data, _ = load_json_with_dependencies(path, max_parent_traversal_depth, cache)
+    return data
+
+
+def load_json_with_dependencies(path: Path, max_parent_traversal_depth: int = 3, cache: DocumentCache | None = None) -> tuple[dict[str, Any], set[Path]]:
+    """Load JSON from file, resolve all $ref statements and report every file involved.
+
+    Args:
+        path: Path to the JSON file to load
+        max_parent_traversal_depth: Maximum number of parent directory traversals allowed in $ref paths
+        cache: Document cache to share parsed referenced files between calls
+
+    Returns:
+        Tuple of the resolved dictionary and the set of resolved paths of all files read,
+        including the file itself and every file pulled in through $ref
+
+    Raises:
+        ReferenceResolverError: If the file cannot be loaded or parsed, if merge conflicts occur, or if circular references are detected
+    """
+    resolver = ReferenceResolver(max_parent_traversal_depth, cache)
+    data = resolver.resolve_file(path)
+    return data, resolver.loaded_files
+
+
+def invalidate(paths: Iterable[Path], cache: DocumentCache) -> set[Path]:
+    """Drop changed files from the cache and find documents affected by the change.
+
+    Only the returned documents need to be loaded again. Loading them with the same
+    cache re-resolves just the references depending on changed files; everything else
+    is taken from the cache.
+
+    Args:
+        paths: Paths of changed files
+        cache: Document cache the documents were loaded with
+
+    Returns:
+        Resolved paths of previously loaded documents depending on any of the changed files
+    """
+    affected: set[Path] = set()
+    for path in paths:
+        affected |= cache.invalidate(path.resolve())
+    return affected
@@ -0,0 +1,160 @@
+"""Shared document cache for reference resolution."""
+
+import os
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any
+
+from pytest_httpchain_jsonref.backend import get_backend
+from pytest_httpchain_jsonref.plumbing.graph import RefGraph
+from pytest_httpchain_jsonref.plumbing.path import PathValidator
+from pytest_httpchain_jsonref.plumbing.tree import find_ref_containers
+
+Stamp = tuple[int, int]
+
+
+def _stamp(path: Path) -> Stamp:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DocumentCache:
+    """Caches parsed documents, JSON pointer lookups, validated reference paths and resolved fragments.
+
+    A single cache instance can be shared by any number of resolvers, e.g. for the
+    whole test session. Cached documents and resolved fragments are shared with
+    resolution results and must be treated as read-only.
+
+    A document is re-read if its modification time or size changed since it was parsed;
+    all pointer lookups into it and all resolved fragments depending on it are dropped
+    at the same time.
+
+    The cache also holds the RefGraph of all references resolved through it, used
+    to find documents that need to be resolved again when files change.
+    """
+
+    def __init__(self):
+        self._documents: dict[Path, tuple[Stamp, Any, set[int]]] = {}
+        self._pointers: dict[tuple[Path, str], Any] = {}
+        self._ref_paths: dict[tuple[str, Path, Path, int], Path] = {}
+        self._resolved: dict[Hashable, tuple[Any, dict[Path, Stamp]]] = {}
+        self.graph = RefGraph()
+
+    def load(self, path: Path) -> tuple[Any, set[int]]:
+        """Return parsed content of a JSON file, parsing it only if needed.
+
+        The document and its ref containers come from the same cache entry, so they
+        always belong together even if the file changes between calls.
+
+        Args:
+            path: Resolved path to the JSON file
+
+        Returns:
+            Tuple of parsed document and ids of its containers having a $ref inside, see find_ref_containers
+
+        Raises:
+            OSError: If the file cannot be read
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        _, data, ref_containers = self._load(path)
+        return data, ref_containers
+
+    def _load(self, path: Path) -> tuple[Stamp, Any, set[int]]:
+        stamp = _stamp(path)
+
+        cached = self._documents.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached
+
+        self.invalidate(path)
+        with open(path, "rb") as f:
+            data = get_backend().loads(f.read())
+        entry = (stamp, data, find_ref_containers(data))
+        self._documents[path] = entry
+        return entry
+
+    def navigate(self, path: Path, pointer: str, navigate: Callable[[], Any]) -> Any:
+        """Return the node a JSON pointer refers to within a cached document.
+
+        Args:
+            path: Path of the document the pointer refers into
+            pointer: JSON pointer
+            navigate: Function performing the actual lookup on cache miss
+
+        Returns:
+            The referenced node
+        """
+        key = (path, pointer)
+        if key not in self._pointers:
+            self._pointers[key] = navigate()
+        return self._pointers[key]
+
+    def validate_ref_path(self, ref_path: str, base_path: Path, root_path: Path, max_parent_traversal_depth: int) -> Path:
+        """Memoized version of PathValidator.validate_ref_path.
+
+        Only successful validations are memoized, so an invalid path raises every time.
+        """
+        key = (ref_path, base_path, root_path, max_parent_traversal_depth)
+        resolved_path = self._ref_paths.get(key)
+        if resolved_path is None:
+            resolved_path = PathValidator.validate_ref_path(ref_path, base_path, root_path, max_parent_traversal_depth)
+            self._ref_paths[key] = resolved_path
+        return resolved_path
+
+    def get_resolved(self, key: Hashable) -> tuple[Any, set[Path]] | None:
+        """Return a previously resolved fragment if none of its files changed.
+
+        Args:
+            key: Fragment key used with set_resolved
+
+        Returns:
+            Tuple of resolved fragment and the files it was resolved from, or None
+        """
+        entry = self._resolved.get(key)
+        if entry is None:
+            return None
+
+        value, stamps = entry
+        try:
+            if all(_stamp(path) == stamp for path, stamp in stamps.items()):
+                return value, set(stamps)
+        except OSError:
+            pass
+
+        del self._resolved[key]
+        return None
+
+    def set_resolved(self, key: Hashable, value: Any, files: set[Path]) -> None:
+        """Remember a resolved fragment so other references to it can share it.
+
+        Args:
+            key: Fragment key
+            value: Resolved fragment
+            files: All files the fragment was resolved from
+        """
+        stamps = {path: self._documents[path][0] if path in self._documents else _stamp(path) for path in files}
+        self._resolved[key] = (value, stamps)
+
+    def invalidate(self, path: Path) -> set[Path]:
+        """Drop a document with all pointer lookups into it and all fragments resolved from it.
+
+        Args:
+            path: Resolved path to the document
+
+        Returns:
+            Paths of root documents depending on the document, which need to be resolved again
+        """
+        self._documents.pop(path, None)
+        for key in [key for key in self._pointers if key[0] == path]:
+            del self._pointers[key]
+        for key in [key for key, (_, stamps) in self._resolved.items() if path in stamps]:
+            del self._resolved[key]
+        return self.graph.affected_roots(path)
+
+    def clear(self) -> None:
+        """Drop everything cached."""
+        self._documents.clear()
+        self._pointers.clear()
+        self._ref_paths.clear()
+        self._resolved.clear()
+        self.graph = RefGraph()
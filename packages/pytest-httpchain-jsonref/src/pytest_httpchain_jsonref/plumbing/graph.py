@@ -0,0 +1,127 @@
+"""Reference dependency graph for reference resolution."""
+
+from collections import defaultdict
+from pathlib import Path
+
+from pytest_httpchain_jsonref.exceptions import ReferenceResolverError
+
+# Node is a location in a document: file and JSON pointer ("" for the whole document).
+# File is None for documents resolved from memory.
+Node = tuple[Path | None, str]
+
+
+def _format_node(node: Node) -> str:
+    path, pointer = node
+    return f"{path or ''}#{pointer}"
+
+
+class RefGraph:
+    """Dependency graph of JSON references.
+
+    Nodes are locations in documents, edges are $refs from the location being
+    resolved to the location it references. Edges are recorded during resolution
+    and kept across resolutions, so the graph can tell which documents need to
+    be resolved again when a file changes.
+    """
+
+    def __init__(self):
+        self._edges: dict[Node, set[Node]] = defaultdict(set)
+        self._reverse: dict[Node, set[Node]] = defaultdict(set)
+        self._nodes_by_file: dict[Path | None, set[Node]] = defaultdict(set)
+        self.roots: set[Path] = set()
+
+    def add_root(self, path: Path) -> None:
+        """Register a document resolved from a file as a root of the graph.
+
+        Args:
+            path: Resolved path to the document
+        """
+        self.roots.add(path)
+
+    def add_ref(self, source: Node, target: Node) -> None:
+        """Record a reference.
+
+        Args:
+            source: Location being resolved when the reference was found
+            target: Referenced location
+        """
+        self._edges[source].add(target)
+        self._reverse[target].add(source)
+        self._nodes_by_file[source[0]].add(source)
+        self._nodes_by_file[target[0]].add(target)
+
+    def clear_refs(self, source: Node) -> None:
+        """Forget references from a location before it is resolved again.
+
+        Args:
+            source: Location about to be resolved
+        """
+        for target in self._edges.pop(source, ()):
+            self._reverse[target].discard(source)
+
+    def dependents(self, path: Path) -> set[Path]:
+        """Find all files depending on a file, directly or through other files.
+
+        Args:
+            path: Resolved path to the file
+
+        Returns:
+            Paths of dependent files, including the file itself
+        """
+        seen = set(self._nodes_by_file.get(path, ()))
+        pending = list(seen)
+        while pending:
+            for source in self._reverse.get(pending.pop(), ()):
+                if source not in seen:
+                    seen.add(source)
+                    pending.append(source)
+
+        return {path} | {node_path for node_path, _ in seen if node_path is not None}
+
+    def affected_roots(self, path: Path) -> set[Path]:
+        """Find root documents that need to be resolved again if a file changes.
+
+        Args:
+            path: Resolved path to the changed file
+
+        Returns:
+            Paths of root documents depending on the file, including the file itself if it is a root
+        """
+        return self.dependents(path) & self.roots
+
+
+class ResolutionPath:
+    """Path from the document root to the location currently being resolved.
+
+    A reference to a location already on the path is circular. The path is
+    shared by a resolver and all its child resolvers, each reference pushes
+    its target on entry and pops it on exit.
+    """
+
+    def __init__(self):
+        self._nodes: list[Node] = []
+        self._active: set[Node] = set()
+
+    @property
+    def current(self) -> Node | None:
+        """Location currently being resolved."""
+        return self._nodes[-1] if self._nodes else None
+
+    def enter(self, node: Node) -> None:
+        """Start resolving a location.
+
+        Args:
+            node: Location being resolved
+
+        Raises:
+            ReferenceResolverError: If the location is already being resolved
+        """
+        if node in self._active:
+            cycle = self._nodes[self._nodes.index(node) :] + [node]
+            raise ReferenceResolverError(f"Circular reference detected: {' -> '.join(_format_node(n) for n in cycle)}")
+        self._nodes.append(node)
+        self._active.add(node)
+
+    def leave(self) -> None:
+        """Finish resolving the current location."""
+        self._active.discard(self._nodes.pop())
@@ -6,24 +6,42 @@ from functools import reduce
 from pathlib import Path
 from typing import Any, Self
 
-from deepmerge import always_merger
-
+from pytest_httpchain_jsonref.backend import get_backend
 from pytest_httpchain_jsonref.exceptions import ReferenceResolverError
-from pytest_httpchain_jsonref.plumbing.circular import CircularDependencyTracker
+from pytest_httpchain_jsonref.plumbing.cache import DocumentCache
+from pytest_httpchain_jsonref.plumbing.graph import ResolutionPath
 from pytest_httpchain_jsonref.plumbing.path import PathValidator
+from pytest_httpchain_jsonref.plumbing.tree import find_ref_containers, merge
 
 REF_PATTERN = re.compile(r"^(?P<file>[^#]+)?(?:#(?P<pointer>/.*))?$")
 
 
 class ReferenceResolver:
-    """Resolves JSON references ($ref) in documents."""
+    """Resolves JSON references ($ref) in documents.
+
+    Referenced files are read through a DocumentCache. Pass a shared cache to reuse
+    parsed documents across resolvers; otherwise each resolver (and its children) use
+    a private one.
+
+    Resolution does not copy what it doesn't have to: subtrees without any $ref are
+    returned as-is, and every reference to the same external fragment gets the same
+    resolved object. Results share structure with cached documents and with each
+    other, so they must be treated as read-only.
+
+    Every $ref is recorded in the cache's RefGraph, which is also used to find
+    documents affected by a changed file.
+    """
 
-    def __init__(self, max_parent_traversal_depth: int = 3):
+    def __init__(self, max_parent_traversal_depth: int = 3, cache: DocumentCache | None = None):
         self.max_parent_traversal_depth = max_parent_traversal_depth
         self.path_validator = PathValidator()
-        self.tracker = CircularDependencyTracker()
+        self.cache = cache if cache is not None else DocumentCache()
+        self.resolution_path = ResolutionPath()
+        self.document_path: Path | None = None
         self.base_path: Path | None = None
         self.root_path: Path | None = None
+        self.loaded_files: set[Path] = set()
+        self.ref_containers: set[int] = set()
 
     def resolve_document(self, data: dict[str, Any], base_path: Path) -> dict[str, Any]:
         """Resolve all references in a document.
@@ -39,7 +57,18 @@ class ReferenceResolver:
             ReferenceResolverError: If resolution fails
         """
         self.base_path = base_path
-        return self._resolve_refs(data, base_path, root_data=data)
+        self.ref_containers = find_ref_containers(data)
+
+        root_node = (self.document_path, "")
+        if self.document_path is not None:
+            self.cache.graph.add_root(self.document_path)
+            self.cache.graph.clear_refs(root_node)
+
+        self.resolution_path.enter(root_node)
+        try:
+            return self._resolve_refs(data, base_path, root_data=data)
+        finally:
+            self.resolution_path.leave()
 
     def resolve_file(self, path: Path) -> dict[str, Any]:
         """Load a JSON file and resolve all references.
@@ -54,13 +83,15 @@ class ReferenceResolver:
             ReferenceResolverError: If the file cannot be loaded or references cannot be resolved
         """
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
+            with open(path, "rb") as f:
+                data = get_backend().loads(f.read())
 
+            self.document_path = path.resolve()
+            self.loaded_files.add(self.document_path)
             self.root_path = path.parent
             return self.resolve_document(data, path.parent)
 
-        except (OSError, json.JSONDecodeError) as e:
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
             raise ReferenceResolverError(f"Failed to load JSON from {path}: {e}") from e
 
     def _resolve_refs(
@@ -70,6 +101,9 @@ class ReferenceResolver:
         root_data: Any,
     ) -> Any:
         match data:
+            case dict() | list() if id(data) not in self.ref_containers:
+                # No references inside, nothing to rebuild
+                return data
             case dict() if "$ref" in data:
                 return self._resolve_single_ref(data, current_path, root_data)
             case dict():
@@ -97,7 +131,7 @@ class ReferenceResolver:
         if file_path:
             referenced_data = self._resolve_external_ref(file_path, pointer, current_path)
         else:
-            referenced_data = self._resolve_internal_ref(pointer, root_data)
+            referenced_data = self._resolve_internal_ref(pointer, current_path, root_data)
 
         return self._merge_with_siblings(data, referenced_data, current_path, root_data)
 
@@ -107,35 +141,58 @@ class ReferenceResolver:
         pointer: str,
         current_path: Path,
     ) -> Any:
-        resolved_path = self.path_validator.validate_ref_path(file_path, current_path, self.root_path or current_path, self.max_parent_traversal_depth)
+        resolved_path = self.cache.validate_ref_path(file_path, current_path, self.root_path or current_path, self.max_parent_traversal_depth)
 
-        self.tracker.check_external_ref(resolved_path, pointer)
+        node = (resolved_path, pointer)
+        self._add_ref(node)
+        self.resolution_path.enter(node)
 
         try:
-            full_external_data = self._load_json_file(resolved_path)
-            external_data = self._navigate_pointer(full_external_data, pointer) if pointer else full_external_data
-
-            child_resolver = self._create_child_resolver()
+            # Fragment resolution depends on the root path through path validation
+            fragment_key = (resolved_path, pointer, self.root_path, self.max_parent_traversal_depth)
+            resolved_fragment = self.cache.get_resolved(fragment_key)
+            if resolved_fragment is not None:
+                result, files = resolved_fragment
+                self.loaded_files.update(files)
+                return result
+
+            full_external_data, ref_containers = self.cache.load(resolved_path)
+            external_data = self.cache.navigate(resolved_path, pointer, lambda: self._navigate_pointer(full_external_data, pointer)) if pointer else full_external_data
+
+            self.cache.graph.clear_refs(node)
+            child_resolver = self._create_child_resolver(resolved_path, ref_containers)
             result = child_resolver._resolve_refs(external_data, resolved_path.parent, root_data=full_external_data)
+
+            self.cache.set_resolved(fragment_key, result, child_resolver.loaded_files)
+            self.loaded_files.update(child_resolver.loaded_files)
             return result
 
-        except (OSError, json.JSONDecodeError) as e:
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
             raise ReferenceResolverError(f"Failed to load external reference {file_path}: {e}") from e
         finally:
-            self.tracker.clear_external_ref(resolved_path, pointer)
+            self.resolution_path.leave()
 
     def _resolve_internal_ref(
         self,
         pointer: str,
+        current_path: Path,
         root_data: Any,
     ) -> Any:
-        self.tracker.check_internal_ref(pointer)
+        node = (self.document_path, pointer)
+        self._add_ref(node)
+        self.resolution_path.enter(node)
 
         try:
             referenced_data = self._navigate_pointer(root_data, pointer)
-            return self._resolve_refs(referenced_data, self.base_path, root_data)
+            return self._resolve_refs(referenced_data, current_path, root_data)
         finally:
-            self.tracker.clear_internal_ref(pointer)
+            self.resolution_path.leave()
+
+    def _add_ref(self, target: tuple[Path | None, str]) -> None:
+        """Record a reference from the location being resolved in the graph."""
+        source = self.resolution_path.current
+        if source is not None and source[0] is not None:
+            self.cache.graph.add_ref(source, target)
 
     def _navigate_pointer(self, data: Any, pointer: str) -> Any:
         if not pointer:
@@ -165,22 +222,25 @@ class ReferenceResolver:
                 raise ReferenceResolverError("Cannot merge non-dict reference with sibling properties")
             return referenced_data
 
-        resolved_siblings = self._resolve_refs(siblings, current_path, root_data)
+        resolved_siblings = {key: self._resolve_refs(value, current_path, root_data) for key, value in siblings.items()}
 
         self._detect_merge_conflicts(referenced_data, resolved_siblings)
 
-        return always_merger.merge(referenced_data, resolved_siblings)
+        # Referenced data may be shared, merge without modifying it
+        return merge(referenced_data, resolved_siblings)
 
-    def _load_json_file(self, path: Path) -> dict[str, Any]:
-        """Load JSON file content."""
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
+    def _create_child_resolver(self, path: Path, ref_containers: set[int]) -> Self:
+        """Create a child resolver for an external document with inherited state.
 
-    def _create_child_resolver(self) -> Self:
-        """Create a child resolver with inherited state."""
-        child_resolver = type(self)(self.max_parent_traversal_depth)
-        child_resolver.tracker = self.tracker.create_child_tracker()
+        The child tracks the files it reads in its own set, so they can be
+        remembered along with the resolved fragment.
+        """
+        child_resolver = type(self)(self.max_parent_traversal_depth, self.cache)
+        child_resolver.resolution_path = self.resolution_path
+        child_resolver.document_path = path
         child_resolver.root_path = self.root_path
+        child_resolver.loaded_files = {path}
+        child_resolver.ref_containers = ref_containers
         return child_resolver
 
     def _detect_merge_conflicts(
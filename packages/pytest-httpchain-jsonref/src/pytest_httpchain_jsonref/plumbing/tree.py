@@ -0,0 +1,63 @@
+"""Helpers for working with parsed JSON trees without copying them."""
+
+from typing import Any
+
+
+def find_ref_containers(data: Any) -> set[int]:
+    """Find all containers that have a $ref somewhere inside them.
+
+    Subtrees that are not in the result have no references and can be used as-is.
+    The result holds object ids, so it is only meaningful while the document is alive.
+
+    Args:
+        data: Parsed JSON document
+
+    Returns:
+        Ids of dicts and lists that contain a $ref at any depth, including themselves
+    """
+    containers: set[int] = set()
+
+    def scan(node: Any) -> bool:
+        match node:
+            case dict():
+                has_ref = "$ref" in node
+                for value in node.values():
+                    has_ref = scan(value) or has_ref
+            case list():
+                has_ref = False
+                for item in node:
+                    has_ref = scan(item) or has_ref
+            case _:
+                return False
+
+        if has_ref:
+            containers.add(id(node))
+        return has_ref
+
+    scan(data)
+    return containers
+
+
+def merge(base: Any, overlay: Any) -> Any:
+    """Deep merge two values without modifying either of them.
+
+    Dicts are merged recursively, lists are concatenated, anything else is replaced
+    by the overlay. Parts of base not touched by the overlay are shared, not copied.
+
+    Args:
+        base: Base value
+        overlay: Value merged on top of base
+
+    Returns:
+        Merged value
+    """
+    if isinstance(base, dict) and isinstance(overlay, dict):
+        merged = dict(base)
+        for key, value in overlay.items():
+            merged[key] = merge(base[key], value) if key in base else value
+        return merged
+
+    if isinstance(base, list) and isinstance(overlay, list):
+        return base + overlay
+
+    return overlay
@@ -1,6 +1,11 @@
+import json
+
 import pytest
+import pytest_httpchain_jsonref.backend
+from pytest_httpchain_jsonref.backend import JsonBackend, create_backend
 from pytest_httpchain_jsonref.exceptions import ReferenceResolverError
-from pytest_httpchain_jsonref.loader import load_json
+from pytest_httpchain_jsonref.loader import invalidate, load_json, load_json_with_dependencies
+from pytest_httpchain_jsonref.plumbing.cache import DocumentCache
 
 
 class TestLoadJson:
@@ -63,3 +68,136 @@ class TestLoadJson:
         json_file = datadir / "case_merge_conflict_simple.json"
         with pytest.raises(ReferenceResolverError, match="Merge conflict"):
             load_json(json_file)
+
+
+class TestDocumentCache:
+    @pytest.fixture
+    def parsed_documents(self, monkeypatch):
+        parsed = []
+
+        class CountingBackend(JsonBackend):
+            def loads(self, data):
+                parsed.append(data)
+                return super().loads(data)
+
+        monkeypatch.setattr(pytest_httpchain_jsonref.backend, "_current", CountingBackend())
+        return parsed
+
+    def test_shared_between_calls(self, datadir, parsed_documents):
+        cache = DocumentCache()
+        load_json(datadir / "case_ref_sibling.json", cache=cache)
+        load_json(datadir / "case_merge_sibling.json", cache=cache)
+        result = load_json(datadir / "case_merge_multi.json", cache=cache)
+        assert result["l0-a"]["l1-b"]["l2-a"]["l1-c"] == 1
+        # 3 scenario files, sibling.json and dir/child.json are parsed once each
+        assert len(parsed_documents) == 5
+
+    def test_cached_document_not_mutated(self, datadir):
+        cache = DocumentCache()
+        first = load_json(datadir / "case_merge_sibling.json", cache=cache)
+        second = load_json(datadir / "case_merge_sibling.json", cache=cache)
+        assert first == second
+        assert cache.load((datadir / "sibling.json").resolve())[0]["l0-c"] == {"l1-c": 1}
+
+    def test_changed_file_reloaded(self, datadir):
+        cache = DocumentCache()
+        assert load_json(datadir / "case_ref_sibling.json", cache=cache)["l0-b"]["l1-a"] == 1
+        (datadir / "sibling.json").write_text(json.dumps({"l0-a": {"l1-a": 22}}))
+        assert load_json(datadir / "case_ref_sibling.json", cache=cache)["l0-b"]["l1-a"] == 22
+
+    def test_file_changed_during_resolution(self, datadir):
+        class ChangingCache(DocumentCache):
+            changed = False
+
+            def _load(self, path):
+                entry = super()._load(path)
+                if path.name == "sibling.json" and not self.changed:
+                    self.changed = True
+                    path.write_text(path.read_text() + "\n")
+                return entry
+
+        assert load_json(datadir / "case_ref_chain.json", cache=ChangingCache())["l0-b"] == {"l1-a": 1}
+
+    def test_dependencies(self, datadir):
+        _, dependencies = load_json_with_dependencies(datadir / "case_ref_chain.json")
+        assert dependencies == {
+            (datadir / "case_ref_chain.json").resolve(),
+            (datadir / "sibling.json").resolve(),
+            (datadir / "dir" / "child.json").resolve(),
+        }
+
+    def test_ref_free_subtree_shared(self, datadir):
+        cache = DocumentCache()
+        result = load_json(datadir / "case_ref_sibling.json", cache=cache)
+        assert result["l0-b"] is cache.load((datadir / "sibling.json").resolve())[0]["l0-a"]
+
+    def test_resolved_fragment_shared(self, datadir):
+        cache = DocumentCache()
+        first = load_json(datadir / "case_ref_chain.json", cache=cache)
+        second = load_json(datadir / "case_ref_chain.json", cache=cache)
+        assert first["l0-b"] is second["l0-b"]
+
+    def test_resolved_fragment_dependencies(self, datadir):
+        cache = DocumentCache()
+        load_json(datadir / "case_ref_chain.json", cache=cache)
+        _, dependencies = load_json_with_dependencies(datadir / "case_ref_chain.json", cache=cache)
+        assert (datadir / "dir" / "child.json").resolve() in dependencies
+
+
+class TestRefGraph:
+    def test_circular_external(self, tmp_path):
+        (tmp_path / "a.json").write_text(json.dumps({"x": {"$ref": "b.json#/y"}}))
+        (tmp_path / "b.json").write_text(json.dumps({"y": {"$ref": "a.json#/x"}}))
+        with pytest.raises(ReferenceResolverError, match="Circular reference detected"):
+            load_json(tmp_path / "a.json")
+
+    def test_circular_internal(self, tmp_path):
+        (tmp_path / "a.json").write_text(json.dumps({"x": {"$ref": "#/y"}, "y": {"$ref": "#/x"}}))
+        with pytest.raises(ReferenceResolverError, match="Circular reference detected"):
+            load_json(tmp_path / "a.json")
+
+    def test_same_pointer_in_different_files(self, tmp_path):
+        (tmp_path / "a.json").write_text(json.dumps({"x": {"$ref": "b.json#/x"}}))
+        (tmp_path / "b.json").write_text(json.dumps({"x": {"$ref": "#/y"}, "y": 1}))
+        assert load_json(tmp_path / "a.json") == {"x": 1}
+
+    def test_invalidate_affected_only(self, datadir):
+        cache = DocumentCache()
+        for name in ("case_ref_self.json", "case_ref_sibling.json", "case_ref_chain.json", "case_ref_child.json"):
+            load_json(datadir / name, cache=cache)
+
+        affected = invalidate([datadir / "dir" / "child.json"], cache)
+        assert affected == {(datadir / "case_ref_chain.json").resolve(), (datadir / "case_ref_child.json").resolve()}
+
+    def test_reload_after_invalidate(self, datadir):
+        cache = DocumentCache()
+        load_json(datadir / "case_ref_sibling.json", cache=cache)
+        (datadir / "sibling.json").write_text(json.dumps({"l0-a": {"l1-a": 22}}))
+        (affected,) = invalidate([datadir / "sibling.json"], cache)
+        assert load_json(affected, cache=cache)["l0-b"]["l1-a"] == 22
+
+
+class TestJsonBackend:
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+    def test_roundtrip(self, name):
+        pytest.importorskip(name)
+        backend = create_backend(name)
+        data = {"a": [1, 2.5, None, True], "b": {"c": "ü"}}
+        assert backend.loads(backend.dumps(data)) == data
+        assert backend.loads(backend.dumps(data).decode()) == data
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+    def test_decode_error(self, name):
+        pytest.importorskip(name)
+        with pytest.raises(json.JSONDecodeError):
+            create_backend(name).loads(b"{invalid")
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            create_backend("yaml")
+
+    def test_auto(self):
+        assert create_backend("auto").available()
+
+    def test_stdlib_by_default(self):
+        assert create_backend().name == "json"
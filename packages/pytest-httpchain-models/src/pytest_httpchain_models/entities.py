@@ -1,7 +1,7 @@
 from http import HTTPMethod, HTTPStatus
 from typing import Annotated, Any, Literal, Self
 
-from pydantic import BaseModel, ConfigDict, Discriminator, Field, JsonValue, PositiveFloat, RootModel, Tag, model_validator
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, JsonValue, NonNegativeFloat, NonNegativeInt, PositiveFloat, PositiveInt, RootModel, Tag, model_validator
 from pydantic.networks import HttpUrl
 
 from pytest_httpchain_models.types import (
@@ -35,6 +35,22 @@ class SSLConfig(BaseModel):
     )
 
 
+class ConnectionConfig(BaseModel):
+    """HTTP connection pooling and retry configuration."""
+
+    pool_connections: PositiveInt = Field(default=10, description="Number of hosts to keep connection pools for.")
+    pool_maxsize: PositiveInt = Field(default=10, description="Maximum number of connections kept open per host.")
+    pool_block: bool = Field(default=False, description="Wait for a free connection when pool_maxsize connections are in use, instead of opening a throwaway one.")
+    retries: NonNegativeInt = Field(default=0, description="Number of retries after connection errors, and after read errors for idempotent methods.")
+    backoff_factor: NonNegativeFloat = Field(default=0.0, description="Sleep backoff_factor * 2 ** (retry - 1) seconds between retries.")
+    keep_alive: bool = Field(default=True, description="Keep connections open for subsequent requests.")
+    http2: bool = Field(
+        default=False,
+        description="Negotiate HTTP/2 on HTTPS connections, multiplexing concurrent requests over one connection per host. Requires pytest-httpchain[http2].",
+    )
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
 class UserFunctionName(RootModel):
     root: FunctionImportName | PartialTemplateStr = Field(
         description="Name of the function to be called.",
@@ -67,14 +83,22 @@ def get_request_body_discriminator(v: Any) -> str:
     """Discriminator function for request body types."""
     # For dict inputs, check which field is present
     if isinstance(v, dict):
-        body_fields = {"json", "xml", "form", "raw", "files"}
+        body_fields = {"json", "xml", "form", "raw", "files", "file", "generator"}
         found = body_fields & v.keys()
         if found:
             return found.pop()
 
     # For object inputs, map class name to discriminator
     if hasattr(v, "__class__"):
-        class_to_tag = {"JsonBody": "json", "XmlBody": "xml", "FormBody": "form", "RawBody": "raw", "FilesBody": "files"}
+        class_to_tag = {
+            "JsonBody": "json",
+            "XmlBody": "xml",
+            "FormBody": "form",
+            "RawBody": "raw",
+            "FilesBody": "files",
+            "FileBody": "file",
+            "GeneratorBody": "generator",
+        }
         tag = class_to_tag.get(v.__class__.__name__)
         if tag:
             return tag
@@ -113,13 +137,37 @@ class RawBody(BaseModel):
 class FilesBody(BaseModel):
     """Multipart file upload request body."""
 
-    files: dict[str, SerializablePath | PartialTemplateStr] = Field(description="Files to upload from file paths.")
+    files: dict[str, SerializablePath | PartialTemplateStr] = Field(description="Files to upload from file paths, streamed from disk.")
+    model_config = ConfigDict(extra="forbid")
+
+
+class FileBody(BaseModel):
+    """Raw request body streamed from a file."""
+
+    file: SerializablePath | PartialTemplateStr = Field(description="Path of the file to send.")
+    render: Literal[True, False] | TemplateExpression = Field(
+        default=False,
+        description="Substitute templates in the UTF-8 file content while it is sent, the body is then sent in chunks.",
+    )
+    model_config = ConfigDict(extra="forbid")
+
+
+class GeneratorBody(BaseModel):
+    """Request body produced by a user function, sent in chunks."""
+
+    generator: UserFunctionCall = Field(description="User function returning an iterable of bytes or str chunks.")
     model_config = ConfigDict(extra="forbid")
 
 
 # Discriminated union with callable discriminator
 RequestBody = Annotated[
-    Annotated[JsonBody, Tag("json")] | Annotated[XmlBody, Tag("xml")] | Annotated[FormBody, Tag("form")] | Annotated[RawBody, Tag("raw")] | Annotated[FilesBody, Tag("files")],
+    Annotated[JsonBody, Tag("json")]
+    | Annotated[XmlBody, Tag("xml")]
+    | Annotated[FormBody, Tag("form")]
+    | Annotated[RawBody, Tag("raw")]
+    | Annotated[FilesBody, Tag("files")]
+    | Annotated[FileBody, Tag("file")]
+    | Annotated[GeneratorBody, Tag("generator")],
     Discriminator(get_request_body_discriminator),
 ]
 
@@ -147,6 +195,11 @@ class Request(CallSecurity):
     body: RequestBody | None = Field(default=None, description="Request body configuration.")
     timeout: PositiveFloat | TemplateExpression = Field(default=30.0, description="Request timeout in seconds.")
     allow_redirects: Literal[True, False] | TemplateExpression = Field(default=True, description="Whether to follow redirects.")
+    stream: Literal[True, False] | TemplateExpression = Field(
+        default=False,
+        description="Spool the response body to a temporary file instead of memory. Body checks then read it chunk by chunk.",
+    )
+    max_body_bytes: PositiveInt | None | TemplateExpression = Field(default=None, description="Fail the request as soon as the response body exceeds this size.")
 
 
 class Save(BaseModel):
@@ -176,6 +229,19 @@ class Verify(BaseModel):
     body: ResponseBody = Field(default_factory=ResponseBody)
 
 
+class Poll(BaseModel):
+    """Re-issue the stage request until the response passes verification."""
+
+    until: Verify = Field(description="Condition the response must meet, in verify syntax.")
+    timeout: PositiveFloat | TemplateExpression = Field(default=60.0, description="Seconds to keep polling before the stage fails.")
+    interval: PositiveFloat | TemplateExpression = Field(default=1.0, description="Delay before the first retry in seconds.")
+    multiplier: Annotated[float, Field(ge=1.0)] | TemplateExpression = Field(default=2.0, description="Factor the delay grows by after each retry, 1 for a constant delay.")
+    max_interval: PositiveFloat | TemplateExpression = Field(default=30.0, description="Upper limit of the delay in seconds.")
+    jitter: Literal[True, False] | TemplateExpression = Field(default=False, description="Randomize each delay between half and full value.")
+    retry_after: Literal[True, False] | TemplateExpression = Field(default=True, description="Wait as long as the Retry-After response header asks, if present.")
+    model_config = ConfigDict(extra="forbid")
+
+
 class Decorated(BaseModel):
     """Pytest test decoration configuration."""
 
@@ -261,12 +327,17 @@ class Stage(Decorated):
     name: str = Field(description="Stage name (human-readable).")
     always_run: Literal[True, False] | TemplateExpression = Field(default=False, examples=[True, "{{ should_run }}", "{{ env == 'production' }}"])
     request: Request = Field(description="HTTP request details.")
+    poll: Poll | None = Field(default=None, description="Repeat the request until a condition holds, before processing the response.")
     response: Response = Field(default_factory=Response)
 
 
 class Scenario(Decorated, CallSecurity):
     """HTTP test scenario with multiple stages."""
 
+    connection: ConnectionConfig = Field(
+        default_factory=ConnectionConfig,
+        description="HTTP connection configuration. Fields not set here take values from the connection ini option.",
+    )
     stages: list[Stage] = Field(default_factory=list)
 
     @model_validator(mode="after")
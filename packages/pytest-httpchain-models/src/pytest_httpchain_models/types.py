@@ -7,7 +7,7 @@ from typing import Annotated, Any
 import jmespath
 import jsonschema
 from pydantic import AfterValidator, PlainSerializer
-from pytest_httpchain_templates.expressions import TEMPLATE_PATTERN, is_complete_template
+from pytest_httpchain_templates.expressions import TEMPLATE_RE, is_complete_template
 from pytest_httpchain_userfunc.base import UserFunctionHandler
 from pytest_httpchain_userfunc.exceptions import UserFunctionError
 
@@ -95,7 +95,7 @@ def validate_template_expression(v: str) -> str:
 
 
 def validate_partial_template_str(v: str) -> str:
-    matches = list(re.finditer(TEMPLATE_PATTERN, v))
+    matches = list(TEMPLATE_RE.finditer(v))
     if not matches:
         raise ValueError(f"Must contain at least one template expression like '{{{{ expr }}}}', got: {v!r}")
 
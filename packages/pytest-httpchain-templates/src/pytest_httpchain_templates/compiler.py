@@ -0,0 +1,87 @@
+"""Template compilation.
+
+A template string is split once into literal segments and pre-parsed expressions.
+Compiled templates are cached by source text, so rendering the same template
+again only evaluates already parsed expression trees.
+"""
+
+import ast
+from dataclasses import dataclass
+from functools import lru_cache
+
+from simpleeval import InvalidExpression, SimpleEval
+
+from pytest_httpchain_templates.exceptions import TemplatesError
+from pytest_httpchain_templates.expressions import TEMPLATE_RE
+
+CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class Expression:
+    """Template expression with its parsed syntax tree."""
+
+    source: str
+    node: ast.AST
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTemplate:
+    """Template split into literal segments and expressions, in order of appearance.
+
+    Attributes:
+        parts: Literal strings and expressions
+        expression: The only expression if the whole template is a single expression, None otherwise
+    """
+
+    parts: tuple[str | Expression, ...]
+    expression: Expression | None = None
+
+    @property
+    def is_literal(self) -> bool:
+        """Check if the template has no expressions."""
+        return all(isinstance(part, str) for part in self.parts)
+
+    @property
+    def names(self) -> frozenset[str]:
+        """Names of all variables the template expressions refer to.
+
+        Names bound inside expressions (comprehension variables) are included too,
+        so the result may be a superset of the variables actually read.
+        """
+        return frozenset(node.id for part in self.parts if isinstance(part, Expression) for node in ast.walk(part.node) if isinstance(node, ast.Name))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a template string.
+
+    Args:
+        source: Template text
+
+    Returns:
+        Compiled template, shared by all calls with the same source
+
+    Raises:
+        TemplatesError: If an expression cannot be parsed
+    """
+    parts: list[str | Expression] = []
+    position = 0
+    for match in TEMPLATE_RE.finditer(source):
+        if match.start() > position:
+            parts.append(source[position : match.start()])
+        parts.append(_parse(match.group("expr").strip()))
+        position = match.end()
+    if position < len(source):
+        parts.append(source[position:])
+
+    # Whole string being a single expression keeps the value type
+    expression = parts[0] if len(parts) == 1 and isinstance(parts[0], Expression) else None
+    return CompiledTemplate(parts=tuple(parts), expression=expression)
+
+
+def _parse(expr: str) -> Expression:
+    try:
+        return Expression(source=expr, node=SimpleEval.parse(expr))
+    except (InvalidExpression, SyntaxError) as e:
+        raise TemplatesError(f"Invalid expression '{{ {expr} }}'") from e
@@ -2,14 +2,17 @@ import re
 
 TEMPLATE_PATTERN = r"\{\{(?P<expr>[^}]+?)\}\}"
 
+TEMPLATE_RE = re.compile(TEMPLATE_PATTERN)
+COMPLETE_TEMPLATE_RE = re.compile(rf"^\s*{TEMPLATE_PATTERN}\s*$")
+
 
 def is_complete_template(value: str) -> bool:
     """Check if a string is a complete template expression."""
-    return bool(re.fullmatch(rf"^\s*{TEMPLATE_PATTERN}\s*$", value))
+    return COMPLETE_TEMPLATE_RE.fullmatch(value) is not None
 
 
 def extract_template_expression(value: str) -> str | None:
     """Extract the expression part from a complete template string."""
-    if match := re.fullmatch(rf"^\s*{TEMPLATE_PATTERN}\s*$", value):
+    if match := COMPLETE_TEMPLATE_RE.fullmatch(value):
         return match.group("expr").strip()
     return None
@@ -1,5 +1,7 @@
-import re
-from collections.abc import Mapping
+import queue
+import weakref
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
 from typing import Any
 
 from pydantic import BaseModel
@@ -14,8 +16,9 @@ from simpleeval import (
     OperatorNotDefined,
 )
 
+from pytest_httpchain_templates.compiler import Expression, compile_template
 from pytest_httpchain_templates.exceptions import TemplatesError
-from pytest_httpchain_templates.expressions import TEMPLATE_PATTERN
+from pytest_httpchain_templates.expressions import TEMPLATE_RE
 
 SAFE_FUNCTIONS = {
     "str": str,
@@ -38,14 +41,35 @@ SAFE_FUNCTIONS = {
     "set": set,
 }
 
-evaluator = EvalWithCompoundTypes(functions=SAFE_FUNCTIONS)
+# Longest template render_chunks waits to complete across chunks
+MAX_TEMPLATE_LENGTH = 4096
 
+# Evaluators keep per-evaluation state (names, current expression, comprehension scopes),
+# so each evaluation takes its own one from the pool and returns it when done
+_evaluators: queue.SimpleQueue[EvalWithCompoundTypes] = queue.SimpleQueue()
 
-def _eval_with_context(expr: str, context: Mapping[str, Any]) -> Any:
-    """Evaluate an expression safely using simpleeval with compound types support.
+
+@contextmanager
+def _evaluator(context: Mapping[str, Any]) -> Iterator[EvalWithCompoundTypes]:
+    """Borrow an evaluator bound to the context, creating one if the pool is empty."""
+    try:
+        evaluator = _evaluators.get_nowait()
+    except queue.Empty:
+        evaluator = EvalWithCompoundTypes(functions=SAFE_FUNCTIONS)
+
+    evaluator.names = context
+    try:
+        yield evaluator
+    finally:
+        evaluator.names = {}
+        _evaluators.put(evaluator)
+
+
+def _eval_with_context(expression: Expression, context: Mapping[str, Any]) -> Any:
+    """Evaluate a pre-parsed expression safely using simpleeval with compound types support.
 
     Args:
-        expr: The expression to evaluate
+        expression: The expression to evaluate
         context: Dictionary of variables available in the expression
 
     Returns:
@@ -54,10 +78,11 @@ def _eval_with_context(expr: str, context: Mapping[str, Any]) -> Any:
     Raises:
         TemplatesError: If variable is not found or expression is invalid
     """
-    evaluator.names = context
+    expr = expression.source
 
     try:
-        return evaluator.eval(expr)
+        with _evaluator(context) as evaluator:
+            return evaluator.eval(expr, previously_parsed=expression.node)
     except NameNotDefined as e:
         raise TemplatesError(f"Undefined variable in expression '{{ {expr} }}'") from e
     except FunctionNotDefined as e:
@@ -76,36 +101,107 @@ def _eval_with_context(expr: str, context: Mapping[str, Any]) -> Any:
 
 
 def _sub_string(line: str, context: Mapping[str, Any]) -> Any:
-    def _repl(match: re.Match[str]) -> Any:
-        expr = match.group("expr").strip()
-        return _eval_with_context(expr, context)
+    template = compile_template(line)
 
     # Check if entire string is a single template expression
-    if match := re.fullmatch(TEMPLATE_PATTERN, line):
-        return _repl(match)
+    if template.expression is not None:
+        return _eval_with_context(template.expression, context)
+
+    if template.is_literal:
+        return line
 
     # Otherwise, replace template expressions in the string
-    return re.sub(TEMPLATE_PATTERN, lambda m: str(_repl(m)), line)
+    return "".join(part if isinstance(part, str) else str(_eval_with_context(part, context)) for part in template.parts)
+
+
+# Template index maps keys (dict keys, list positions, model field names) of values
+# containing templates to their own index; a template string itself is indexed as True.
+TemplateIndex = dict[Any, "TemplateIndex"] | bool
+
+# Model indexes are cached per instance, models must not be modified once indexed
+_model_indexes: dict[int, TemplateIndex | None] = {}
 
 
-def _contains_template(obj: Any) -> bool:
-    """Check if an object contains any template strings."""
+def _template_index(obj: Any) -> TemplateIndex | None:
+    """Find paths to all template strings in an object.
+
+    Returns:
+        Template index, or None if the object contains no templates
+    """
     match obj:
         case str():
-            return bool(re.search(TEMPLATE_PATTERN, obj))
+            return True if TEMPLATE_RE.search(obj) is not None else None
         case dict():
-            return any(_contains_template(value) for value in obj.values())
+            index = {key: sub_index for key, value in obj.items() if (sub_index := _template_index(value)) is not None}
         case list():
-            return any(_contains_template(item) for item in obj)
+            index = {position: sub_index for position, item in enumerate(obj) if (sub_index := _template_index(item)) is not None}
         case BaseModel():
-            return _contains_template(obj.model_dump(mode="python"))
+            return _model_template_index(obj)
         case _:
-            return False
+            return None
+    return index or None
+
+
+def _model_template_index(model: BaseModel) -> TemplateIndex | None:
+    """Template index of model fields, computed once per model instance."""
+    key = id(model)
+    if key in _model_indexes:
+        return _model_indexes[key]
+
+    values = {name: getattr(model, name) for name in type(model).model_fields} | (model.model_extra or {})
+    index = _template_index(values)
+    _model_indexes[key] = index
+    weakref.finalize(model, _model_indexes.pop, key, None)
+    return index
+
+
+def _child(obj: Any, key: Any) -> Any:
+    """Get an indexed value from a container or model."""
+    if isinstance(obj, BaseModel):
+        return getattr(obj, key) if key in type(obj).model_fields else obj.model_extra[key]
+    return obj[key]
+
+
+def _substitute(obj: Any, index: TemplateIndex, context: Mapping[str, Any]) -> Any:
+    """Substitute templates at indexed paths, copying only containers along these paths."""
+    match obj:
+        case str():
+            return _sub_string(obj, context)
+        case dict():
+            result = dict(obj)
+            for key, sub_index in index.items():
+                result[key] = _substitute(obj[key], sub_index, context)
+            return result
+        case list():
+            result = list(obj)
+            for position, sub_index in index.items():
+                result[position] = _substitute(obj[position], sub_index, context)
+            return result
+        case BaseModel():
+            result = obj.model_copy()
+            for name, sub_index in index.items():
+                value = _substitute(_child(obj, name), sub_index, context)
+                if name in type(obj).model_fields:
+                    # Validate just the changed field, as if it was set on a model with validate_assignment
+                    obj.__pydantic_validator__.validate_assignment(result, name, value)
+                else:
+                    result.__pydantic_extra__[name] = value
+            return result
+        case _:
+            return obj
 
 
 def walk(obj: Any, context: Mapping[str, Any]) -> Any:
     """Recursively substitute values in string attributes of an arbitrary object.
 
+    Safe to call concurrently from multiple threads, every call evaluates against
+    its own context only.
+
+    Only values containing templates are substituted; everything else is shared
+    with the original object, which is returned as-is if it has no templates.
+    Models are copied and only changed fields are validated again. Template
+    locations in a model are looked up once per model instance.
+
     Args:
         obj: The object to walk through (can be dict, list, str, BaseModel, etc.)
         context: Mapping of variables for substitution (dict, ChainMap, etc.)
@@ -113,19 +209,81 @@ def walk(obj: Any, context: Mapping[str, Any]) -> Any:
     Returns:
         The object with all template expressions substituted
     """
-    match obj:
-        case str():
-            return _sub_string(obj, context)
-        case dict():
-            return {key: walk(value, context) for key, value in obj.items()}
-        case list():
-            return [walk(item, context) for item in obj]
-        case BaseModel():
-            if not _contains_template(obj):
-                return obj
+    index = _template_index(obj)
+    if index is None:
+        return obj
+    return _substitute(obj, index, context)
 
-            obj_dict = obj.model_dump(mode="python")
-            processed_dict = walk(obj_dict, context)
-            return obj.__class__.model_validate(processed_dict)
-        case _:
-            return obj
+
+def render_chunks(chunks: Iterable[str], context: Mapping[str, Any]) -> Iterator[str]:
+    """Substitute templates in text arriving in chunks, e.g. read from a large file.
+
+    Unlike walk, values are always inserted as text, and the text is never held in
+    memory as a whole: only the unfinished end of a chunk that may start a template
+    (an unclosed "{{" of at most MAX_TEMPLATE_LENGTH characters) waits for the next one.
+
+    Args:
+        chunks: Consecutive parts of the text
+        context: Mapping of variables for substitution
+
+    Yields:
+        Consecutive parts of the rendered text
+
+    Raises:
+        TemplatesError: If an expression cannot be parsed or evaluated
+    """
+    pending = ""
+    for chunk in chunks:
+        text = pending + chunk
+        cut = len(text)
+        start = text.rfind("{{")
+        if start != -1 and "}}" not in text[start:] and len(text) - start <= MAX_TEMPLATE_LENGTH:
+            cut = start
+        elif text.endswith("{"):
+            cut -= 1
+        pending = text[cut:]
+        if cut:
+            yield _render_text(text[:cut], context)
+    if pending:
+        yield _render_text(pending, context)
+
+
+def _render_text(text: str, context: Mapping[str, Any]) -> str:
+    """Substitute templates in text, compiling each expression on its own so the text itself is not cached."""
+    parts: list[str] = []
+    position = 0
+    for match in TEMPLATE_RE.finditer(text):
+        parts.append(text[position : match.start()])
+        template = compile_template(match.group(0))
+        assert template.expression is not None
+        parts.append(str(_eval_with_context(template.expression, context)))
+        position = match.end()
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def referenced_names(obj: Any) -> set[str]:
+    """Find names of all variables referenced by templates in an object.
+
+    Args:
+        obj: The object to search (can be dict, list, str, BaseModel, etc.)
+
+    Returns:
+        Variable names, possibly including names bound within expressions
+
+    Raises:
+        TemplatesError: If a template expression cannot be parsed
+    """
+    names: set[str] = set()
+
+    def collect(value: Any, index: TemplateIndex) -> None:
+        if index is True:
+            names.update(compile_template(value).names)
+            return
+        for key, sub_index in index.items():
+            collect(_child(value, key), sub_index)
+
+    index = _template_index(obj)
+    if index is not None:
+        collect(obj, index)
+    return names
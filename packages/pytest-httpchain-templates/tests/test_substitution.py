@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 import pytest
-from pydantic import BaseModel
+from pydantic import BaseModel, RootModel, ValidationError
+from pytest_httpchain_templates.compiler import CACHE_SIZE, compile_template
 from pytest_httpchain_templates.exceptions import TemplatesError
-from pytest_httpchain_templates.substitution import walk
+from pytest_httpchain_templates.substitution import render_chunks, walk
 
 
 class TestWalk:
@@ -130,3 +134,139 @@ class TestWalk:
         # Key error - using dict() function since literal syntax doesn't work
         with pytest.raises(TemplatesError, match="KeyError"):
             walk("{{ dict(a=1)['b'] }}", {})
+
+
+class TestCompileTemplate:
+    """Test template compilation"""
+
+    def test_parts(self):
+        template = compile_template("Hello {{ name }}, you are {{ age + 1 }}")
+        assert [part if isinstance(part, str) else part.source for part in template.parts] == ["Hello ", "name", ", you are ", "age + 1"]
+        assert template.expression is None
+
+    def test_single_expression(self):
+        template = compile_template("{{ value }}")
+        assert template.expression is not None
+        assert template.expression.source == "value"
+
+    def test_literal(self):
+        template = compile_template("no templates here")
+        assert template.is_literal
+        assert template.parts == ("no templates here",)
+
+    def test_cached(self):
+        assert compile_template("{{ a + b }}") is compile_template("{{ a + b }}")
+
+    def test_reused_with_different_contexts(self):
+        assert walk("{{ a * 2 }}", {"a": 1}) == 2
+        assert walk("{{ a * 2 }}", {"a": 21}) == 42
+
+    def test_invalid_expression(self):
+        with pytest.raises(TemplatesError, match="Invalid expression"):
+            compile_template("{{ 1 + }}")
+
+    def test_invalid_expression_fails_on_each_use(self):
+        for _ in range(2):
+            with pytest.raises(TemplatesError, match="Invalid expression"):
+                walk("{{ 2 + }}", {})
+
+    def test_evicted_at_size_limit(self):
+        compile_template.cache_clear()
+        first = compile_template("{{ n + 0 }}")
+        for n in range(1, CACHE_SIZE + 1):
+            compile_template(f"{{{{ n + {n} }}}}")
+        assert compile_template.cache_info().currsize == CACHE_SIZE
+        assert compile_template("{{ n + 0 }}") is not first
+        assert walk("{{ n + 0 }}", {"n": 3}) == 3
+
+    def test_evaluator_context_not_kept(self):
+        assert walk("{{ a }}", {"a": 1}) == 1
+        with pytest.raises(TemplatesError, match="Undefined variable"):
+            walk("{{ a }}", {})
+
+
+class TestWalkModels:
+    """Test substitution in pydantic models"""
+
+    class Inner(BaseModel):
+        value: int
+        label: str = "static"
+
+    class Outer(BaseModel):
+        name: str
+        inner: "TestWalkModels.Inner"
+        static: dict[str, Any]
+        templated: dict[str, Any]
+
+    def make_outer(self):
+        return TestWalkModels.Outer(
+            name="static",
+            inner=TestWalkModels.Inner.model_construct(value="{{ number }}"),
+            static={"large": [{"id": n} for n in range(10)]},
+            templated={"fixed": {"a": 1}, "dynamic": "{{ number * 2 }}"},
+        )
+
+    def test_no_templates_returns_same_object(self):
+        model = TestWalkModels.Inner(value=1)
+        assert walk(model, {}) is model
+
+    def test_only_templated_paths_copied(self):
+        model = self.make_outer()
+        result = walk(model, {"number": 21})
+        assert result is not model
+        assert result.static is model.static
+        assert result.templated == {"fixed": {"a": 1}, "dynamic": 42}
+        assert result.templated["fixed"] is model.templated["fixed"]
+        assert model.templated["dynamic"] == "{{ number * 2 }}"
+
+    def test_changed_fields_validated(self):
+        result = walk(self.make_outer(), {"number": "7"})
+        assert result.inner.value == 7
+        assert result.inner.label == "static"
+
+    def test_invalid_substituted_value(self):
+        with pytest.raises(ValidationError):
+            walk(self.make_outer(), {"number": "not a number"})
+
+    def test_root_model(self):
+        class Numbers(RootModel):
+            root: list[int | str]
+
+        result = walk(Numbers(root=[1, "{{ n }}"]), {"n": 2})
+        assert isinstance(result, Numbers)
+        assert result.root == [1, 2]
+
+
+class TestConcurrency:
+    """Test concurrent template rendering"""
+
+    def test_threads_use_own_context(self):
+        def render(n):
+            return walk({"value": "{{ [x * n for x in range(50)][-1] }}", "text": "n={{ n }}"}, {"n": n})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(render, range(500)))
+
+        assert results == [{"value": 49 * n, "text": f"n={n}"} for n in range(500)]
+
+
+class TestRenderChunks:
+    """Test rendering text in chunks"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 100])
+    def test_templates_split_between_chunks(self, size):
+        text = "id={{ item_id }}, {name: '{{ name.upper() }}'} {single} {{ item_id + 1 }}"
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        result = "".join(render_chunks(chunks, {"item_id": 7, "name": "abc"}))
+        assert result == "id=7, {name: 'ABC'} {single} 8"
+
+    def test_values_inserted_as_text(self):
+        assert list(render_chunks(["{{ value }}"], {"value": [1, 2]})) == ["[1, 2]"]
+
+    def test_unclosed_braces_not_held_back_forever(self):
+        chunks = ["{{ never closed"] + ["x" * 1000] * 10
+        assert next(iter(render_chunks(chunks, {}))).startswith("{{ never closed")
+
+    def test_undefined_variable(self):
+        with pytest.raises(TemplatesError, match="Undefined variable"):
+            list(render_chunks(["a {{ missing }} b"], {}))
@@ -0,0 +1,31 @@
+from collections.abc import Iterable
+from typing import Any
+
+from pytest_httpchain_userfunc.base import UserFunctionHandler
+from pytest_httpchain_userfunc.exceptions import UserFunctionError
+from pytest_httpchain_userfunc.protocols import BodyFunction
+
+
+def call_body_function(name: str, **kwargs: Any) -> Iterable[bytes | str]:
+    """Call a request body function.
+
+    Args:
+        name: Function name in format "module.path:function_name" or "function_name"
+        **kwargs: Optional keyword arguments for the function
+
+    Returns:
+        Iterable of body chunks (e.g., a generator)
+
+    Raises:
+        UserFunctionError: If function returns invalid type
+    """
+    # Get function with protocol validation (checks callability and signature structure)
+    func = UserFunctionHandler.get_function(name, protocol=BodyFunction)
+
+    # Call the function
+    result = func(**kwargs)
+
+    # Runtime check for chunks (a single str or bytes value is iterable too, but not a body in chunks)
+    if isinstance(result, str | bytes) or not isinstance(result, Iterable):
+        raise UserFunctionError(f"Body function '{name}' must return an iterable of chunks, got {type(result).__name__}") from None
+    return result
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from typing import Any, Protocol, runtime_checkable
 
 import requests
@@ -52,3 +53,19 @@ class SaveFunction(Protocol):
             Dictionary of extracted data to save to context
         """
         ...
+
+
+@runtime_checkable
+class BodyFunction(Protocol):
+    """Protocol for functions producing a request body in chunks."""
+
+    def __call__(self, **kwargs: Any) -> Iterable[bytes | str]:
+        """Produce a request body.
+
+        Args:
+            **kwargs: Body parameters
+
+        Returns:
+            Iterable of body chunks, str chunks are encoded as UTF-8
+        """
+        ...
@@ -0,0 +1,343 @@
+"""Asyncio engine running many scenarios concurrently on one event loop.
+
+Scenarios are run upfront, before pytest runs test items, each with its own
+data context and HTTP client. Stages within a scenario run one by one, as they
+would with the regular engine; concurrency comes from interleaving scenarios
+while they wait for responses. Stage items then report the recorded outcomes
+(see Carrier.execute_stage).
+
+Requests are sent with httpx (pytest-httpchain[async] extra). Responses are
+converted to requests.Response, so save and verify steps and user functions
+work the same with both engines. Scenarios depending on anything only the
+regular engine provides are not eligible, see is_eligible.
+"""
+
+import asyncio
+import logging
+import ssl
+from collections.abc import Sequence
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+import pytest_httpchain_templates.substitution
+import requests
+import requests.utils
+from pydantic import ValidationError
+from pytest_httpchain_jsonref.backend import get_backend
+from pytest_httpchain_models.entities import ConnectionConfig, FileBody, FilesBody, FormBody, GeneratorBody, JsonBody, RawBody, Scenario, SSLConfig, XmlBody
+from pytest_httpchain_models.entities import Request as RequestModel
+from pytest_httpchain_templates.exceptions import TemplatesError
+from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
+
+from . import stage_executor
+from .connection import scenario_connection, ssl_context
+from .context import ScenarioVarsCache, prepare_data_context
+from .exceptions import RequestError, StageExecutionError
+from .poll import Poller
+from .response import ResponseView
+
+logger = logging.getLogger(__name__)
+
+StageOutcomes = dict[int, BaseException | None]
+
+
+def is_eligible(scenario: Scenario) -> bool:
+    """Check if a scenario can run on the asyncio engine.
+
+    Not eligible are scenarios using pytest fixtures, which are only available
+    while pytest runs the stage items, scenarios using auth functions, which
+    produce requests auth objects, scenarios streaming or limiting response
+    bodies, which the engine reads into memory, and scenarios sending bodies
+    from single files or body functions, which are read synchronously.
+
+    Args:
+        scenario: Validated scenario
+
+    Returns:
+        True if the scenario can run on the asyncio engine
+    """
+    if scenario.fixtures or scenario.auth is not None:
+        return False
+    return not any(
+        stage.fixtures
+        or stage.request.auth is not None
+        or stage.request.stream is not False
+        or stage.request.max_body_bytes is not None
+        or isinstance(stage.request.body, FileBody | GeneratorBody)
+        for stage in scenario.stages
+    )
+
+
+def run_scenarios(scenarios: Sequence[tuple[Scenario, Sequence[int]]], concurrency: int, shared_connections: bool = False) -> list[StageOutcomes]:
+    """Run scenarios concurrently on a new event loop.
+
+    Args:
+        scenarios: Scenarios with positions of stages to run
+        concurrency: Maximum number of scenarios in progress at the same time
+        shared_connections: Share connections between scenarios with the same connection and SSL configuration
+
+    Returns:
+        Outcomes of each scenario's stages, in the order of scenarios:
+        None for passed stages, pytest's skip or fail exception otherwise
+    """
+
+    async def run_all() -> list[StageOutcomes]:
+        semaphore = asyncio.Semaphore(concurrency)
+        transports = Transports() if shared_connections else None
+
+        async def run_one(scenario: Scenario, stage_indexes: Sequence[int]) -> StageOutcomes:
+            async with semaphore:
+                return await run_scenario(scenario, stage_indexes, transports)
+
+        try:
+            return await asyncio.gather(*(run_one(scenario, stage_indexes) for scenario, stage_indexes in scenarios))
+        finally:
+            if transports is not None:
+                await transports.aclose()
+
+    return asyncio.run(run_all())
+
+
+async def run_scenario(scenario: Scenario, stage_indexes: Sequence[int], transports: "Transports | None" = None) -> StageOutcomes:
+    """Run stages of a scenario one by one.
+
+    Abort handling is the same as with the regular engine: a failure skips
+    the stages after it, unless they have always_run=True.
+
+    Args:
+        scenario: Validated scenario
+        stage_indexes: Positions of stages to run, in order
+        transports: HTTP transports shared with other scenarios, None for connections of the scenario's own
+
+    Returns:
+        Outcome of each stage run
+    """
+    data_context: dict[str, Any] = {}
+    vars_cache = ScenarioVarsCache()
+    aborted = False
+    outcomes: StageOutcomes = {}
+
+    async with ScenarioClients(scenario, transports) as clients:
+        for stage_index in stage_indexes:
+            stage_template = scenario.stages[stage_index]
+            try:
+                if aborted and not stage_template.always_run:
+                    pytest.skip(reason="Flow aborted")
+
+                local_context = prepare_data_context(
+                    scenario=scenario,
+                    stage_template=stage_template,
+                    global_context=data_context,
+                    fixture_kwargs={},
+                    vars_cache=vars_cache,
+                )
+                request_model = pytest_httpchain_templates.substitution.walk(stage_template.request, local_context)
+                poller = None if stage_template.poll is None else Poller(pytest_httpchain_templates.substitution.walk(stage_template.poll, local_context), local_context)
+                response = await send(clients, request_model)
+                # Polling waits on the event loop, letting other scenarios run meanwhile
+                while poller is not None and (delay := poller.next_delay(response)) is not None:
+                    await asyncio.sleep(delay)
+                    response = await send(clients, request_model)
+                data_context.update(stage_executor.process_response(stage_template, local_context, response))
+
+            except (TemplatesError, StageExecutionError, ValidationError) as e:
+                logger.exception(str(e))
+                aborted = True
+                outcomes[stage_index] = pytest.fail.Exception(str(e), pytrace=False)
+            except (Exception, pytest.skip.Exception, pytest.fail.Exception) as e:
+                # Reported by the stage item as with the regular engine, without aborting the flow,
+                # including pytest.fail and pytest.xfail called by user functions
+                outcomes[stage_index] = e
+            else:
+                outcomes[stage_index] = None
+
+    return outcomes
+
+
+class Transports:
+    """HTTP transports, each with its own connection pool, one per connection and SSL configuration.
+
+    The scenario's connection configuration applies with httpx's limitations:
+    pool_connections has no equivalent, retries cover connection errors only
+    and happen without backoff.
+    """
+
+    def __init__(self):
+        self._transports: dict[tuple[ConnectionConfig, Any, Any], httpx.AsyncHTTPTransport] = {}
+
+    def get(self, connection: ConnectionConfig, verify: Any, cert: Any) -> httpx.AsyncHTTPTransport:
+        """Return the transport for a configuration, creating it on first use.
+
+        Args:
+            connection: Connection configuration
+            verify: True, False or path to a CA bundle file or directory
+            cert: Client certificate as in SSLConfig, or None
+
+        Returns:
+            HTTP transport
+        """
+        key = (connection, str(verify) if isinstance(verify, Path) else verify, cert)
+        transport = self._transports.get(key)
+        if transport is None:
+            transport = self._transports[key] = httpx.AsyncHTTPTransport(
+                verify=ssl_context(verify, cert),
+                limits=httpx.Limits(
+                    max_connections=connection.pool_maxsize if connection.pool_block else None,
+                    max_keepalive_connections=connection.pool_maxsize if connection.keep_alive else 0,
+                ),
+                retries=connection.retries,
+                http2=connection.http2,
+            )
+        return transport
+
+    async def aclose(self) -> None:
+        """Close all transports with their connections."""
+        for transport in self._transports.values():
+            await transport.aclose()
+        self._transports.clear()
+
+
+class ScenarioClients:
+    """HTTP clients of one scenario, one per distinct SSL configuration.
+
+    Clients keep cookies between stages, like the requests session of the regular engine.
+    Connections are kept in transports, either shared with other scenarios or of the scenario's own.
+    """
+
+    def __init__(self, scenario: Scenario, transports: Transports | None = None):
+        self._scenario_ssl = scenario.ssl
+        self._connection = scenario_connection(scenario)
+        self._shared_transports = transports is not None
+        self._transports = transports if transports is not None else Transports()
+        self._clients: dict[tuple[Any, Any], httpx.AsyncClient] = {}
+
+    async def __aenter__(self) -> "ScenarioClients":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        # Clients hold no connections of their own, closing a client would close its transport
+        if not self._shared_transports:
+            await self._transports.aclose()
+
+    def get(self, request_ssl: SSLConfig) -> httpx.AsyncClient:
+        """Return the client for a request's SSL settings, creating it on first use.
+
+        As with requests, the request's verify setting always applies, the client certificate
+        falls back to the scenario's.
+
+        Args:
+            request_ssl: Resolved SSL configuration of the request
+
+        Returns:
+            HTTP client
+        """
+        verify = request_ssl.verify
+        cert = request_ssl.cert if request_ssl.cert is not None else self._scenario_ssl.cert
+        key = (str(verify) if isinstance(verify, Path) else verify, cert)
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = httpx.AsyncClient(transport=self._transports.get(self._connection, verify, cert))
+        return client
+
+
+async def send(clients: ScenarioClients, request_model: RequestModel) -> requests.Response:
+    """Send an HTTP request, asynchronous counterpart of request.prepare_and_execute.
+
+    Args:
+        clients: HTTP clients of the scenario
+        request_model: Resolved request model without auth
+
+    Returns:
+        HTTP response converted to requests.Response
+
+    Raises:
+        RequestError: If request preparation or execution fails
+    """
+    try:
+        client = clients.get(request_model.ssl)
+    except (OSError, ssl.SSLError) as e:
+        raise RequestError("Failed to configure SSL") from e
+
+    kwargs: dict[str, Any] = {
+        "method": request_model.method.value,
+        "url": str(request_model.url),
+        "headers": httpx.Headers(request_model.headers),
+        "params": {key: value for key, value in request_model.params.items() if value is not None},
+        "timeout": request_model.timeout,
+        "follow_redirects": request_model.allow_redirects,
+    }
+
+    with ExitStack() as stack:
+        match request_model.body:
+            case None:
+                pass
+            case JsonBody(json=data):
+                try:
+                    kwargs["content"] = get_backend().dumps(data)
+                except (TypeError, ValueError) as e:
+                    raise RequestError("Cannot encode JSON body") from e
+                kwargs["headers"].setdefault("Content-Type", "application/json")
+            case FormBody(form=data):
+                kwargs["data"] = data
+            case XmlBody(xml=data) | RawBody(raw=data):
+                kwargs["content"] = data
+            case FilesBody(files=file_paths):
+                try:
+                    kwargs["files"] = {field_name: (Path(file_path).name, stack.enter_context(open(file_path, "rb"))) for field_name, file_path in file_paths.items()}
+                except FileNotFoundError as e:
+                    raise RequestError("File not found for upload") from e
+
+        try:
+            response = await client.request(**kwargs)
+        except httpx.TimeoutException as e:
+            raise RequestError("HTTP request timed out") from e
+        except httpx.TransportError as e:
+            raise RequestError("HTTP connection error") from e
+        except httpx.HTTPError as e:
+            raise RequestError("HTTP request failed") from e
+        except Exception as e:
+            raise RequestError("Unexpected error") from e
+
+    return to_requests_response(response)
+
+
+def to_requests_response(response: httpx.Response) -> requests.Response:
+    """Convert an httpx response with its body read into requests.Response.
+
+    Args:
+        response: httpx response
+
+    Returns:
+        Equivalent requests response, viewed with ResponseView
+    """
+    headers: CaseInsensitiveDict[str] = CaseInsensitiveDict()
+    for name, value in response.headers.multi_items():
+        # Repeated headers are joined, as urllib3 does
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+    cookies = RequestsCookieJar()
+    for cookie in response.cookies.jar:
+        cookies.set_cookie(cookie)
+
+    request = requests.PreparedRequest()
+    request.method = response.request.method
+    request.url = str(response.request.url)
+    request.headers = CaseInsensitiveDict(response.request.headers.multi_items())
+
+    # A view, so response steps and polling attempts parse the body once
+    result = ResponseView()
+    result.status_code = response.status_code
+    result.headers = headers
+    result._content = response.content
+    result.encoding = requests.utils.get_encoding_from_headers(headers)
+    result.url = str(response.url)
+    result.reason = response.reason_phrase
+    result.elapsed = response.elapsed
+    result.cookies = cookies
+    result.request = request
+    result.history = [to_requests_response(redirect) for redirect in response.history]
+    return result
@@ -0,0 +1,184 @@
+"""Finding many substrings and regular expressions in a body.
+
+Verify steps may list hundreds of contains/not_contains substrings. Instead of
+scanning the body once per substring, large sets are compiled into a
+trie-shaped regular expression, the standard library counterpart of
+Aho-Corasick: substrings sharing a prefix share a branch, so at each position
+the regex engine follows a single branch instead of trying every substring,
+and the body is read once however many substrings there are. Small sets are
+faster to search one by one.
+
+Patterns are compiled once and searched one by one: Python's backtracking
+regex engine tries the branches of an alternation one after another at every
+position, which makes a combined pattern slower than separate searches.
+
+Compiled matchers are cached by their entries, so verify steps repeated by
+polling or shared by scenarios reuse them.
+"""
+
+import functools
+import re
+from collections.abc import Collection, Iterable
+
+# Number of substrings from which the trie is faster than searching them one by one
+TRIE_MIN_LITERALS = 200
+
+# Matches of already found substrings after which the trie is rebuilt without them
+REBUILD_AFTER = 64
+
+
+def trie_pattern(literals: Iterable[str]) -> str:
+    """Build a regular expression matching the longest of the substrings starting at a position.
+
+    Args:
+        literals: Non-empty substrings
+
+    Returns:
+        Regular expression source
+    """
+    root: dict[str, dict] = {}
+    for literal in literals:
+        node = root
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def branch(node: dict[str, dict]) -> str:
+        # Runs of single-child nodes become plain text, nesting only happens where substrings diverge or end
+        prefix = ""
+        while len(node) == 1 and "" not in node:
+            char, node = next(iter(node.items()))
+            prefix += re.escape(char)
+        alternatives = [re.escape(char) + branch(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return prefix
+        if len(alternatives) == 1 and "" not in node:
+            return prefix + alternatives[0]
+        # Greedy, a substring ending here only matches if no longer one does
+        return prefix + f"(?:{'|'.join(alternatives)})" + ("?" if "" in node else "")
+
+    return branch(root)
+
+
+@functools.lru_cache(maxsize=64)
+def literal_regex(literals: frozenset[str]) -> re.Pattern[str] | None:
+    """Compile substrings into a trie-shaped regular expression.
+
+    Args:
+        literals: Non-empty substrings
+
+    Returns:
+        Compiled regular expression, None if there are too few substrings for the trie to pay off or they are too nested to compile
+    """
+    if len(literals) < TRIE_MIN_LITERALS:
+        return None
+    try:
+        return re.compile(trie_pattern(literals))
+    except (re.error, RecursionError, OverflowError):
+        return None
+
+
+class BodyMatcher:
+    """Compiled substrings and patterns of a verify step.
+
+    Args:
+        literals: Substrings to find
+        patterns: Regular expressions to find
+
+    Raises:
+        re.error: If a pattern is invalid
+    """
+
+    def __init__(self, literals: Iterable[str], patterns: Iterable[str]):
+        self.literals = frozenset(literals)
+        self.patterns = frozenset(patterns)
+        self.regexes = {pattern: re.compile(pattern) for pattern in self.patterns}
+        # Substrings found with each matched substring: itself and the substrings it contains
+        self._contained: dict[str, frozenset[str]] = {}
+
+    def contained(self, literal: str) -> frozenset[str]:
+        """Return the substrings contained in a matched substring, including itself."""
+        if literal not in self._contained:
+            self._contained[literal] = frozenset(other for other in self.literals if other in literal)
+        return self._contained[literal]
+
+    def find_literals(self, text: str, wanted: frozenset[str], stop: Collection[str] = ()) -> set[str]:
+        """Find which of the wanted substrings occur in a text.
+
+        At each match the trie yields the longest substring starting there, the
+        shorter ones starting there are contained in it. Searching on from the
+        next position finds the ones starting inside it. Once few substrings are
+        left, the rest of the text is searched for them one by one.
+
+        Args:
+            text: Text to search
+            wanted: Substrings of this matcher to look for
+            stop: Substrings whose occurrence ends the search early
+
+        Returns:
+            Substrings found, at least the first stop substring found if any
+        """
+        found = {literal for literal in wanted if not literal}
+        remaining = wanted - found
+        regex = literal_regex(remaining)
+
+        pos = idle = 0
+        while regex is not None and remaining and not found.intersection(stop):
+            match = regex.search(text, pos)
+            if match is None:
+                return found
+            new = self.contained(match.group()) & remaining
+            if new:
+                found |= new
+                remaining -= new
+                idle = 0
+            else:
+                idle += 1
+                # Frequent substrings found already would otherwise be matched over and over
+                if idle == REBUILD_AFTER:
+                    regex = literal_regex(remaining)
+                    idle = 0
+            pos = match.start() + 1
+
+        for literal in remaining:
+            if found.intersection(stop):
+                break
+            if text.find(literal, pos) != -1:
+                found.add(literal)
+        return found
+
+    def find_patterns(self, text: str, wanted: frozenset[str], stop: Collection[str] = ()) -> set[str]:
+        """Find which of the wanted patterns match in a text.
+
+        Args:
+            text: Text to search
+            wanted: Patterns of this matcher to look for
+            stop: Patterns whose match ends the search early
+
+        Returns:
+            Patterns matched, at least the first stop pattern matched if any
+        """
+        found: set[str] = set()
+        for pattern in wanted:
+            if found.intersection(stop):
+                break
+            if self.regexes[pattern].search(text):
+                found.add(pattern)
+        return found
+
+
+@functools.lru_cache(maxsize=256)
+def body_matcher(literals: frozenset[str], patterns: frozenset[str]) -> BodyMatcher:
+    """Return the compiled matcher for substrings and patterns, compiling it on first use.
+
+    Args:
+        literals: Substrings to find
+        patterns: Regular expressions to find
+
+    Returns:
+        Body matcher
+
+    Raises:
+        re.error: If a pattern is invalid
+    """
+    return BodyMatcher(literals, patterns)
@@ -0,0 +1,92 @@
+"""Request bodies streamed from disk or produced by user functions.
+
+Bodies are handed to requests as file objects or iterables, which it sends
+while reading them: files with a known size go out with Content-Length, other
+iterables with chunked transfer encoding. Nothing is loaded into memory as a
+whole, so uploads of any size keep memory use flat.
+"""
+
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, BinaryIO, TextIO
+
+import pytest_httpchain_templates.substitution
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+
+# Size of chunks bodies are read from disk in
+CHUNK_SIZE = 64 * 1024
+
+
+class MultipartStream:
+    """multipart/form-data body reading its files while it is sent.
+
+    Encoded the same way as requests encodes files, each part with a
+    Content-Disposition header carrying field name and file name. The length is
+    known upfront, so the body is sent with Content-Length.
+
+    Args:
+        files: Open binary files by field name
+    """
+
+    def __init__(self, files: Mapping[str, BinaryIO]):
+        self.boundary = choose_boundary()
+        self.parts: list[tuple[bytes, BinaryIO]] = []
+        for field_name, file in files.items():
+            field = RequestField(name=field_name, data=b"", filename=Path(file.name).name)
+            field.make_multipart()
+            self.parts.append((f"--{self.boundary}\r\n".encode() + field.render_headers().encode(), file))
+        self.closing = f"--{self.boundary}--\r\n".encode()
+
+    @property
+    def content_type(self) -> str:
+        """Content type with the boundary."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return sum(len(headers) + os.fstat(file.fileno()).st_size + 2 for headers, file in self.parts) + len(self.closing)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for headers, file in self.parts:
+            yield headers
+            # Sending again, e.g. after a redirect, starts from the beginning
+            file.seek(0)
+            while chunk := file.read(CHUNK_SIZE):
+                yield chunk
+            yield b"\r\n"
+        yield self.closing
+
+
+def render_file(file: TextIO, context: Mapping[str, Any]) -> Iterator[bytes]:
+    """Read a text file in chunks, substituting templates in its content.
+
+    Args:
+        file: File open in text mode
+        context: Mapping of variables for substitution
+
+    Yields:
+        Rendered content encoded as UTF-8
+
+    Raises:
+        TemplatesError: If a template cannot be rendered
+    """
+    chunks = iter(lambda: file.read(CHUNK_SIZE), "")
+    for text in pytest_httpchain_templates.substitution.render_chunks(chunks, context):
+        yield text.encode()
+
+
+def encode_chunks(chunks: Iterable[bytes | str]) -> Iterator[bytes]:
+    """Encode str chunks produced by a body function as UTF-8, skipping empty ones.
+
+    Args:
+        chunks: Body chunks
+
+    Yields:
+        Non-empty byte chunks
+    """
+    for chunk in chunks:
+        data = chunk.encode() if isinstance(chunk, str) else chunk
+        # An empty chunk would end chunked transfer encoding early
+        if data:
+            yield data
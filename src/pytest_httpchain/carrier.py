@@ -1,28 +1,26 @@
 """Test carrier class for HTTP chain test execution.
 
 The Carrier class manages the test lifecycle and infrastructure:
-- HTTP session initialization and cleanup
-- Global context state management
-- Test flow control (abort handling)
+- Scenario run state initialization and cleanup
+- Concurrent stages and stages run upfront
 - Integration with pytest (skip, fail)
 
-The actual HTTP execution and data processing is delegated to stage_executor.
+Run state and flow control live in ScenarioState, the actual HTTP execution
+and data processing is delegated to stage_executor.
 """
 
 import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Any, ClassVar
 
 import pytest
-import pytest_httpchain_templates.substitution
-import requests
 from pydantic import ValidationError
-from pytest_httpchain_models.entities import Scenario, Stage
-from pytest_httpchain_templates.exceptions import TemplatesError
-from pytest_httpchain_userfunc.auth import call_auth_function
+from pytest_httpchain_models.entities import Scenario
 
-from . import stage_executor
-from .exceptions import StageExecutionError
-from .helpers import call_user_function
+from .connection import AdapterPool
+from .scenario_state import ScenarioState
+from .stage_graph import build_stage_graph
 
 logger = logging.getLogger(__name__)
 
@@ -35,105 +33,159 @@ class Carrier:
     state and execution flow for all stages in a test scenario.
 
     Attributes:
-        _scenario: The test scenario configuration
-        _session: Shared HTTP session for all stages
-        _data_context: Global context shared across all stages
-        _aborted: Flag indicating if test flow should be aborted
+        _scenario: The test scenario configuration, None until loaded
+        _scenario_loader: Function that loads and validates the scenario
+        _state: Session, data context and flow control shared by all stages, None outside of the class run
+        _adapters: HTTP adapters shared by all scenarios, if connections are shared
+        _stage_workers: Number of stages run concurrently, 0 to run them one by one
+        _selected_stages: Positions of stages selected to run, None if not known
+        _stage_outcomes: Outcomes of stages run concurrently or upfront not reported yet, None until they ran
     """
 
-    _scenario: ClassVar[Scenario]
-    _session: ClassVar[requests.Session | None] = None
-    _data_context: ClassVar[dict[str, Any]] = {}
-    _aborted: ClassVar[bool] = False
+    _scenario: ClassVar[Scenario | None] = None
+    _scenario_loader: ClassVar[Callable[[], Scenario]]
+    _state: ClassVar[ScenarioState | None] = None
+    _adapters: ClassVar[AdapterPool | None] = None
+    _stage_workers: ClassVar[int] = 0
+    _selected_stages: ClassVar[set[int] | None] = None
+    _stage_outcomes: ClassVar[dict[int, BaseException | None] | None] = None
+
+    @classmethod
+    def load_scenario(cls) -> Scenario:
+        """Return the validated scenario, loading it on first access.
+
+        Scenario validation may be postponed past collection (see scenario_index),
+        in which case it happens here, right before the first stage runs.
+
+        Returns:
+            The validated scenario
+
+        Raises:
+            pytest.fail: If the scenario cannot be validated
+        """
+        if cls._scenario is None:
+            try:
+                cls._scenario = cls._scenario_loader()
+            except ValidationError as e:
+                logger.exception(str(e))
+                pytest.fail(reason=f"Cannot parse test scenario: {e}", pytrace=False)
+        return cls._scenario
 
     @classmethod
     def setup_class(cls) -> None:
-        """Initialize the HTTP session and data context.
+        """Initialize the scenario run state.
 
         Called once before any test methods in the class are executed.
         Sets up:
-        - Empty data context for variable storage
-        - HTTP session with SSL and authentication configuration
+        - Validated scenario, if not loaded yet
+        - Run state with empty data context and configured HTTP session (see ScenarioState)
 
-        Note:
-            Authentication can be configured at scenario level and will
-            be applied to all requests unless overridden at stage level.
+        Scenarios run upfront (see scenario_pool, async_engine) only report
+        recorded outcomes and get no run state.
         """
-        cls._data_context = {}
-        cls._session = requests.Session()
-
-        # Configure SSL settings
-        cls._session.verify = cls._scenario.ssl.verify
-        if cls._scenario.ssl.cert is not None:
-            cls._session.cert = cls._scenario.ssl.cert
-
-        # Configure authentication
-        if cls._scenario.auth:
-            resolved_auth = pytest_httpchain_templates.substitution.walk(cls._scenario.auth, cls._data_context)
-            auth_instance = call_user_function(resolved_auth, call_auth_function)
-            cls._session.auth = auth_instance
+        scenario = cls.load_scenario()
+        if cls._stage_outcomes is None:
+            cls._state = ScenarioState(scenario, cls._adapters)
 
     @classmethod
     def teardown_class(cls) -> None:
-        """Clean up the HTTP session and reset state.
+        """Clean up the run state.
 
         Called once after all test methods in the class have been executed.
         Ensures proper cleanup of resources and state reset for next test class.
+
+        Recorded outcomes are kept until every stage reported its own: if other
+        items run between stages of the class, pytest tears the class down and
+        sets it up again, and the remaining stages must not run a second time.
         """
-        if cls._session:
-            cls._session.close()
-            cls._session = None
-        cls._data_context.clear()
-        cls._aborted = False
+        if cls._state is not None:
+            cls._state.close()
+            cls._state = None
+        if not cls._stage_outcomes:
+            cls._stage_outcomes = None
 
     @classmethod
-    def execute_stage(cls, stage_template: Stage, fixture_kwargs: dict[str, Any]) -> None:
-        """Execute a test stage with abort handling and error management.
+    def execute_stage(cls, stage_index: int, fixture_kwargs: dict[str, Any], get_fixture: Callable[[str], Any] | None = None) -> None:
+        """Execute a test stage, or report its outcome if it already ran.
 
-        This method is called for each stage in the scenario. It handles:
-        - Checking abort status and skipping if needed
-        - Executing the stage via stage_executor
-        - Updating global context with saved variables
-        - Setting abort flag on errors
+        With concurrent stages, the first stage to execute runs all selected stages
+        following their data dependencies (see stage_graph), and every stage then
+        reports its recorded outcome. Stages run upfront by the asyncio engine
+        (see async_engine) report their recorded outcomes as well.
 
         Args:
-            stage_template: The stage configuration containing request/response definitions
+            stage_index: Position of the stage in the scenario
             fixture_kwargs: Dictionary of pytest fixture values injected for this stage
+            get_fixture: Function returning fixture values of other stages, required with concurrent stages
 
         Raises:
             pytest.skip: If flow is aborted and stage doesn't have always_run=True
             pytest.fail: If stage execution fails with an error
+        """
+        if cls._stage_outcomes is None and cls._stage_workers:
+            assert get_fixture is not None
+            cls._run_stage_graph(get_fixture)
+
+        if cls._stage_outcomes is None or stage_index not in cls._stage_outcomes:
+            cls._run_stage(stage_index, fixture_kwargs)
+            return
+
+        outcome = cls._stage_outcomes.pop(stage_index)
+        if outcome is not None:
+            raise outcome
 
-        Note:
-            Sets cls._aborted to True on failure, causing subsequent stages
-            to be skipped unless they have always_run=True.
+    @classmethod
+    def _run_stage_graph(cls, get_fixture: Callable[[str], Any]) -> None:
+        """Run selected stages on a thread pool and record their outcomes.
+
+        A stage starts once all stages it depends on finished. Abort handling is the
+        same as for sequential stages: a failure skips stages starting after it, unless
+        they have always_run=True; stages already running are not interrupted.
+        """
+        # Set before anything can raise, so the next stage doesn't start the graph again
+        outcomes: dict[int, BaseException | None] = {}
+        cls._stage_outcomes = outcomes
+        scenario = cls.load_scenario()
+        graph = build_stage_graph(scenario)
+        selected = sorted(cls._selected_stages if cls._selected_stages is not None else range(len(scenario.stages)))
+        futures: dict[int, Future[BaseException | None]] = {}
+
+        def run(stage_index: int, fixture_kwargs: dict[str, Any]) -> BaseException | None:
+            # Stages are submitted in order, so all dependencies are already submitted
+            wait([futures[i] for i in graph[stage_index] if i in futures])
+            try:
+                cls._run_stage(stage_index, fixture_kwargs)
+            except (Exception, pytest.skip.Exception, pytest.fail.Exception) as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=cls._stage_workers, thread_name_prefix=cls.__name__) as executor:
+            for stage_index in selected:
+                stage = scenario.stages[stage_index]
+                try:
+                    # Fixtures can only be requested from the main thread
+                    fixture_kwargs = {name: get_fixture(name) for name in stage.fixtures + scenario.fixtures}
+                except (Exception, pytest.skip.Exception, pytest.fail.Exception) as e:
+                    # The stage doesn't run, stages depending on it don't wait for it
+                    outcomes[stage_index] = e
+                    continue
+                futures[stage_index] = executor.submit(run, stage_index, fixture_kwargs)
+
+        outcomes.update((stage_index, future.result()) for stage_index, future in futures.items())
+
+    @classmethod
+    def _run_stage(cls, stage_index: int, fixture_kwargs: dict[str, Any]) -> None:
+        """Execute a test stage in the scenario run state, see ScenarioState.run_stage.
+
+        Args:
+            stage_index: Position of the stage in the scenario
+            fixture_kwargs: Dictionary of pytest fixture values injected for this stage
+
+        Raises:
+            pytest.skip: If flow is aborted and stage doesn't have always_run=True
+            pytest.fail: If stage execution fails with an error
         """
-        try:
-            # Check abort status
-            if cls._aborted and not stage_template.always_run:
-                pytest.skip(reason="Flow aborted")
-
-            # Verify session is initialized
-            if cls._session is None:
-                raise RuntimeError("Session not initialized - setup_class was not called")
-
-            # Execute stage and get variables to save globally
-            context_updates = stage_executor.execute_stage(
-                stage_template=stage_template,
-                scenario=cls._scenario,
-                session=cls._session,
-                global_context=cls._data_context,  # Pass current global state
-                fixture_kwargs=fixture_kwargs,
-            )
-
-            # Merge returned updates into global context for next stages
-            cls._data_context.update(context_updates)
-
-        except (
-            TemplatesError,
-            StageExecutionError,
-            ValidationError,
-        ) as e:
-            logger.exception(str(e))
-            cls._aborted = True
-            pytest.fail(reason=str(e), pytrace=False)
+        if cls._state is None:
+            # Stages left out of an upfront run, e.g. with markers evaluated differently at run time
+            cls._state = ScenarioState(cls.load_scenario(), cls._adapters)
+        cls._state.run_stage(stage_index, fixture_kwargs)
@@ -7,18 +7,20 @@ test method per stage.
 
 import inspect
 import logging
+from collections.abc import Callable
 from typing import Any
 
 import pytest
-from pytest_httpchain_models.entities import Scenario, Stage
+from pytest_httpchain_models.entities import Scenario
 from simpleeval import EvalWithCompoundTypes
 
 from .carrier import Carrier
+from .scenario_index import ScenarioIndex
 
 logger = logging.getLogger(__name__)
 
 
-def create_test_class(scenario: Scenario, class_name: str) -> type[Carrier]:
+def create_test_class(scenario_index: ScenarioIndex, class_name: str, scenario_loader: Callable[[], Scenario], stage_workers: int = 0) -> type[Carrier]:
     """Create a dynamic test class for the given scenario.
 
     This factory function generates a pytest test class with:
@@ -33,16 +35,25 @@ def create_test_class(scenario: Scenario, class_name: str) -> type[Carrier]:
     - Each method requests fixtures defined in stage and scenario
     - Methods are ordered using pytest-order plugin
 
+    Only the scenario index is needed to build the class; the full scenario
+    is obtained from scenario_loader when the class is set up.
+
+    With stage_workers, independent stages run concurrently (see Carrier.execute_stage).
+    Test methods then also request pytest's request fixture, used to get fixtures
+    of all stages when they run.
+
     Args:
-        scenario: Validated scenario configuration containing stages
+        scenario_index: Stage names, marks and fixtures of the scenario
         class_name: Name for the generated test class
+        scenario_loader: Function returning the validated scenario
+        stage_workers: Number of stages to run concurrently, 0 to run them one by one
 
     Returns:
         A Carrier subclass with test methods for each stage
 
     Example:
         >>> scenario = Scenario.model_validate(test_data)
-        >>> TestClass = create_test_class(scenario, Path("test.json"), "TestAPI")
+        >>> TestClass = create_test_class(ScenarioIndex.from_scenario(scenario), "TestAPI", lambda: scenario)
         >>> # TestClass will have methods: test_0_stage1, test_1_stage2, etc.
     """
     # Create custom Carrier class with scenario bound
@@ -50,17 +61,25 @@ def create_test_class(scenario: Scenario, class_name: str) -> type[Carrier]:
         class_name,
         (Carrier,),
         {
-            "_scenario": scenario,
-            "_session": None,
-            "_data_context": {},
-            "_aborted": False,
+            "_scenario": None,
+            "_scenario_loader": staticmethod(scenario_loader),
+            "_state": None,
+            "_stage_workers": stage_workers,
+            "_selected_stages": None,
+            "_stage_outcomes": None,
         },
     )
 
     # Add stage methods dynamically
-    for i, stage in enumerate(scenario.stages):
-        # Create stage method - using default argument to capture stage
-        def stage_method(self, *, _stage: Stage = stage, **fixture_kwargs: dict[str, Any]) -> None:
+    for i, stage in enumerate(scenario_index.stages):
+        all_fixtures: list[str] = ["self"] + stage.fixtures + scenario_index.fixtures
+        # Concurrent stages need the request fixture, which is not passed on unless the stage asked for it
+        injected_request = bool(stage_workers) and "request" not in all_fixtures
+        if injected_request:
+            all_fixtures.append("request")
+
+        # Create stage method - using default arguments to capture stage position and options
+        def stage_method(self, *, _stage_index: int = i, _injected_request: bool = injected_request, **fixture_kwargs: dict[str, Any]) -> None:
             """Execute a single stage of the test scenario.
 
             Auto-generated method that executes one stage of the HTTP chain test.
@@ -68,10 +87,15 @@ def create_test_class(scenario: Scenario, class_name: str) -> type[Carrier]:
             Args:
                 **fixture_kwargs: Pytest fixtures requested by this stage
             """
-            CustomCarrier.execute_stage(_stage, fixture_kwargs)
+            get_fixture = None
+            if stage_workers:
+                request = fixture_kwargs.pop("request") if _injected_request else fixture_kwargs["request"]
+                get_fixture = request.getfixturevalue
+            CustomCarrier.execute_stage(_stage_index, fixture_kwargs, get_fixture)
+
+        stage_method.stage_index = i
 
         # Set up method signature with fixtures
-        all_fixtures: list[str] = ["self"] + stage.fixtures + scenario.fixtures
         stage_method.__signature__ = inspect.Signature([inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD) for name in all_fixtures])
 
         # Apply markers
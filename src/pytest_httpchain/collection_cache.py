@@ -0,0 +1,143 @@
+"""Persistent collection cache for resolved and validated scenarios.
+
+Resolving $ref statements and validating scenarios is the most expensive part
+of collection. This module stores validated scenarios in pytest's cache
+directory (.pytest_cache) and reuses them on subsequent runs.
+
+Each entry is keyed by the scenario file path and is considered valid only if
+the content hash of the scenario file and of every file it pulls in through
+$ref is unchanged. Versions of the installed pytest-httpchain packages and
+pydantic are part of the key, and so is the models source for editable
+installs, so an upgrade or a change of the scenario schema invalidates all
+entries.
+
+Scenarios are stored as JSON and validated again when loaded, so entries
+never execute code and stay valid models whatever wrote them.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_httpchain_models.entities
+import pytest_httpchain_models.types
+from pytest_httpchain_models.entities import Scenario
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+CACHE_DIR_NAME = "httpchain-scenarios"
+CACHE_KEY_PREFIX = "httpchain/scenarios"
+
+# Distributions whose code shapes validated scenarios
+DISTRIBUTIONS = (
+    "pytest-httpchain",
+    "pytest-httpchain-jsonref",
+    "pytest-httpchain-models",
+    "pytest-httpchain-templates",
+    "pytest-httpchain-userfunc",
+    "pydantic",
+)
+
+
+def file_digest(path: Path) -> str:
+    """Calculate content hash of a file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest of the file content
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def _models_fingerprint() -> str:
+    """Hash installed package versions and the source of the models package to detect schema changes."""
+    digest = hashlib.blake2b()
+    for name in DISTRIBUTIONS:
+        try:
+            version = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{name}={version};".encode())
+    for module in (pytest_httpchain_models.entities, pytest_httpchain_models.types):
+        if module.__file__:
+            digest.update(file_digest(Path(module.__file__)).encode())
+    return digest.hexdigest()
+
+
+class CollectionCache:
+    """On-disk cache of validated scenarios keyed by content hashes.
+
+    Metadata (dependency hashes) is stored via pytest's cache key/value API,
+    validated scenarios are dumped as JSON into a dedicated cache directory.
+    """
+
+    def __init__(self, cache: pytest.Cache, max_parent_traversal_depth: int):
+        self.cache = cache
+        self.directory = cache.mkdir(CACHE_DIR_NAME)
+        self.fingerprint = f"{CACHE_VERSION}:{max_parent_traversal_depth}:{_models_fingerprint()}"
+
+    def get(self, path: Path) -> Scenario | None:
+        """Return cached scenario if neither the file nor its dependencies changed.
+
+        Args:
+            path: Path to the scenario file
+
+        Returns:
+            Validated scenario, or None on cache miss
+        """
+        key = self._key(path)
+        meta = self.cache.get(f"{CACHE_KEY_PREFIX}/{key}", None)
+        if not isinstance(meta, dict) or meta.get("fingerprint") != self.fingerprint:
+            return None
+
+        try:
+            for dependency, digest in meta["dependencies"].items():
+                if file_digest(Path(dependency)) != digest:
+                    return None
+            with open(self.directory / f"{key}.json", "rb") as f:
+                return Scenario.model_validate(json.load(f))
+        except Exception as e:
+            logger.debug(f"Discarding collection cache entry for {path}: {e}")
+            return None
+
+    def set(self, path: Path, scenario: Scenario, dependencies: set[Path]) -> None:
+        """Store validated scenario along with content hashes of its dependencies.
+
+        Args:
+            path: Path to the scenario file
+            scenario: Validated scenario
+            dependencies: Scenario file itself and all files referenced through $ref
+        """
+        key = self._key(path)
+        try:
+            digests: dict[str, Any] = {str(dependency): file_digest(dependency) for dependency in dependencies}
+            blob_path = self.directory / f"{key}.json"
+            tmp_path = blob_path.with_suffix(f".{os.getpid()}.tmp")
+            # Unset fields are left out, so validation restores which fields were set (see connection.scenario_connection)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(scenario.model_dump(mode="json", exclude_unset=True), f)
+            os.replace(tmp_path, blob_path)
+        except Exception as e:
+            logger.debug(f"Cannot store collection cache entry for {path}: {e}")
+            return
+
+        self.cache.set(
+            f"{CACHE_KEY_PREFIX}/{key}",
+            {
+                "fingerprint": self.fingerprint,
+                "dependencies": digests,
+            },
+        )
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return hashlib.blake2b(str(path.resolve()).encode(), digest_size=16).hexdigest()
@@ -0,0 +1,163 @@
+"""HTTP connection pooling and retry configuration.
+
+Scenarios configure connections with the connection block, fields not set
+there take values from the connection ini option (see set_defaults).
+
+Requests speak HTTP/1.1, or HTTP/2 with the http2 option (see http2).
+
+By default every scenario run opens its own connections. With an AdapterPool,
+scenarios with the same connection configuration share one adapter, and so
+warm connections, while keeping their own sessions with cookies and auth.
+"""
+
+import importlib.util
+import ssl
+import threading
+from pathlib import Path
+from typing import Any
+
+import certifi
+import requests.adapters
+from pydantic import ValidationError
+from pytest_httpchain_jsonref.backend import get_backend
+from pytest_httpchain_models.entities import ConnectionConfig, Scenario
+from urllib3.util.retry import Retry
+
+_defaults = ConnectionConfig()
+
+
+def set_defaults(value: str) -> ConnectionConfig:
+    """Set connection configuration used for fields not set by scenarios.
+
+    Args:
+        value: JSON object with ConnectionConfig fields, empty for built-in defaults
+
+    Returns:
+        Default connection configuration
+
+    Raises:
+        ValueError: If the value is not a valid connection configuration
+    """
+    global _defaults
+    try:
+        _defaults = ConnectionConfig.model_validate(get_backend().loads(value)) if value.strip() else ConnectionConfig()
+    except (ValueError, ValidationError) as e:
+        raise ValueError(f"Invalid connection configuration: {e}") from e
+    return _defaults
+
+
+def scenario_connection(scenario: Scenario) -> ConnectionConfig:
+    """Get connection configuration of a scenario.
+
+    Args:
+        scenario: Validated scenario
+
+    Returns:
+        Scenario connection configuration on top of the defaults
+    """
+    if not scenario.connection.model_fields_set:
+        return _defaults
+    return _defaults.model_copy(update=scenario.connection.model_dump(exclude_unset=True))
+
+
+def create_adapter(connection: ConnectionConfig) -> requests.adapters.HTTPAdapter:
+    """Create an HTTP adapter with configured connection pool and retries.
+
+    Retries cover connection errors for all methods and read errors for idempotent
+    methods only, following urllib3's defaults; error responses are not retried.
+
+    Args:
+        connection: Connection configuration
+
+    Returns:
+        HTTP adapter to mount on a session, sending requests with httpx if HTTP/2 is enabled
+
+    Raises:
+        ImportError: If HTTP/2 is enabled without httpx and h2 installed
+    """
+    if connection.http2:
+        if importlib.util.find_spec("h2") is None:
+            raise ImportError("HTTP/2 requires httpx with h2, install pytest-httpchain[http2]")
+        from .http2 import Http2Adapter
+
+        return Http2Adapter(connection)
+
+    max_retries: Retry | int = 0
+    if connection.retries:
+        max_retries = Retry(
+            total=connection.retries,
+            connect=connection.retries,
+            read=connection.retries,
+            backoff_factor=connection.backoff_factor,
+        )
+    return requests.adapters.HTTPAdapter(
+        pool_connections=connection.pool_connections,
+        pool_maxsize=connection.pool_maxsize,
+        max_retries=max_retries,
+        pool_block=connection.pool_block,
+    )
+
+
+def ssl_context(verify: Any, cert: Any) -> ssl.SSLContext | bool:
+    """Translate requests' verify and cert arguments into an SSL context for httpx.
+
+    Args:
+        verify: True, False or path to a CA bundle file or directory
+        cert: Path to a client certificate file, tuple of certificate and key paths, or None
+
+    Returns:
+        SSL context, or False to disable verification without a client certificate
+    """
+    if verify is False and cert is None:
+        return False
+
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif verify is True:
+        context = ssl.create_default_context(cafile=certifi.where())
+    elif Path(verify).is_dir():
+        context = ssl.create_default_context(capath=str(verify))
+    else:
+        context = ssl.create_default_context(cafile=str(verify))
+
+    if isinstance(cert, tuple):
+        context.load_cert_chain(str(cert[0]), str(cert[1]))
+    elif cert is not None:
+        context.load_cert_chain(str(cert))
+    return context
+
+
+class AdapterPool:
+    """HTTP adapters shared by all scenarios of a process, one per connection configuration.
+
+    An adapter keeps a connection pool per target host and TLS settings (verification
+    and client certificate), so a connection is only reused for requests it fits.
+    """
+
+    def __init__(self):
+        self._adapters: dict[ConnectionConfig, requests.adapters.HTTPAdapter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, connection: ConnectionConfig) -> requests.adapters.HTTPAdapter:
+        """Return the adapter for a connection configuration, creating it on first use.
+
+        Args:
+            connection: Connection configuration
+
+        Returns:
+            Shared HTTP adapter, must not be closed by sessions using it
+        """
+        with self._lock:
+            adapter = self._adapters.get(connection)
+            if adapter is None:
+                adapter = self._adapters[connection] = create_adapter(connection)
+            return adapter
+
+    def close(self) -> None:
+        """Close all adapters with their connections."""
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters.clear()
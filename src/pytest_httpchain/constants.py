@@ -8,3 +8,12 @@ class ConfigOptions(StrEnum):
 
     SUFFIX = "suffix"
     REF_PARENT_TRAVERSAL_DEPTH = "ref_parent_traversal_depth"
+    COLLECTION_CACHE = "collection_cache"
+    COLLECTION_WORKERS = "collection_workers"
+    JSON_BACKEND = "json_backend"
+    PARALLEL_STAGES = "parallel_stages"
+    ASYNC_SCENARIOS = "async_scenarios"
+    PARALLEL_SCENARIOS = "parallel_scenarios"
+    XDIST_SCHEDULING = "xdist_scheduling"
+    CONNECTION = "connection"
+    SHARED_CONNECTIONS = "shared_connections"
@@ -5,17 +5,62 @@ maintaining the separation between global and local state.
 """
 
 from collections import ChainMap
+from collections.abc import Mapping
 from typing import Any
 
 import pytest_httpchain_templates.substitution
 from pytest_httpchain_models.entities import Scenario, Stage
 
+_MISSING = object()
+
+
+class ScenarioVarsCache:
+    """Resolved scenario variables, reused across stages of one scenario.
+
+    A variable is resolved again only if a context value it refers to changed
+    since it was last resolved, e.g. a variable saved by a stage or a fixture
+    with a new value. Values are compared by identity, so an equal but new
+    value also causes re-resolution.
+    """
+
+    def __init__(self):
+        self._names: dict[str, set[str]] = {}
+        self._resolved: dict[str, tuple[Any, dict[str, Any]]] = {}
+
+    def resolve(self, scenario_vars: dict[str, Any], context: Mapping[str, Any]) -> dict[str, Any]:
+        """Resolve scenario variables, reusing previous results where possible.
+
+        Args:
+            scenario_vars: Scenario variables with templates
+            context: Context the variables are resolved with
+
+        Returns:
+            Resolved variables
+
+        Raises:
+            TemplatesError: If a variable cannot be resolved
+        """
+        resolved = {}
+        for key, value in scenario_vars.items():
+            entry = self._resolved.get(key)
+            if entry is not None and all(context.get(name, _MISSING) is seen for name, seen in entry[1].items()):
+                resolved[key] = entry[0]
+                continue
+
+            if key not in self._names:
+                self._names[key] = pytest_httpchain_templates.substitution.referenced_names(value)
+            inputs = {name: context.get(name, _MISSING) for name in self._names[key]}
+            resolved[key] = pytest_httpchain_templates.substitution.walk(value, context)
+            self._resolved[key] = (resolved[key], inputs)
+        return resolved
+
 
 def prepare_data_context(
     scenario: Scenario,
     stage_template: Stage,
     global_context: dict[str, Any],
     fixture_kwargs: dict[str, Any],
+    vars_cache: ScenarioVarsCache | None = None,
 ) -> ChainMap[str, Any]:
     """Prepare the complete data context for stage execution.
 
@@ -35,6 +80,7 @@ def prepare_data_context(
         stage_template: The stage being executed
         global_context: Shared context from previous stages
         fixture_kwargs: Pytest fixture values for this stage
+        vars_cache: Cache of scenario variables shared by stages of the scenario
 
     Returns:
         ChainMap with layered context for efficient lookups
@@ -55,10 +101,9 @@ def prepare_data_context(
     # Layer 2: Scenario variables (can reference base)
     scenario_vars = {}
     if scenario.vars:
-        scenario_vars = pytest_httpchain_templates.substitution.walk(
-            scenario.vars,
-            base_context,  # Pass ChainMap directly
-        )
+        if vars_cache is None:
+            vars_cache = ScenarioVarsCache()
+        scenario_vars = vars_cache.resolve(scenario.vars, base_context)
 
     # Layer 3: Stage variables (can reference base + scenario)
     # Process stage vars incrementally so they can reference each other
@@ -0,0 +1,222 @@
+"""HTTP/2 transport for requests sessions.
+
+Requests only speaks HTTP/1.1. Scenarios with http2 set in their connection
+configuration mount an Http2Adapter instead, which sends requests with httpx
+(pytest-httpchain[http2] extra). HTTP/2 is negotiated on HTTPS connections,
+plain HTTP stays on HTTP/1.1. Concurrent requests to one host, from concurrent
+stages or, with shared connections, from parallel scenarios, are multiplexed
+over a single connection.
+
+The adapter only replaces the transport: responses are built the way requests'
+own adapter builds them, so cookies, auth, redirects and hooks are handled by
+the session as with HTTP/1.1.
+
+Only imported if HTTP/2 is configured.
+"""
+
+import functools
+import http.client
+import io
+import threading
+from pathlib import Path
+from typing import Any
+
+import httpx
+import requests
+import requests.adapters
+from pytest_httpchain_models.entities import ConnectionConfig
+from urllib3 import HTTPHeaderDict, HTTPResponse
+
+from .body_sources import CHUNK_SIZE
+from .connection import ssl_context
+
+# Connection-specific headers are not allowed with HTTP/2; keep-alive follows the connection configuration instead
+CONNECTION_HEADERS = frozenset({"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"})
+
+
+class _ResponseMessage:
+    """Headers of a response, in place of the http.client response urllib3 wraps.
+
+    Requests extracts cookies from the wrapped response's message.
+    """
+
+    def __init__(self, method: str, headers: list[tuple[str, str]]):
+        self._method = method
+        self.msg = http.client.HTTPMessage()
+        for name, value in headers:
+            self.msg[name] = value
+
+    def isclosed(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class _RawBody(io.RawIOBase):
+    """Readable file over the raw chunks of a streamed httpx response, closing the response when closed.
+
+    Transport errors are raised as the socket errors urllib3 translates for requests.
+    """
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self._chunks = response.iter_raw()
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        try:
+            while not self._buffer:
+                self._buffer = next(self._chunks, b"")
+                if not self._buffer:
+                    return 0
+        except httpx.TimeoutException as e:
+            raise TimeoutError(str(e)) from e
+        except httpx.TransportError as e:
+            raise OSError(str(e)) from e
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._response.close()
+        super().close()
+
+
+class Http2Adapter(requests.adapters.HTTPAdapter):
+    """Transport adapter sending requests over HTTP/2 with httpx.
+
+    Connections are kept in one httpx transport per TLS settings (verification and
+    client certificate), each with a connection pool per host. The connection
+    configuration applies with httpx's limitations: pool_connections has no
+    equivalent, retries cover connection errors only and happen without backoff.
+    Proxies are not supported.
+
+    Args:
+        connection: Connection configuration
+    """
+
+    def __init__(self, connection: ConnectionConfig):
+        super().__init__(pool_connections=1, pool_maxsize=1)
+        self.connection = connection
+        self._transports: dict[tuple[Any, Any], httpx.HTTPTransport] = {}
+        self._lock = threading.Lock()
+
+    def get_transport(self, verify: Any, cert: Any) -> httpx.HTTPTransport:
+        """Return the transport for TLS settings, creating it on first use.
+
+        Args:
+            verify: True, False or path to a CA bundle file or directory
+            cert: Path to a client certificate file, tuple of certificate and key paths, or None
+
+        Returns:
+            HTTP transport
+        """
+        key = (str(verify) if isinstance(verify, Path) else verify, tuple(cert) if isinstance(cert, list) else cert)
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                transport = self._transports[key] = httpx.HTTPTransport(
+                    verify=ssl_context(*key),
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=self.connection.pool_maxsize if self.connection.pool_block else None,
+                        max_keepalive_connections=self.connection.pool_maxsize if self.connection.keep_alive else 0,
+                    ),
+                    retries=self.connection.retries,
+                )
+            return transport
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        """Send a prepared request.
+
+        Args:
+            request: Prepared request
+            stream: Read the body on demand instead of right away
+            timeout: Seconds to wait for the server, as a number or (connect, read) tuple
+            verify: True, False or path to a CA bundle file or directory
+            cert: Client certificate
+            proxies: Ignored
+
+        Returns:
+            HTTP response
+
+        Raises:
+            requests.ConnectTimeout: If connecting timed out
+            requests.ReadTimeout: If waiting for the response timed out
+            requests.ConnectionError: If the connection failed
+            requests.RequestException: If the request failed otherwise
+        """
+        try:
+            transport = self.get_transport(verify, cert)
+        except OSError as e:
+            raise requests.exceptions.SSLError(e, request=request) from e
+
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        content = request.body
+        if hasattr(content, "read"):
+            # httpx iterates files by lines, binary files are better sent in fixed-size chunks
+            content = iter(functools.partial(content.read, CHUNK_SIZE), b"")
+        http2_request = httpx.Request(
+            method=request.method or "GET",
+            url=request.url or "",
+            headers=[(name, value) for name, value in request.headers.items() if name.lower() not in CONNECTION_HEADERS],
+            content=content,
+            extensions={"timeout": httpx.Timeout(read, connect=connect).as_dict()},
+        )
+
+        try:
+            response = transport.handle_request(http2_request)
+            # Raw bytes, content encoding is decoded by urllib3 as with HTTP/1.1
+            body: io.IOBase
+            if stream:
+                body = io.BufferedReader(_RawBody(response))
+            else:
+                try:
+                    body = io.BytesIO(b"".join(response.iter_raw()))
+                finally:
+                    response.close()
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=request) from e
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=request) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request) from e
+        except httpx.HTTPError as e:
+            raise requests.RequestException(e, request=request) from e
+
+        headers = response.headers.multi_items()
+        raw = HTTPResponse(
+            body=body,
+            headers=HTTPHeaderDict(headers),
+            status=response.status_code,
+            version=20 if response.http_version == "HTTP/2" else 11,
+            version_string=response.http_version,
+            reason=response.reason_phrase,
+            preload_content=False,
+            original_response=_ResponseMessage(http2_request.method, headers),
+            request_method=http2_request.method,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+    def close(self) -> None:
+        """Close all transports with their connections."""
+        with self._lock:
+            for transport in self._transports.values():
+                transport.close()
+            self._transports.clear()
+        super().close()
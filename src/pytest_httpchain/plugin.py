@@ -4,28 +4,42 @@ This module provides the pytest plugin hooks and collection logic for
 discovering and executing HTTP chain tests from JSON files.
 """
 
+import importlib.util
 import logging
+import os
 import re
 import types
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import Any
 
 import pytest
+import pytest_httpchain_jsonref.backend
 import pytest_httpchain_jsonref.loader
-from _pytest import config, nodes, python, reports, runner
+from _pytest import config, nodes, python, reports, runner, skipping
 from _pytest.config import argparsing
 from pydantic import ValidationError
 from pytest_httpchain_jsonref.exceptions import ReferenceResolverError
+from pytest_httpchain_jsonref.plumbing.cache import DocumentCache
 from pytest_httpchain_models.entities import Scenario
 from simpleeval import EvalWithCompoundTypes
 
 from pytest_httpchain.constants import ConfigOptions
 
+from . import connection, scenario_pool
+from .carrier import Carrier
 from .carrier_factory import create_test_class
+from .collection_cache import CollectionCache
+from .prefetch import ScenarioPrefetcher, find_scenario_files
+from .scenario_index import ScenarioIndex
+from .watch import ScenarioWatcher
 
 logger = logging.getLogger(__name__)
 
+collection_cache_key = pytest.StashKey[CollectionCache | None]()
+document_cache_key = pytest.StashKey[DocumentCache]()
+prefetcher_key = pytest.StashKey[ScenarioPrefetcher | None]()
+
 
 class JsonModule(python.Module):
     """JSON test module that collects and executes HTTP chain tests.
@@ -44,32 +58,24 @@ class JsonModule(python.Module):
         3. Creates a dynamic test class using the factory
         4. Yields the test class for pytest to execute
 
+        Steps 1 and 2 are skipped if the collection cache holds an up-to-date entry.
+        Step 2 is postponed until the scenario runs if items are selected with -k or -m.
+
         Yields:
             python.Class: A pytest Class node containing test methods
 
         Raises:
             Collector.CollectError: If JSON loading or validation fails
         """
-        # Load and validate the test scenario from JSON
-        ref_parent_traversal_depth = int(self.config.getini(ConfigOptions.REF_PARENT_TRAVERSAL_DEPTH))
-
-        try:
-            test_data = pytest_httpchain_jsonref.loader.load_json(
-                self.path,
-                max_parent_traversal_depth=ref_parent_traversal_depth,
-            )
-        except ReferenceResolverError as e:
-            logger.exception(str(e))
-            raise nodes.Collector.CollectError("Cannot load JSON file") from e
-
-        try:
-            scenario = Scenario.model_validate(test_data)
-        except ValidationError as e:
-            logger.exception(str(e))
-            raise nodes.Collector.CollectError("Cannot parse test scenario") from e
+        scenario_index, scenario_loader = self._load_scenario()
 
         # Create test class using factory
-        CarrierClass = create_test_class(scenario, self.name)
+        CarrierClass = create_test_class(
+            scenario_index,
+            self.name,
+            scenario_loader,
+            stage_workers=int(self.config.getini(ConfigOptions.PARALLEL_STAGES)),
+        )
 
         # Create pytest Class node
         dummy_module = types.ModuleType("generated")
@@ -85,7 +91,7 @@ class JsonModule(python.Module):
 
         # Apply scenario-level markers
         evaluator = EvalWithCompoundTypes(names={"pytest": pytest})
-        for mark_str in scenario.marks:
+        for mark_str in scenario_index.marks:
             try:
                 marker = evaluator.eval(f"pytest.mark.{mark_str}")
                 if marker:
@@ -95,6 +101,70 @@ class JsonModule(python.Module):
 
         yield json_class
 
+    def _load_scenario(self) -> tuple[ScenarioIndex, Callable[[], Scenario]]:
+        """Load the scenario index and a function returning the validated scenario.
+
+        Uses results of parallel prefetching and the collection cache if enabled. On cache miss, the scenario is validated
+        right away unless validation is postponed (see _postpone_validation); then only
+        the index is validated and full validation happens when the scenario runs.
+
+        Returns:
+            Tuple of scenario index and scenario loader
+
+        Raises:
+            Collector.CollectError: If JSON loading or validation fails
+        """
+        prefetcher = self.config.stash.get(prefetcher_key, None)
+        if prefetcher is not None:
+            scenario = prefetcher.take(self.path)
+            if scenario is not None:
+                return ScenarioIndex.from_scenario(scenario), lambda: scenario
+
+        cache = self.config.stash.get(collection_cache_key, None)
+        if cache is not None:
+            scenario = cache.get(self.path)
+            if scenario is not None:
+                return ScenarioIndex.from_scenario(scenario), lambda: scenario
+
+        # Load the test scenario from JSON
+        ref_parent_traversal_depth = int(self.config.getini(ConfigOptions.REF_PARENT_TRAVERSAL_DEPTH))
+
+        try:
+            test_data, dependencies = pytest_httpchain_jsonref.loader.load_json_with_dependencies(
+                self.path,
+                max_parent_traversal_depth=ref_parent_traversal_depth,
+                cache=self.config.stash[document_cache_key],
+            )
+        except ReferenceResolverError as e:
+            logger.exception(str(e))
+            raise nodes.Collector.CollectError("Cannot load JSON file") from e
+
+        def validate() -> Scenario:
+            validated = Scenario.model_validate(test_data)
+            if cache is not None:
+                cache.set(self.path, validated, dependencies)
+            return validated
+
+        try:
+            if self._postpone_validation():
+                return ScenarioIndex.from_data(test_data), validate
+
+            scenario = validate()
+        except ValidationError as e:
+            logger.exception(str(e))
+            raise nodes.Collector.CollectError("Cannot parse test scenario") from e
+
+        return ScenarioIndex.from_scenario(scenario), lambda: scenario
+
+    def _postpone_validation(self) -> bool:
+        """Check if full validation should wait until the scenario runs.
+
+        With -k or -m most collected items are usually deselected, so validating
+        every scenario upfront is wasted effort. Without selection every scenario
+        runs anyway, and validating during collection reports errors early.
+        """
+        return bool(self.config.option.keyword or self.config.option.markexpr)
+
 
 def pytest_addoption(parser: argparsing.Parser) -> None:
     """Add command-line options for the plugin.
@@ -102,6 +172,19 @@ def pytest_addoption(parser: argparsing.Parser) -> None:
     Registers configuration options that can be set in pytest.ini:
     - httpchain_suffix: File suffix for test files (default: "http")
     - httpchain_ref_parent_traversal_depth: Max parent directory traversals in $ref paths
+    - httpchain_collection_cache: Reuse resolved and validated scenarios between runs
+    - httpchain_collection_workers: Number of processes loading scenarios during collection
+    - httpchain_json_backend: JSON library used for scenario files, request and response bodies
+    - httpchain_parallel_stages: Number of independent stages of a scenario running concurrently
+    - httpchain_async_scenarios: Number of scenarios running concurrently on the asyncio engine
+    - httpchain_parallel_scenarios: Number of scenarios running concurrently on a thread pool
+    - httpchain_xdist_scheduling: Distribute scenarios across xdist workers longest first
+    - httpchain_connection: Default connection pool and retry configuration of scenarios
+    - httpchain_shared_connections: Share connections between scenarios
+
+    The number of collection workers can be overridden with --httpchain-collection-workers,
+    the scenario scheduler can also be enabled with --httpchain-xdist-scheduling.
+    Watch mode is enabled with --httpchain-watch.
 
     Args:
         parser: Pytest's argument parser to add options to
@@ -118,14 +201,99 @@ def pytest_addoption(parser: argparsing.Parser) -> None:
         type="string",
         default="3",
     )
+    parser.addini(
+        name=ConfigOptions.COLLECTION_CACHE,
+        help="Cache resolved and validated scenarios in .pytest_cache between runs.",
+        type="bool",
+        default=False,
+    )
+    parser.addini(
+        name=ConfigOptions.COLLECTION_WORKERS,
+        help="Number of processes loading scenarios in parallel during collection, 'auto' for one per CPU, 0 to disable.",
+        type="string",
+        default="0",
+    )
+    parser.addini(
+        name=ConfigOptions.JSON_BACKEND,
+        help="JSON library for scenario files, request and response bodies: auto, json, orjson or msgspec.",
+        type="string",
+        default="json",
+    )
+    parser.addini(
+        name=ConfigOptions.PARALLEL_STAGES,
+        help="Number of stages of a scenario running concurrently when they don't depend on each other's variables, 0 to run stages one by one.",
+        type="string",
+        default="0",
+    )
+    parser.addini(
+        name=ConfigOptions.ASYNC_SCENARIOS,
+        help="Number of scenarios running concurrently on the asyncio engine (requires httpx), 0 to disable.",
+        type="string",
+        default="0",
+    )
+    parser.addini(
+        name=ConfigOptions.PARALLEL_SCENARIOS,
+        help="Number of scenarios running concurrently on a thread pool, 0 to run scenarios one by one.",
+        type="string",
+        default="0",
+    )
+    parser.addini(
+        name=ConfigOptions.XDIST_SCHEDULING,
+        help="With xdist load distribution, keep stages of a scenario on one worker and start the longest scenarios first.",
+        type="bool",
+        default=False,
+    )
+    parser.addini(
+        name=ConfigOptions.CONNECTION,
+        help='Default connection configuration of scenarios as JSON object, e.g. {"pool_maxsize": 50, "retries": 3}.',
+        type="string",
+        default="",
+    )
+    parser.addini(
+        name=ConfigOptions.SHARED_CONNECTIONS,
+        help="Share warm connections between scenarios with the same connection configuration; sessions with cookies and auth stay separate.",
+        type="bool",
+        default=False,
+    )
+    group = parser.getgroup("httpchain")
+    group.addoption(
+        "--httpchain-collection-workers",
+        dest="httpchain_collection_workers",
+        default=None,
+        help="Number of processes loading scenarios in parallel during collection, 'auto' for one per CPU, 0 to disable.",
+    )
+    group.addoption(
+        "--httpchain-xdist-scheduling",
+        dest="httpchain_xdist_scheduling",
+        action="store_true",
+        default=False,
+        help="With xdist load distribution, keep stages of a scenario on one worker and start the longest scenarios first.",
+    )
+    group.addoption(
+        "--httpchain-watch",
+        dest="httpchain_watch",
+        action="store_true",
+        default=False,
+        help="Keep running and re-run scenarios affected by changes of scenario files, $ref targets and project modules.",
+    )
 
 
 def pytest_configure(config: config.Config) -> None:
-    """Validate configuration settings.
+    """Validate configuration settings and set up plugin state.
 
     Ensures that configuration values are valid:
     - Suffix must be alphanumeric with underscores/hyphens, max 32 chars
     - Reference traversal depth must be non-negative
+    - Number of collection workers must be non-negative or 'auto'
+    - JSON backend must be known and installed
+    - Number of parallel stages must be non-negative
+    - HTTP/2 enabled by default connection configuration requires h2
+
+    Sets up the session-wide document cache for $ref resolution, and the collection cache
+    if it is enabled and pytest's cache provider is active. If xdist is installed, registers
+    the scenario scheduler if enabled, xdist's own schedulers are used otherwise. In watch mode, registers the watcher.
+    With shared connections or in watch mode, scenarios get HTTP adapters from a
+    shared pool to keep connections open.
 
     Args:
         config: Pytest configuration object
@@ -141,6 +309,288 @@ def pytest_configure(config: config.Config) -> None:
     if ref_parent_traversal_depth < 0:
         raise ValueError("Maximum number of parent directory traversals must be non-negative")
 
+    pytest_httpchain_jsonref.backend.set_backend(str(config.getini(ConfigOptions.JSON_BACKEND)))
+
+    if connection.set_defaults(str(config.getini(ConfigOptions.CONNECTION))).http2 and importlib.util.find_spec("h2") is None:
+        raise ValueError("HTTP/2 requires httpx with h2, install pytest-httpchain[http2]")
+
+    if not str(config.getini(ConfigOptions.PARALLEL_STAGES)).isdigit():
+        raise ValueError("Number of parallel stages must be a non-negative integer")
+
+    async_scenarios = str(config.getini(ConfigOptions.ASYNC_SCENARIOS))
+    if not async_scenarios.isdigit():
+        raise ValueError("Number of async scenarios must be a non-negative integer")
+    if int(async_scenarios) > 0:
+        if importlib.util.find_spec("httpx") is None:
+            raise ValueError("Async scenarios require httpx, install pytest-httpchain[async]")
+        if getattr(config.option, "numprocesses", None):
+            raise pytest.UsageError("async_scenarios cannot be used with xdist")
+
+    parallel_scenarios = str(config.getini(ConfigOptions.PARALLEL_SCENARIOS))
+    if not parallel_scenarios.isdigit():
+        raise ValueError("Number of parallel scenarios must be a non-negative integer")
+    if int(parallel_scenarios) > 0 and getattr(config.option, "numprocesses", None):
+        raise pytest.UsageError("parallel_scenarios cannot be used with xdist")
+
+    config.stash[document_cache_key] = DocumentCache()
+
+    cache = None
+    if config.getini(ConfigOptions.COLLECTION_CACHE) and hasattr(config, "cache"):
+        cache = CollectionCache(config.cache, ref_parent_traversal_depth)
+    config.stash[collection_cache_key] = cache
+
+    get_collection_workers(config)
+
+    xdist_scheduling = config.getoption("httpchain_xdist_scheduling") or config.getini(ConfigOptions.XDIST_SCHEDULING)
+    if xdist_scheduling and config.pluginmanager.hasplugin("xdist") and not hasattr(config, "workerinput"):
+        from .xdist_scheduling import SchedulingPlugin
+
+        config.pluginmanager.register(SchedulingPlugin(config), "httpchain-xdist-scheduling")
+
+    if config.getoption("httpchain_watch"):
+        if getattr(config.option, "numprocesses", None):
+            raise pytest.UsageError("--httpchain-watch cannot be used with xdist")
+        watcher = ScenarioWatcher(
+            config,
+            module_type=JsonModule,
+            document_cache=config.stash[document_cache_key],
+            max_parent_traversal_depth=ref_parent_traversal_depth,
+        )
+        config.pluginmanager.register(watcher, "httpchain-watch")
+
+    if config.getini(ConfigOptions.SHARED_CONNECTIONS) or config.getoption("httpchain_watch"):
+        Carrier._adapters = connection.AdapterPool()
+
+
+def pytest_unconfigure(config: config.Config) -> None:
+    """Close HTTP adapters shared by scenarios.
+
+    Args:
+        config: Pytest configuration object
+    """
+    if Carrier._adapters is not None:
+        Carrier._adapters.close()
+        Carrier._adapters = None
+
+
+def get_collection_workers(config: config.Config) -> int:
+    """Get the number of collection worker processes, command line taking precedence over ini.
+
+    Raises:
+        ValueError: If the value is neither a non-negative integer nor 'auto'
+    """
+    value = config.getoption("httpchain_collection_workers")
+    if value is None:
+        value = config.getini(ConfigOptions.COLLECTION_WORKERS)
+    value = str(value).strip()
+    if value == "auto":
+        return os.cpu_count() or 1
+    if not value.isdigit():
+        raise ValueError("Number of collection workers must be a non-negative integer or 'auto'")
+    return int(value)
+
+
+def pytest_collection(session: pytest.Session) -> None:
+    """Start loading scenario files in parallel if collection workers are enabled.
+
+    Args:
+        session: Pytest session about to collect
+    """
+    workers = get_collection_workers(session.config)
+    if workers == 0:
+        session.config.stash[prefetcher_key] = None
+        return
+
+    prefetcher = ScenarioPrefetcher(
+        workers=workers,
+        max_parent_traversal_depth=int(session.config.getini(ConfigOptions.REF_PARENT_TRAVERSAL_DEPTH)),
+        cache=session.config.stash.get(collection_cache_key, None),
+    )
+    invocation_dir = session.config.invocation_params.dir
+    prefetcher.start(
+        find_scenario_files(
+            args=[str(invocation_dir / arg) for arg in session.config.args],
+            suffix=str(session.config.getini(ConfigOptions.SUFFIX)),
+            norecursedirs=session.config.getini("norecursedirs"),
+        )
+    )
+    session.config.stash[prefetcher_key] = prefetcher
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:
+    """Shut down the prefetching process pool once collection is done.
+
+    Args:
+        session: Pytest session that finished collecting
+    """
+    prefetcher = session.config.stash.get(prefetcher_key, None)
+    if prefetcher is not None:
+        prefetcher.shutdown()
+        session.config.stash[prefetcher_key] = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection_modifyitems(items: list[nodes.Item]) -> Any:
+    """Keep stages of each scenario together and tell scenarios which of their stages are selected to run.
+
+    Ordering plugins may interleave stages of different scenarios, e.g. pytest-order
+    with global scope sorts order marks of all scenarios together. Pytest then tears
+    a scenario down and sets it up again between its stages, losing its session and
+    variables. Once other plugins reordered items, stages of each scenario are moved
+    next to its first stage, keeping their relative order; other items keep their
+    positions relative to each other.
+
+    Concurrent stages are all run by the first stage to execute, which needs to
+    skip stages deselected with -k, -m, etc. and stages skipped by markers.
+
+    Args:
+        items: Selected test items
+    """
+    yield
+
+    stages: dict[type[Carrier], list[nodes.Item]] = {}
+    for item in items:
+        cls = getattr(item, "cls", None)
+        if cls is not None and issubclass(cls, Carrier):
+            stages.setdefault(cls, []).append(item)
+
+    grouped: list[nodes.Item] = []
+    for item in items:
+        cls = getattr(item, "cls", None)
+        if cls is None or not issubclass(cls, Carrier):
+            grouped.append(item)
+        elif cls in stages:
+            grouped.extend(stages.pop(cls))
+    items[:] = grouped
+
+    selected: dict[type[Carrier], set[int]] = {}
+    for item in items:
+        cls = getattr(item, "cls", None)
+        stage_index = getattr(getattr(item, "function", None), "stage_index", None)
+        if cls is not None and issubclass(cls, Carrier) and stage_index is not None:
+            stage_indexes = selected.setdefault(cls, set())
+            if will_run(item):
+                stage_indexes.add(stage_index)
+
+    for cls, stage_indexes in selected.items():
+        cls._selected_stages = stage_indexes
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtestloop(session: pytest.Session) -> Any:
+    """Run eligible scenarios concurrently before pytest runs test items.
+
+    Scenarios go to the asyncio engine if enabled, the remaining ones to the
+    scenario thread pool if enabled. Stage items of these scenarios then report
+    the recorded outcomes. Scenarios not eligible for either run as usual.
+
+    Args:
+        session: Pytest session about to run tests
+    """
+    async_scenarios = int(session.config.getini(ConfigOptions.ASYNC_SCENARIOS))
+    parallel_scenarios = int(session.config.getini(ConfigOptions.PARALLEL_SCENARIOS))
+    collection_failed = session.testsfailed and not session.config.option.continue_on_collection_errors
+    if (async_scenarios or parallel_scenarios) and not session.config.option.collectonly and not collection_failed:
+        # Fixtures are only available while pytest runs the stage items
+        with_fixtures = scenarios_with_fixtures(session.items)
+        pending = {cls: stage_indexes for cls, stage_indexes in runnable_stages(session.items).items() if cls not in with_fixtures}
+
+        if async_scenarios:
+            from . import async_engine
+
+            runs = [(cls, stage_indexes) for cls, stage_indexes in pending.items() if async_engine.is_eligible(cls._scenario)]
+            outcomes = async_engine.run_scenarios(
+                [(cls._scenario, stage_indexes) for cls, stage_indexes in runs],
+                async_scenarios,
+                shared_connections=Carrier._adapters is not None,
+            )
+            for (cls, _), stage_outcomes in zip(runs, outcomes, strict=True):
+                cls._stage_outcomes = stage_outcomes
+                del pending[cls]
+
+        if parallel_scenarios:
+            runs = [(cls, stage_indexes) for cls, stage_indexes in pending.items() if scenario_pool.is_eligible(cls._scenario)]
+            outcomes = scenario_pool.run_scenarios([(cls._scenario, stage_indexes) for cls, stage_indexes in runs], parallel_scenarios, Carrier._adapters)
+            for (cls, _), stage_outcomes in zip(runs, outcomes, strict=True):
+                cls._stage_outcomes = stage_outcomes
+
+    yield
+
+
+def will_run(item: nodes.Item) -> bool:
+    """Check if a test item runs, i.e. is not skipped by skip, skipif or xfail(run=False) markers.
+
+    Args:
+        item: Test item
+
+    Returns:
+        True if the item's test function will be called
+    """
+    try:
+        if skipping.evaluate_skip_marks(item) is not None:
+            return False
+        xfailed = skipping.evaluate_xfail_marks(item)
+    except pytest.fail.Exception:
+        # Invalid marker conditions are reported when the item runs
+        return False
+    return xfailed is None or xfailed.run or item.config.option.runxfail
+
+
+def runnable_stages(items: list[nodes.Item]) -> dict[type[Carrier], list[int]]:
+    """Find stages of valid scenarios that will actually run, in order.
+
+    Stages skipped by markers are left out, so running stages upfront doesn't
+    run anything pytest wouldn't.
+
+    Args:
+        items: Selected test items
+
+    Returns:
+        Mapping of scenario classes to positions of their stages to run
+    """
+    stages: dict[type[Carrier], list[int]] = {}
+    for item in items:
+        cls = getattr(item, "cls", None)
+        stage_index = getattr(getattr(item, "function", None), "stage_index", None)
+        if cls is None or not issubclass(cls, Carrier) or stage_index is None or not will_run(item):
+            continue
+        stages.setdefault(cls, []).append(stage_index)
+
+    runnable = {}
+    for cls, stage_indexes in stages.items():
+        try:
+            cls.load_scenario()
+        except pytest.fail.Exception:
+            # Reported when the scenario runs as usual
+            continue
+        runnable[cls] = sorted(stage_indexes)
+    return runnable
+
+
+def scenarios_with_fixtures(items: list[nodes.Item]) -> set[type[Carrier]]:
+    """Find scenarios whose stage items use fixtures.
+
+    Besides fixtures requested by the scenario, autouse fixtures of conftest
+    files and plugins and fixtures added by usefixtures marks apply to stage items.
+
+    Args:
+        items: Selected test items
+
+    Returns:
+        Scenario classes with stage items using such fixtures
+    """
+    found = set()
+    for item in items:
+        cls = getattr(item, "cls", None)
+        if cls is None or not issubclass(cls, Carrier):
+            continue
+        # Pytest runs setup_class through a fixture, concurrent stages request the
+        # request fixture to get fixtures of other stages
+        names = [name for name in getattr(item, "fixturenames", ()) if name != "request" and not name.startswith("_xunit_setup_")]
+        if names:
+            found.add(cls)
+    return found
+
 
 def pytest_collect_file(file_path: Path, parent: nodes.Collector) -> nodes.Collector | None:
     """Collect JSON test files matching the configured pattern.
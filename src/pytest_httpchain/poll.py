@@ -0,0 +1,134 @@
+"""Polling a stage request until its response meets a condition.
+
+Stages with a poll block re-issue their request until the response passes the
+poll condition, written in verify syntax, or the poll timeout passes. Delays
+between attempts grow exponentially up to a limit, optionally with jitter, and
+follow the server's Retry-After header when it sends one. Requests go through
+the stage's session or client, so attempts reuse warm connections.
+"""
+
+import email.utils
+import logging
+import random
+import time
+from collections import ChainMap
+from collections.abc import Callable
+from typing import Any
+
+import requests
+from pytest_httpchain_models.entities import Poll
+
+from .exceptions import VerificationError
+from .response import ResponseView, process_verify_step
+
+logger = logging.getLogger(__name__)
+
+
+def retry_after(response: requests.Response) -> float | None:
+    """Get the delay a response asks for with its Retry-After header.
+
+    Args:
+        response: HTTP response object
+
+    Returns:
+        Delay in seconds, None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class Poller:
+    """Decides after each attempt whether to stop polling or how long to wait.
+
+    Args:
+        poll_model: Resolved poll configuration
+        local_context: Stage context the condition is verified with
+        clock: Monotonic clock in seconds
+    """
+
+    def __init__(self, poll_model: Poll, local_context: ChainMap[str, Any], clock: Callable[[], float] = time.monotonic):
+        self.poll_model = poll_model
+        self.local_context = local_context
+        self.clock = clock
+        self.attempts = 0
+        self.deadline = clock() + poll_model.timeout
+        # Grown step by step, a power of the multiplier overflows after many attempts
+        self.backoff = min(poll_model.interval, poll_model.max_interval)
+
+    def next_delay(self, response: requests.Response) -> float | None:
+        """Check the response of an attempt.
+
+        Args:
+            response: HTTP response of the attempt
+
+        Returns:
+            None if the response meets the condition, seconds to wait before the next attempt otherwise
+
+        Raises:
+            VerificationError: If the condition is not met before the timeout
+        """
+        self.attempts += 1
+        try:
+            process_verify_step(self.poll_model.until, self.local_context, response)
+        except VerificationError as e:
+            remaining = self.deadline - self.clock()
+            if remaining <= 0:
+                raise VerificationError(f"Poll condition not met after {self.attempts} attempts in {self.poll_model.timeout}s: {e}") from e
+            logger.debug(f"Poll attempt {self.attempts} not ready: {e}")
+            return min(self.delay(response), remaining)
+        return None
+
+    def delay(self, response: requests.Response) -> float:
+        """Compute the delay before the next attempt, see Poll for the options.
+
+        Args:
+            response: HTTP response of the last attempt
+
+        Returns:
+            Delay in seconds
+        """
+        delay = self.backoff
+        self.backoff = min(self.backoff * self.poll_model.multiplier, self.poll_model.max_interval)
+
+        if self.poll_model.retry_after:
+            requested = retry_after(response)
+            if requested is not None:
+                return requested
+
+        if self.poll_model.jitter:
+            delay = random.uniform(delay / 2, delay)
+        return delay
+
+
+def poll(send: Callable[[], requests.Response], poll_model: Poll, local_context: ChainMap[str, Any]) -> requests.Response:
+    """Send a request until its response meets the poll condition.
+
+    Args:
+        send: Function sending the stage request
+        poll_model: Resolved poll configuration
+        local_context: Stage context the condition is verified with
+
+    Returns:
+        First response meeting the condition
+
+    Raises:
+        RequestError: If a request fails
+        VerificationError: If the condition is not met before the timeout
+    """
+    poller = Poller(poll_model, local_context)
+    while True:
+        # The attempt meeting the condition is processed by response steps with the body already parsed
+        response = ResponseView.of(send())
+        delay = poller.next_delay(response)
+        if delay is None:
+            return response
+        time.sleep(delay)
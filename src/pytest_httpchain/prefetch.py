@@ -0,0 +1,153 @@
+"""Parallel scenario loading for collection.
+
+Resolving references and validating scenarios is CPU-bound. When enabled, the
+prefetcher discovers all scenario files upfront and loads them in a process
+pool, so JsonModule only picks up ready results as collection reaches each file.
+"""
+
+import fnmatch
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import pytest_httpchain_jsonref.backend
+import pytest_httpchain_jsonref.loader
+from pytest_httpchain_jsonref.plumbing.cache import DocumentCache
+from pytest_httpchain_models.entities import Scenario
+
+from .collection_cache import CollectionCache
+
+logger = logging.getLogger(__name__)
+
+_worker_document_cache: DocumentCache | None = None
+
+
+def _init_worker(json_backend: str) -> None:
+    global _worker_document_cache
+    pytest_httpchain_jsonref.backend.set_backend(json_backend)
+    _worker_document_cache = DocumentCache()
+
+
+def load_scenario_file(path: Path, max_parent_traversal_depth: int) -> tuple[Scenario, set[Path]] | None:
+    """Load and validate a scenario file in a worker process.
+
+    Errors are not propagated: the main process loads failed files again
+    itself to report errors the usual way.
+
+    Args:
+        path: Path to the scenario file
+        max_parent_traversal_depth: Maximum number of parent directory traversals allowed in $ref paths
+
+    Returns:
+        Tuple of validated scenario and its file dependencies, or None on any error
+    """
+    try:
+        test_data, dependencies = pytest_httpchain_jsonref.loader.load_json_with_dependencies(
+            path,
+            max_parent_traversal_depth=max_parent_traversal_depth,
+            cache=_worker_document_cache,
+        )
+        return Scenario.model_validate(test_data), dependencies
+    except Exception:
+        return None
+
+
+def find_scenario_files(args: Iterable[str], suffix: str, norecursedirs: list[str]) -> Iterator[Path]:
+    """Find scenario files the way pytest collection would.
+
+    Args:
+        args: Pytest command line arguments (paths, optionally with ::node ids)
+        suffix: Configured scenario file suffix
+        norecursedirs: Directory name patterns to skip
+
+    Yields:
+        Resolved paths of matching scenario files
+    """
+    pattern = f"test_*.{suffix}.json"
+    for arg in args:
+        path = Path(arg.split("::", 1)[0])
+        if path.is_file():
+            if fnmatch.fnmatch(path.name, pattern):
+                yield path.resolve()
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [name for name in dirnames if not any(fnmatch.fnmatch(name, ignored) for ignored in norecursedirs)]
+            for filename in filenames:
+                if fnmatch.fnmatch(filename, pattern):
+                    yield (Path(dirpath) / filename).resolve()
+
+
+class ScenarioPrefetcher:
+    """Loads scenario files in a process pool ahead of collection.
+
+    Files with an up-to-date collection cache entry are served from the cache
+    and never sent to the pool.
+    """
+
+    def __init__(self, workers: int, max_parent_traversal_depth: int, cache: CollectionCache | None):
+        self.workers = workers
+        self.max_parent_traversal_depth = max_parent_traversal_depth
+        self.cache = cache
+        self._executor: ProcessPoolExecutor | None = None
+        self._ready: dict[Path, Scenario] = {}
+        self._futures: dict[Path, Future] = {}
+
+    def start(self, paths: Iterable[Path]) -> None:
+        """Submit scenario files for loading.
+
+        Args:
+            paths: Resolved paths of scenario files
+        """
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(pytest_httpchain_jsonref.backend.get_backend().name,),
+        )
+        for path in paths:
+            if path in self._ready or path in self._futures:
+                continue
+            if self.cache is not None and (scenario := self.cache.get(path)) is not None:
+                self._ready[path] = scenario
+                continue
+            self._futures[path] = self._executor.submit(load_scenario_file, path, self.max_parent_traversal_depth)
+
+    def take(self, path: Path) -> Scenario | None:
+        """Return prefetched scenario, waiting for it if still loading.
+
+        Args:
+            path: Path to the scenario file
+
+        Returns:
+            Validated scenario, or None if the file was not prefetched or failed to load
+        """
+        path = path.resolve()
+        if path in self._ready:
+            return self._ready.pop(path)
+
+        future = self._futures.pop(path, None)
+        if future is None:
+            return None
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.debug(f"Prefetching {path} failed: {e}")
+            return None
+        if result is None:
+            return None
+
+        scenario, dependencies = result
+        if self.cache is not None:
+            self.cache.set(path, scenario, dependencies)
+        return scenario
+
+    def shutdown(self) -> None:
+        """Stop the pool and drop results nobody asked for."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._ready.clear()
+        self._futures.clear()
@@ -4,14 +4,19 @@ This module handles the preparation of HTTP requests from test configurations
 and their execution using the requests library.
 """
 
+import io
+import tempfile
+from collections.abc import Mapping
 from contextlib import ExitStack
-from pathlib import Path
 from typing import Any
 
 import requests
+from pytest_httpchain_jsonref.backend import get_backend
 from pytest_httpchain_models.entities import (
+    FileBody,
     FilesBody,
     FormBody,
+    GeneratorBody,
     JsonBody,
     RawBody,
     XmlBody,
@@ -19,31 +24,44 @@ from pytest_httpchain_models.entities import (
 from pytest_httpchain_models.entities import (
     Request as RequestModel,
 )
+from pytest_httpchain_templates.exceptions import TemplatesError
 from pytest_httpchain_userfunc.auth import call_auth_function
+from pytest_httpchain_userfunc.body import call_body_function
+from requests.structures import CaseInsensitiveDict
 
+from .body_sources import MultipartStream, encode_chunks, render_file
 from .exceptions import RequestError
 from .helpers import call_user_function
 
+# Size of chunks the response body is downloaded and read back in
+CHUNK_SIZE = 64 * 1024
+# Streamed bodies up to this size stay in memory, larger ones roll over to a temporary file
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
 
 def prepare_and_execute(
     session: requests.Session,
     request_model: RequestModel,
+    context: Mapping[str, Any] | None = None,
 ) -> requests.Response:
     """Prepare and execute an HTTP request.
 
     This function combines preparation and execution to avoid unnecessary
     complexity. It handles authentication, different body types, and file
-    uploads with proper resource management.
+    uploads with proper resource management. Bodies from files and body
+    functions are streamed, see body_sources.
 
     Args:
         session: HTTP session to use for the request
         request_model: Validated request model
+        context: Variables for templates in body files rendered while they are sent
 
     Returns:
         HTTP response object
 
     Raises:
         RequestError: If request preparation or execution fails
+        TemplatesError: If a body file cannot be rendered
     """
 
     # Base request kwargs
@@ -55,6 +73,8 @@ def prepare_and_execute(
         "timeout": request_model.timeout,
         "allow_redirects": request_model.allow_redirects,
         "verify": request_model.ssl.verify,
+        # The body is read by read_body if it has to be spooled or limited
+        "stream": request_model.stream or request_model.max_body_bytes is not None,
     }
 
     # Add SSL cert if present
@@ -68,35 +88,100 @@ def prepare_and_execute(
         except Exception as e:
             raise RequestError("Failed to configure authentication") from e
 
-    # Handle different body types
-    match request_model.body:
-        case None:
-            pass
-        case JsonBody(json=data):
-            kwargs["json"] = data
-        case FormBody(form=data) | XmlBody(xml=data) | RawBody(raw=data):
-            kwargs["data"] = data
-        case FilesBody(files=file_paths):
-            # Handle file uploads with context manager
-            with ExitStack() as stack:
+    with ExitStack() as stack:
+        # Handle different body types, files are read while the request is sent
+        match request_model.body:
+            case None:
+                pass
+            case JsonBody(json=data):
                 try:
-                    files_dict = {}
-                    for field_name, file_path in file_paths.items():
-                        file_handle = stack.enter_context(open(file_path, "rb"))
-                        files_dict[field_name] = (Path(file_path).name, file_handle)
-                    kwargs["files"] = files_dict
-
-                    return session.request(**kwargs)
+                    kwargs["data"] = get_backend().dumps(data)
+                except (TypeError, ValueError) as e:
+                    raise RequestError("Cannot encode JSON body") from e
+                kwargs["headers"] = CaseInsensitiveDict(request_model.headers)
+                kwargs["headers"].setdefault("Content-Type", "application/json")
+            case FormBody(form=data) | XmlBody(xml=data) | RawBody(raw=data):
+                kwargs["data"] = data
+            case FilesBody(files=file_paths):
+                try:
+                    multipart = MultipartStream({field_name: stack.enter_context(open(file_path, "rb")) for field_name, file_path in file_paths.items()})
                 except FileNotFoundError as e:
                     raise RequestError("File not found for upload") from e
+                kwargs["data"] = multipart
+                kwargs["headers"] = CaseInsensitiveDict(request_model.headers)
+                kwargs["headers"].setdefault("Content-Type", multipart.content_type)
+            case FileBody(file=file_path, render=render):
+                try:
+                    file = stack.enter_context(open(file_path, encoding="utf-8", newline="") if render else open(file_path, "rb"))
+                except FileNotFoundError as e:
+                    raise RequestError("File not found for body") from e
+                # Rendered content has no known length and is sent in chunks
+                kwargs["data"] = render_file(file, context or {}) if render else file
+            case GeneratorBody(generator=generator):
+                try:
+                    kwargs["data"] = encode_chunks(call_user_function(generator, call_body_function))
+                except Exception as e:
+                    raise RequestError("Failed to create request body") from e
+
+        try:
+            response = session.request(**kwargs)
+        except TemplatesError:
+            # Raised while rendering a body file as it is sent
+            raise
+        except requests.Timeout as e:
+            raise RequestError("HTTP request timed out") from e
+        except requests.ConnectionError as e:
+            raise RequestError("HTTP connection error") from e
+        except requests.RequestException as e:
+            raise RequestError("HTTP request failed") from e
+        except Exception as e:
+            raise RequestError("Unexpected error") from e
+
+    return read_body(response, request_model)
+
+
+def read_body(response: requests.Response, request_model: RequestModel) -> requests.Response:
+    """Download a body requested with stream, enforcing the body size limit.
+
+    Streamed bodies are spooled to a temporary file that replaces the raw response, so
+    response.content still loads the body on demand while body checks can read it back
+    in chunks (see response.iter_text). Other bodies are read into memory as usual.
+
+    Args:
+        response: HTTP response, its body not read yet if the request streams it
+        request_model: Validated request model
+
+    Returns:
+        The response with its body read
+
+    Raises:
+        RequestError: If the body exceeds max_body_bytes or cannot be read
+    """
+    if not request_model.stream and request_model.max_body_bytes is None:
+        return response
 
+    body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES) if request_model.stream else io.BytesIO()
+    size = 0
     try:
-        return session.request(**kwargs)
-    except requests.Timeout as e:
-        raise RequestError("HTTP request timed out") from e
-    except requests.ConnectionError as e:
-        raise RequestError("HTTP connection error") from e
+        # Decoded chunks, as response.content would have them
+        for chunk in response.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            if request_model.max_body_bytes is not None and size > request_model.max_body_bytes:
+                body.close()
+                raise RequestError(f"Response body exceeds {request_model.max_body_bytes} bytes")
+            body.write(chunk)
     except requests.RequestException as e:
-        raise RequestError("HTTP request failed") from e
-    except Exception as e:
-        raise RequestError("Unexpected error") from e
+        body.close()
+        raise RequestError("Cannot read response body") from e
+    finally:
+        # Returns the connection to the pool, or drops it if the body was not read to the end
+        response.close()
+
+    if request_model.stream:
+        body.seek(0)
+        response.raw = body
+        response._content = False
+        response._content_consumed = False
+    else:
+        response._content = body.getvalue()
+    return response
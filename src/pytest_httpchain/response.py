@@ -1,25 +1,130 @@
 """Response processing and verification for HTTP chain tests.
 
 This module handles the processing of HTTP responses including data extraction
-(save operations) and verification of response content.
+(save operations) and verification of response content. The body is parsed at
+most once per response, see ResponseView.
 """
 
+import codecs
 import json
-import re
+import tempfile
+import xml.etree.ElementTree
 from collections import ChainMap
+from collections.abc import Iterable, Iterator
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import jmespath
 import jsonschema
 import requests
-from pytest_httpchain_models.entities import Save, Verify
+from pytest_httpchain_jsonref.backend import get_backend
+from pytest_httpchain_models.entities import ResponseBody, Save, Verify
 from pytest_httpchain_models.types import check_json_schema
 from pytest_httpchain_userfunc.save import call_save_function
 from pytest_httpchain_userfunc.verify import call_verify_function
 
+from .body_matcher import body_matcher
 from .exceptions import SaveError, VerificationError
 from .helpers import call_user_function
+from .request import CHUNK_SIZE
+
+# Characters of the previous chunk regular expressions see when checking a streamed body
+REGEX_WINDOW = 64 * 1024
+
+
+def response_json(response: requests.Response) -> Any:
+    """Decode JSON response body with the configured JSON backend.
+
+    UTF-8 bodies are decoded by the backend directly from raw bytes. Bodies in
+    other encodings, declared or detected by requests (UTF-16, UTF-32, byte
+    order marks), are decoded by requests.Response.json().
+
+    Args:
+        response: HTTP response object
+
+    Returns:
+        Decoded JSON body
+
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON
+        UnicodeDecodeError: If the body cannot be decoded
+    """
+    encoding = response.encoding
+    if encoding is None and response.content:
+        encoding = requests.utils.guess_json_utf(response.content)
+    if encoding is not None and encoding.lower().replace("_", "-") in ("utf-8", "utf8"):
+        return get_backend().loads(response.content)
+    # Not response.json(), which ResponseView implements with this function
+    return requests.Response.json(response)
+
+
+class ResponseView(requests.Response):
+    """Response parsing its body at most once, whichever step or user function needs it first.
+
+    Response steps of a stage and the user functions they call all get the same
+    view, so the body is decoded to text, parsed as JSON or parsed as XML only
+    once. Parsed values are shared: user functions must not modify them.
+
+    Create views with ResponseView.of, they share the connection and raw body
+    with the response they are created from.
+    """
+
+    _json: Any
+
+    @classmethod
+    def of(cls, response: requests.Response) -> "ResponseView":
+        """Return a view of a response, or the response itself if it is a view already.
+
+        Args:
+            response: HTTP response object
+
+        Returns:
+            Response view
+        """
+        if isinstance(response, cls):
+            return response
+        view = cls.__new__(cls)
+        view.__dict__.update(response.__dict__)
+        return view
+
+    @cached_property
+    def text(self) -> str:  # type: ignore[override]
+        """Body decoded as with requests.Response.text."""
+        return super().text
+
+    def json(self, **kwargs: Any) -> Any:
+        """Decode the JSON body with the configured JSON backend, see response_json.
+
+        Args:
+            **kwargs: Arguments for json.loads, decoding again with them instead of using the parsed body
+
+        Returns:
+            Decoded JSON body
+
+        Raises:
+            requests.JSONDecodeError: If the body is not valid JSON
+        """
+        if kwargs:
+            return super().json(**kwargs)
+        if "_json" not in self.__dict__:
+            try:
+                self._json = response_json(self)
+            except json.JSONDecodeError as e:
+                # As raised by requests.Response.json
+                raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
+            except UnicodeDecodeError as e:
+                raise requests.JSONDecodeError(str(e), "", 0) from e
+        return self._json
+
+    @cached_property
+    def xml(self) -> xml.etree.ElementTree.Element:
+        """Root element of the body parsed as XML.
+
+        Raises:
+            xml.etree.ElementTree.ParseError: If the body is not well-formed XML
+        """
+        return xml.etree.ElementTree.fromstring(self.content)
 
 
 def process_save_step(
@@ -34,7 +139,7 @@ def process_save_step(
 
     Args:
         save_model: Validated Save model
-        response: HTTP response object
+        response: HTTP response object, viewed with ResponseView unless it is a view already
 
     Returns:
         Dictionary of variables to add to global context
@@ -44,20 +149,22 @@ def process_save_step(
 
     Note:
         Save functions must conform to the SaveFunction protocol,
-        accepting a response and returning a dict[str, Any].
+        accepting a response and returning a dict[str, Any]. They get the view, with
+        its parsed body.
     """
+    response = ResponseView.of(response)
     result: dict[str, Any] = {}
 
     # Extract JSON only if we need it for JMESPath expressions
     if len(save_model.vars) > 0:
         try:
-            response_json = response.json()
-        except (requests.JSONDecodeError, UnicodeDecodeError) as e:
+            body_json = response.json()
+        except json.JSONDecodeError as e:
             raise SaveError("Cannot extract variables: response is not valid JSON") from e
 
         for var_name, jmespath_expr in save_model.vars.items():
             try:
-                saved_value = jmespath.search(jmespath_expr, response_json)
+                saved_value = jmespath.search(jmespath_expr, body_json)
                 result[var_name] = saved_value
             except jmespath.exceptions.JMESPathError as e:
                 raise SaveError(f"Error saving variable {var_name}") from e
@@ -90,16 +197,17 @@ def process_verify_step(
     Args:
         verify_model: Validated Verify model
         local_context: Current execution context
-        response: HTTP response object
+        response: HTTP response object, viewed with ResponseView unless it is a view already
 
     Raises:
         VerificationError: If any verification fails
 
     Note:
         Verify functions must conform to the VerifyFunction protocol,
-        accepting a response and returning a bool.
+        accepting a response and returning a bool. They get the view, with
+        its parsed body.
     """
-
+    response = ResponseView.of(response)
     if verify_model.status and response.status_code != verify_model.status.value:
         raise VerificationError(f"Status code doesn't match: expected {verify_model.status.value}, got {response.status_code}")
 
@@ -128,38 +236,107 @@ def process_verify_step(
         if isinstance(schema, str | Path):
             schema_path = Path(schema)
             try:
-                schema = json.loads(schema_path.read_text())
+                schema = get_backend().loads(schema_path.read_bytes())
                 check_json_schema(schema)
-            except (OSError, json.JSONDecodeError) as e:
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
                 raise VerificationError(f"Error reading body schema file '{schema_path}'") from e
             except jsonschema.SchemaError as e:
                 raise VerificationError(f"Invalid JSON Schema in file '{schema_path}': {e.message}") from e
 
         # Extract JSON for schema validation
         try:
-            response_json = response.json()
-        except (requests.JSONDecodeError, UnicodeDecodeError) as e:
+            body_json = response.json()
+        except json.JSONDecodeError as e:
             raise VerificationError("Cannot validate schema: response is not valid JSON") from e
 
         try:
-            jsonschema.validate(instance=response_json, schema=schema)
+            jsonschema.validate(instance=body_json, schema=schema)
         except jsonschema.ValidationError as e:
             raise VerificationError("Body schema validation failed") from e
         except jsonschema.SchemaError as e:
             raise VerificationError("Invalid body validation schema") from e
 
-    for substring in verify_model.body.contains:
-        if substring not in response.text:
-            raise VerificationError(f"Body doesn't contain '{substring}'")
+    body = verify_model.body
+    if body.contains or body.not_contains or body.matches or body.not_matches:
+        verify_body_text(body, iter_text(response))
 
-    for substring in verify_model.body.not_contains:
-        if substring in response.text:
-            raise VerificationError(f"Body contains '{substring}' while it shouldn't")
 
-    for pattern in verify_model.body.matches:
-        if not re.search(pattern, response.text):
-            raise VerificationError(f"Body doesn't match '{pattern}'")
+def iter_text(response: requests.Response) -> Iterator[str]:
+    """Decode the response body, chunk by chunk if it was streamed.
 
-    for pattern in verify_model.body.not_matches:
-        if re.search(pattern, response.text):
-            raise VerificationError(f"Body matches '{pattern}' while it shouldn't")
+    Bodies in memory are decoded at once, exactly like response.text. Bodies spooled
+    by streamed requests (see request.read_body) are read back from the start in
+    chunks without loading them into memory, decoded with the declared encoding or
+    UTF-8, replacing undecodable bytes.
+
+    Args:
+        response: HTTP response object
+
+    Yields:
+        Consecutive parts of the body text
+    """
+    spool = response.raw
+    if response._content_consumed or not isinstance(spool, tempfile.SpooledTemporaryFile):
+        yield response.text
+        return
+
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    spool.seek(0)
+    try:
+        while chunk := spool.read(CHUNK_SIZE):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+    finally:
+        # response.content reads the body from the current position
+        spool.seek(0)
+
+
+def verify_body_text(body: ResponseBody, chunks: Iterable[str]) -> None:
+    """Check contains, not_contains, matches and not_matches over the body text.
+
+    Entries are compiled once into a matcher, see body_matcher, and entries
+    found in a chunk are not looked for in the next ones. The text is checked
+    as it comes, keeping the end of the previous chunk so substrings split
+    between chunks are found. Regular
+    expressions see at most REGEX_WINDOW characters of the previous chunk,
+    matches spanning more than that are not found across chunks. Reading stops
+    at the first unwanted match, or once nothing is left to look for.
+
+    Args:
+        body: Response body verification configuration
+        chunks: Consecutive parts of the body text
+
+    Raises:
+        VerificationError: If any check fails
+    """
+    matcher = body_matcher(frozenset([*body.contains, *body.not_contains]), frozenset([*body.matches, *body.not_matches]))
+    unwanted_literals = frozenset(body.not_contains)
+    unwanted_patterns = frozenset(body.not_matches)
+    literals, patterns = matcher.literals, matcher.patterns
+    keep = max(map(len, literals), default=1) - 1
+    if patterns:
+        keep = max(keep, REGEX_WINDOW)
+    tail = ""
+
+    for chunk in chunks:
+        window = tail + chunk
+        found = matcher.find_literals(window, literals, stop=unwanted_literals)
+        for substring in body.not_contains:
+            if substring in found:
+                raise VerificationError(f"Body contains '{substring}' while it shouldn't")
+        literals -= found
+        found = matcher.find_patterns(window, patterns, stop=unwanted_patterns)
+        for pattern in body.not_matches:
+            if pattern in found:
+                raise VerificationError(f"Body matches '{pattern}' while it shouldn't")
+        patterns -= found
+        if not literals and not patterns:
+            break
+        tail = window[-keep:] if keep else ""
+
+    missing = [substring for substring in body.contains if substring in literals]
+    if missing:
+        raise VerificationError(f"Body doesn't contain '{missing[0]}'")
+    unmatched = [pattern for pattern in body.matches if pattern in patterns]
+    if unmatched:
+        raise VerificationError(f"Body doesn't match '{unmatched[0]}'")
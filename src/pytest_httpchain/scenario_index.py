@@ -0,0 +1,48 @@
+"""Lightweight scenario index used for collection.
+
+Pytest needs very little from a scenario to collect it: stage names (for test
+names and -k), marks (for -m, skip, xfail, etc.) and fixtures (for test method
+signatures). The index holds exactly that, so full Scenario validation can be
+postponed until a scenario actually runs.
+"""
+
+from typing import Any, Self
+
+from pydantic import BaseModel, ConfigDict, Field
+from pytest_httpchain_models.entities import Scenario
+
+
+class StageIndex(BaseModel):
+    """Collection-relevant part of a stage."""
+
+    name: str
+    marks: list[str] = Field(default_factory=list)
+    fixtures: list[str] = Field(default_factory=list)
+    model_config = ConfigDict(extra="ignore")
+
+
+class ScenarioIndex(BaseModel):
+    """Collection-relevant part of a scenario."""
+
+    marks: list[str] = Field(default_factory=list)
+    fixtures: list[str] = Field(default_factory=list)
+    stages: list[StageIndex] = Field(default_factory=list)
+    model_config = ConfigDict(extra="ignore")
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> Self:
+        """Build index from resolved scenario data without validating the rest of it.
+
+        Raises:
+            ValidationError: If index fields are malformed
+        """
+        return cls.model_validate(data)
+
+    @classmethod
+    def from_scenario(cls, scenario: Scenario) -> Self:
+        """Build index from an already validated scenario."""
+        return cls.model_construct(
+            marks=scenario.marks,
+            fixtures=scenario.fixtures,
+            stages=[StageIndex.model_construct(name=stage.name, marks=stage.marks, fixtures=stage.fixtures) for stage in scenario.stages],
+        )
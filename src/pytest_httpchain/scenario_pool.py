@@ -0,0 +1,94 @@
+"""Thread pool running whole scenarios concurrently within one pytest process.
+
+Scenarios are run upfront, before pytest runs test items, each on a worker
+thread with its own ScenarioState. Stages within a scenario run one by one.
+Stage items then report the recorded outcomes (see Carrier.execute_stage).
+
+Worker threads spend most of their time waiting for responses, so the pool
+scales with the GIL; on free-threaded Python builds template evaluation and
+response processing run in parallel as well.
+"""
+
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest_httpchain_models.entities import Scenario
+
+from .connection import AdapterPool
+from .scenario_state import ScenarioState
+
+logger = logging.getLogger(__name__)
+
+StageOutcomes = dict[int, BaseException | None]
+
+
+def is_eligible(scenario: Scenario) -> bool:
+    """Check if a scenario can run on the thread pool.
+
+    Scenarios using pytest fixtures are not eligible, as fixtures are only
+    available while pytest runs the stage items. Autouse fixtures are not
+    part of the scenario and are checked on stage items by the plugin.
+
+    Args:
+        scenario: Validated scenario
+
+    Returns:
+        True if the scenario can run on the thread pool
+    """
+    return not scenario.fixtures and not any(stage.fixtures for stage in scenario.stages)
+
+
+def run_scenarios(
+    scenarios: Sequence[tuple[Scenario, Sequence[int]]],
+    workers: int,
+    adapters: AdapterPool | None = None,
+) -> list[StageOutcomes | None]:
+    """Run scenarios concurrently on a thread pool.
+
+    Args:
+        scenarios: Scenarios with positions of stages to run
+        workers: Maximum number of scenarios in progress at the same time
+        adapters: HTTP adapters shared by all scenarios, if connections are shared
+
+    Returns:
+        Outcomes of each scenario's stages, in the order of scenarios:
+        None for passed stages, the exception raised by the stage otherwise.
+        None instead of outcomes for scenarios whose run state cannot be set up
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="httpchain-scenario") as executor:
+        futures = [executor.submit(run_scenario, scenario, stage_indexes, adapters) for scenario, stage_indexes in scenarios]
+    return [future.result() for future in futures]
+
+
+def run_scenario(scenario: Scenario, stage_indexes: Sequence[int], adapters: AdapterPool | None = None) -> StageOutcomes | None:
+    """Run stages of a scenario one by one in a new run state.
+
+    Args:
+        scenario: Validated scenario
+        stage_indexes: Positions of stages to run, in order
+        adapters: HTTP adapters shared with other scenarios, if connections are shared
+
+    Returns:
+        Outcome of each stage run, None if the run state cannot be set up
+    """
+    try:
+        state = ScenarioState(scenario, adapters)
+    except Exception as e:
+        # Stages run as usual and report the error from setup_class
+        logger.debug(f"Cannot set up scenario run: {e}")
+        return None
+
+    outcomes: StageOutcomes = {}
+    try:
+        for stage_index in stage_indexes:
+            try:
+                state.run_stage(stage_index, {})
+            except (Exception, pytest.skip.Exception, pytest.fail.Exception) as e:
+                outcomes[stage_index] = e
+            else:
+                outcomes[stage_index] = None
+    finally:
+        state.close()
+    return outcomes
@@ -0,0 +1,138 @@
+"""State of one scenario run.
+
+Everything a scenario changes while its stages run lives in a ScenarioState:
+the HTTP session with its cookies and auth, variables saved by stages and the
+abort flag. Separate runs share nothing mutable, so any number of scenarios can
+run at the same time on different threads (see scenario_pool). Nothing relies
+on the GIL, which keeps the design valid on free-threaded Python builds.
+"""
+
+import logging
+import threading
+from typing import Any
+
+import pytest
+import pytest_httpchain_templates.substitution
+import requests
+from pydantic import ValidationError
+from pytest_httpchain_models.entities import Scenario
+from pytest_httpchain_templates.exceptions import TemplatesError
+from pytest_httpchain_userfunc.auth import call_auth_function
+
+from . import stage_executor
+from .connection import AdapterPool, create_adapter, scenario_connection
+from .context import ScenarioVarsCache
+from .exceptions import StageExecutionError
+from .helpers import call_user_function
+
+logger = logging.getLogger(__name__)
+
+
+class ScenarioState:
+    """HTTP session, data context and flow control of one scenario run.
+
+    Stages of one run may execute concurrently (see stage_graph); updates
+    of the data context are serialized by a lock.
+
+    Attributes:
+        scenario: The validated scenario
+        session: HTTP session shared by all stages of the run
+        data_context: Variables saved by stages so far
+        aborted: Flag indicating if test flow should be aborted
+        vars_cache: Resolved scenario variables reused across stages
+    """
+
+    def __init__(self, scenario: Scenario, adapters: AdapterPool | None = None):
+        """Create the HTTP session with connection, SSL and authentication configuration.
+
+        Args:
+            scenario: The validated scenario
+            adapters: HTTP adapters shared with other runs, None for connections of the run's own
+
+        Note:
+            Authentication can be configured at scenario level and will
+            be applied to all requests unless overridden at stage level.
+        """
+        self.scenario = scenario
+        self.data_context: dict[str, Any] = {}
+        self.aborted = False
+        self.vars_cache = ScenarioVarsCache()
+        self._lock = threading.Lock()
+        self._shared_adapter = adapters is not None
+
+        # Configure connection pool and retries
+        connection = scenario_connection(scenario)
+        adapter = adapters.get(connection) if adapters is not None else create_adapter(connection)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not connection.keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        # Configure SSL settings
+        self.session.verify = scenario.ssl.verify
+        if scenario.ssl.cert is not None:
+            self.session.cert = scenario.ssl.cert
+
+        # Configure authentication
+        if scenario.auth:
+            resolved_auth = pytest_httpchain_templates.substitution.walk(scenario.auth, self.data_context)
+            self.session.auth = call_user_function(resolved_auth, call_auth_function)
+
+    def close(self) -> None:
+        """Close the HTTP session, keeping a shared adapter open."""
+        if self._shared_adapter:
+            # Closing the session closes its adapters
+            self.session.adapters.clear()
+        self.session.close()
+
+    def run_stage(self, stage_index: int, fixture_kwargs: dict[str, Any]) -> None:
+        """Execute a test stage with abort handling and error management.
+
+        Handles:
+        - Checking abort status and skipping if needed
+        - Executing the stage via stage_executor
+        - Updating the data context with saved variables
+        - Setting abort flag on errors
+
+        Args:
+            stage_index: Position of the stage in the scenario
+            fixture_kwargs: Dictionary of pytest fixture values injected for this stage
+
+        Raises:
+            pytest.skip: If flow is aborted and stage doesn't have always_run=True
+            pytest.fail: If stage execution fails with an error
+
+        Note:
+            Sets aborted to True on failure, causing subsequent stages
+            to be skipped unless they have always_run=True.
+        """
+        stage_template = self.scenario.stages[stage_index]
+
+        try:
+            # Check abort status
+            if self.aborted and not stage_template.always_run:
+                pytest.skip(reason="Flow aborted")
+
+            # Execute stage and get variables to save
+            context_updates = stage_executor.execute_stage(
+                stage_template=stage_template,
+                scenario=self.scenario,
+                session=self.session,
+                global_context=self.data_context,  # Pass current state
+                fixture_kwargs=fixture_kwargs,
+                vars_cache=self.vars_cache,
+            )
+
+            # Merge returned updates into data context for next stages
+            with self._lock:
+                self.data_context.update(context_updates)
+
+        except (
+            TemplatesError,
+            StageExecutionError,
+            ValidationError,
+        ) as e:
+            logger.exception(str(e))
+            self.aborted = True
+            pytest.fail(reason=str(e), pytrace=False)
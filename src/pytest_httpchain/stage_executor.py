@@ -16,24 +16,17 @@ The main responsibility of this module is to coordinate the flow:
 """
 
 import logging
+from collections import ChainMap
 from typing import Any
 
 import pytest_httpchain_templates.substitution
 import requests
-from pytest_httpchain_models.entities import (
-    Request,
-    Response,
-    Save,
-    SaveStep,
-    Scenario,
-    Stage,
-    Verify,
-    VerifyStep,
-)
-
-from .context import prepare_data_context
+from pytest_httpchain_models.entities import SaveStep, Scenario, Stage, VerifyStep
+
+from .context import ScenarioVarsCache, prepare_data_context
+from .poll import poll
 from .request import prepare_and_execute
-from .response import process_save_step, process_verify_step
+from .response import ResponseView, process_save_step, process_verify_step
 
 logger = logging.getLogger(__name__)
 
@@ -44,15 +37,19 @@ def execute_stage(
     session: requests.Session,
     global_context: dict[str, Any],
     fixture_kwargs: dict[str, Any],
+    vars_cache: ScenarioVarsCache | None = None,
 ) -> dict[str, Any]:
     """Execute a single stage and return context updates.
 
     This is the main entry point for stage execution. It orchestrates:
     1. Context preparation (merge global + fixtures + variables)
-    2. Template substitution for all stage elements
-    3. HTTP request preparation and execution
-    4. Response processing (save and verify steps)
-    5. Return updates for global context
+    2. Template substitution and execution of the HTTP request, repeated while polling
+    3. Template substitution and processing of each response step (save and verify)
+    4. Return updates for global context
+
+    Every templated value is resolved exactly once, when its inputs are available:
+    the request with the stage context, each response step with the context
+    extended by variables saved in the steps before it.
 
     Args:
         stage_template: The stage definition (with templates)
@@ -60,6 +57,7 @@ def execute_stage(
         session: HTTP session for requests
         global_context: Shared context from previous stages (read-only)
         fixture_kwargs: Values from pytest fixtures
+        vars_cache: Cache of scenario variables shared by stages of the scenario
 
     Returns:
         Context updates to be merged into global context.
@@ -68,43 +66,66 @@ def execute_stage(
     Raises:
         RequestError: HTTP request preparation/execution failed
         ResponseError: Response processing (save) failed
-        VerificationError: Response verification failed
+        VerificationError: Response verification or polling failed
 
     Note:
         The function maintains a clear separation between global and local
         context. Only SaveStep results are returned for global updates.
     """
     # Build local context for this stage (global + fixtures + vars)
-    local_context = prepare_data_context(scenario=scenario, stage_template=stage_template, global_context=global_context, fixture_kwargs=fixture_kwargs)
+    local_context = prepare_data_context(
+        scenario=scenario,
+        stage_template=stage_template,
+        global_context=global_context,
+        fixture_kwargs=fixture_kwargs,
+        vars_cache=vars_cache,
+    )
+
+    # Resolve and execute request, its inputs are all known upfront
+    request_model = pytest_httpchain_templates.substitution.walk(stage_template.request, local_context)
+    if stage_template.poll is None:
+        response = prepare_and_execute(session, request_model, local_context)
+    else:
+        poll_model = pytest_httpchain_templates.substitution.walk(stage_template.poll, local_context)
+        response = poll(lambda: prepare_and_execute(session, request_model, local_context), poll_model, local_context)
 
-    # Resolve stage template with complete local context
-    stage = pytest_httpchain_templates.substitution.walk(stage_template, local_context)
+    return process_response(stage_template, local_context, response)
 
-    # Prepare and execute request
-    request_dict = pytest_httpchain_templates.substitution.walk(stage.request, local_context)
-    request_model = Request.model_validate(request_dict)
-    response = prepare_and_execute(session, request_model)
 
-    # Process response
-    response_dict = pytest_httpchain_templates.substitution.walk(stage.response, local_context)
-    response_model = Response.model_validate(response_dict)
+def process_response(stage_template: Stage, local_context: ChainMap[str, Any], response: requests.Response) -> dict[str, Any]:
+    """Run response steps of a stage and return context updates.
+
+    Each step is resolved right before it runs, so it sees variables saved by previous steps.
+    All steps share one view of the response, which parses the body once.
+
+    Args:
+        stage_template: The stage definition (with templates)
+        local_context: Stage context the request was resolved with
+        response: HTTP response of the stage request
+
+    Returns:
+        Variables saved by SaveStep operations
+
+    Raises:
+        ResponseError: Response processing (save) failed
+        VerificationError: Response verification failed
+    """
+    response = ResponseView.of(response)
 
     # Track what needs to be saved to global context
     global_context_updates: dict[str, Any] = {}
 
-    for step in response_model:
+    for step in stage_template.response:
         match step:
             case SaveStep():
-                save_dict = pytest_httpchain_templates.substitution.walk(step.save, local_context)
-                save_model = Save.model_validate(save_dict)
+                save_model = pytest_httpchain_templates.substitution.walk(step.save, local_context)
                 saved_vars = process_save_step(save_model, response)
                 # Add saved vars as a new layer in ChainMap for subsequent steps
                 local_context = local_context.new_child(saved_vars)
                 global_context_updates.update(saved_vars)
 
             case VerifyStep():
-                verify_dict = pytest_httpchain_templates.substitution.walk(step.verify, local_context)
-                verify_model = Verify.model_validate(verify_dict)
+                verify_model = pytest_httpchain_templates.substitution.walk(step.verify, local_context)
                 process_verify_step(verify_model, local_context, response)
 
     # Return only the updates that should persist globally
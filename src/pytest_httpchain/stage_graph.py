@@ -0,0 +1,106 @@
+"""Data dependencies between stages of a scenario.
+
+Stages communicate only through variables: a stage writes variables with save
+steps, later stages read them in templates. Two stages must keep their relative
+order if one writes a variable the other reads or writes. Anything else may run
+concurrently.
+
+The analysis is static and conservative: every name appearing in a template
+or checked by a verify step counts as read, scenario variables are resolved
+for every stage so names they reference are read by all stages, and stages
+whose writes are unknown (save functions), whose reads are unknown (rendered
+body files) or that may run after a failure (always_run) are ordered after all
+stages before them.
+
+Stages also share the cookies of the scenario's session. Whether a response
+sets cookies is only known once it arrives, so stages sending state-changing
+requests (any method but GET, HEAD, OPTIONS and TRACE), which is where
+sessions usually get their cookies, e.g. logins, are ordered before all stages
+after them. Requests with safe methods run concurrently.
+"""
+
+from dataclasses import dataclass
+from http import HTTPMethod
+
+import pytest_httpchain_templates.substitution
+from pytest_httpchain_models.entities import FileBody, SaveStep, Scenario, Stage, VerifyStep
+
+# Methods not expected to change state, see RFC 9110 section 9.2.1
+SAFE_METHODS = frozenset({HTTPMethod.GET, HTTPMethod.HEAD, HTTPMethod.OPTIONS, HTTPMethod.TRACE})
+
+
+@dataclass
+class StageAccess:
+    """Variables a stage reads and writes.
+
+    Attributes:
+        reads: Names referenced by templates or verified by the stage
+        writes: Names saved by the stage, None if unknown
+        barrier: Stage must run after all stages before it
+        stateful: Stage may set cookies, all stages after it must run after it
+    """
+
+    reads: set[str]
+    writes: set[str] | None
+    barrier: bool
+    stateful: bool = False
+
+
+def stage_access(stage: Stage, scenario_reads: set[str]) -> StageAccess:
+    """Find variables a stage reads and writes.
+
+    Args:
+        stage: Stage definition with templates
+        scenario_reads: Names referenced by scenario variables
+
+    Returns:
+        Stage variable access
+    """
+    reads = pytest_httpchain_templates.substitution.referenced_names(stage) | scenario_reads
+
+    if stage.poll is not None:
+        reads.update(stage.poll.until.vars)
+
+    writes: set[str] | None = set()
+    for step in stage.response:
+        match step:
+            case VerifyStep():
+                # Verified vars are looked up in the context by name
+                reads.update(step.verify.vars)
+            case SaveStep() if step.save.functions.root:
+                writes = None
+            case SaveStep() if writes is not None:
+                writes.update(step.save.vars)
+
+    # always_run stages usually clean up after the others, a template may evaluate to true;
+    # names used by templates in a rendered body file are only known once it is read
+    barrier = writes is None or stage.always_run is not False or (isinstance(stage.request.body, FileBody) and stage.request.body.render is not False)
+    # A templated method may be anything
+    stateful = stage.request.method not in SAFE_METHODS
+    return StageAccess(reads=reads, writes=writes, barrier=barrier, stateful=stateful)
+
+
+def build_stage_graph(scenario: Scenario) -> dict[int, set[int]]:
+    """Build the dependency graph of scenario stages.
+
+    Args:
+        scenario: Validated scenario
+
+    Returns:
+        Mapping of stage position to positions of earlier stages it must run after
+    """
+    scenario_reads = pytest_httpchain_templates.substitution.referenced_names(scenario.vars)
+    accesses = [stage_access(stage, scenario_reads) for stage in scenario.stages]
+
+    graph: dict[int, set[int]] = {}
+    for i, access in enumerate(accesses):
+        graph[i] = set()
+        for j, earlier in enumerate(accesses[:i]):
+            if access.barrier or earlier.barrier or earlier.stateful or _conflict(earlier, access):
+                graph[i].add(j)
+    return graph
+
+
+def _conflict(earlier: StageAccess, later: StageAccess) -> bool:
+    assert earlier.writes is not None and later.writes is not None
+    return bool(earlier.writes & later.reads or earlier.writes & later.writes or earlier.reads & later.writes)
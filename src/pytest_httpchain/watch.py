@@ -0,0 +1,317 @@
+"""Watch mode: keep one process alive and re-run scenarios affected by file changes.
+
+After the initial run, the watcher polls scenario files, every file they pull in
+through $ref and project Python modules (user functions, conftest). On change,
+only scenario modules depending on changed files are collected and run again.
+Imports, parsed $ref documents and HTTP connections stay warm between runs.
+
+Pytest registers fixtures and hooks of conftest files once per session, so a
+changed conftest restarts the whole process with the same command line.
+"""
+
+import importlib
+import logging
+import os
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_httpchain_jsonref.loader
+from _pytest import nodes, reports
+from pydantic import BaseModel, ValidationError
+from pytest_httpchain_jsonref.exceptions import ReferenceResolverError
+from pytest_httpchain_jsonref.plumbing.cache import DocumentCache
+from pytest_httpchain_models.entities import Scenario, UserFunctionName
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.2
+
+Stamp = tuple[int, int] | None
+
+
+def _stamp(path: Path) -> Stamp:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """Detects file changes by polling modification time and size."""
+
+    def __init__(self):
+        self._stamps: dict[Path, Stamp] = {}
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """Start watching files, already watched files keep their state.
+
+        Args:
+            paths: Resolved file paths
+        """
+        for path in paths:
+            if path not in self._stamps:
+                self._stamps[path] = _stamp(path)
+
+    def poll(self) -> set[Path]:
+        """Check watched files once.
+
+        Returns:
+            Paths of files changed, created or deleted since the previous check
+        """
+        changed = set()
+        for path, stamp in self._stamps.items():
+            current = _stamp(path)
+            if current != stamp:
+                self._stamps[path] = current
+                changed.add(path)
+        return changed
+
+    def wait(self, interval: float = POLL_INTERVAL) -> set[Path]:
+        """Block until some watched files change.
+
+        Changes arriving in quick succession (e.g. an editor saving several files)
+        are reported together.
+
+        Args:
+            interval: Seconds between checks
+
+        Returns:
+            Paths of changed files
+        """
+        changed: set[Path] = set()
+        while True:
+            time.sleep(interval)
+            current = self.poll()
+            if current:
+                changed |= current
+            elif changed:
+                return changed
+
+
+def project_modules(rootpath: Path) -> dict[Path, str]:
+    """Find imported Python modules that belong to the project rather than to installed packages.
+
+    Args:
+        rootpath: Project root directory
+
+    Returns:
+        Mapping of module file paths to module names
+    """
+    modules = {}
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if not file or name.split(".")[0] in ("pytest", "_pytest", "pytest_httpchain"):
+            continue
+        path = Path(file).resolve()
+        if path.suffix != ".py" or not path.is_relative_to(rootpath) or {"site-packages", "dist-packages"} & set(path.parts):
+            continue
+        modules[path] = name
+    return modules
+
+
+def function_modules(obj: Any) -> set[str] | None:
+    """Find modules of the user functions a scenario calls.
+
+    Functions named without a module are looked up in conftest and not included.
+
+    Args:
+        obj: Validated scenario, or any part of it
+
+    Returns:
+        Module names, None if a function name is a template and may name any module
+    """
+    modules: set[str] = set()
+
+    def visit(value: Any) -> bool:
+        match value:
+            case UserFunctionName():
+                if "{{" in value.root:
+                    return False
+                module, sep, _ = value.root.rpartition(":")
+                if sep:
+                    modules.add(module)
+                return True
+            case BaseModel():
+                return all(visit(getattr(value, name)) for name in type(value).model_fields)
+            case dict():
+                return all(visit(item) for item in value.values())
+            case list() | tuple():
+                return all(visit(item) for item in value)
+        return True
+
+    return modules if visit(obj) else None
+
+
+class ScenarioWatcher:
+    """Pytest plugin running tests in watch mode.
+
+    Registered in place of the regular test loop when --httpchain-watch is given.
+    Stops on KeyboardInterrupt.
+    """
+
+    def __init__(self, config: pytest.Config, module_type: type[nodes.File], document_cache: DocumentCache, max_parent_traversal_depth: int):
+        self.config = config
+        self.module_type = module_type
+        self.document_cache = document_cache
+        self.max_parent_traversal_depth = max_parent_traversal_depth
+        self.files = FileWatcher()
+        self.modules: dict[Path, str] = {}
+        self.scenarios: dict[Path, nodes.File] = {}
+        self.dependencies: dict[Path, set[Path]] = {}
+        self.function_modules: dict[Path, set[str] | None] = {}
+        self._reports: list[reports.TestReport] = []
+
+    def pytest_collectstart(self, collector: nodes.Collector) -> None:
+        """Remember scenario modules, including ones that fail to collect."""
+        if isinstance(collector, self.module_type):
+            self.scenarios[collector.path.resolve()] = collector
+
+    def pytest_runtest_logreport(self, report: reports.TestReport) -> None:
+        """Record outcomes for the per-run summary."""
+        self._reports.append(report)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> bool | None:
+        """Run collected tests, then keep re-running the affected ones until interrupted.
+
+        Collection errors don't stop the session: fixing the file re-collects it.
+        --exitfirst and --maxfail are not honored, as pytest cannot reset them between runs.
+        """
+        if session.config.option.collectonly:
+            return None
+
+        for path in self.scenarios:
+            self._track(path)
+        self.modules = project_modules(session.config.rootpath)
+        self.files.watch(self.modules)
+
+        self._run(session, session.items)
+        while True:
+            self._write_sep("-", "waiting for changes")
+            changed = self.files.wait()
+            if self.needs_restart(changed):
+                self._restart()
+            affected = self.affected_scenarios(changed)
+            if not affected:
+                continue
+
+            self._write_sep("=", f"{len(affected)} scenario(s) affected by changes, running again")
+            self._run(session, self._collect(session, affected))
+
+            for path in affected:
+                self._track(path)
+            new_modules = project_modules(session.config.rootpath)
+            self.files.watch(new_modules)
+            self.modules.update(new_modules)
+
+    def needs_restart(self, changed: set[Path]) -> bool:
+        """Check if a changed conftest requires restarting the session.
+
+        Args:
+            changed: Paths of changed files
+
+        Returns:
+            True if a conftest module imported by pytest changed
+        """
+        return any(self.modules[path].rpartition(".")[2] == "conftest" for path in changed & self.modules.keys())
+
+    def affected_scenarios(self, changed: set[Path]) -> set[Path]:
+        """Find scenarios to run again after files changed, reloading changed Python modules.
+
+        Args:
+            changed: Paths of changed files
+
+        Returns:
+            Paths of affected scenario files that still exist
+        """
+        affected = pytest_httpchain_jsonref.loader.invalidate(changed, self.document_cache)
+
+        for path in sorted(changed & self.modules.keys()):
+            name = self.modules[path]
+            module = sys.modules.get(name)
+            if module is None:
+                continue
+            try:
+                importlib.reload(module)
+            except Exception as e:
+                self._write_sep("!", f"Cannot reload {name}: {e}")
+                continue
+
+            affected |= {scenario for scenario in self.dependencies if self._calls_module(scenario, name)}
+
+        # Scenarios without a module of their own can't be collected again
+        return {path for path in affected if path in self.scenarios and path.exists()}
+
+    def _track(self, path: Path) -> None:
+        """Watch a scenario file with all its $ref dependencies.
+
+        Loading goes through the shared document cache, which also registers the
+        scenario as a root in its reference graph.
+        """
+        modules: set[str] | None = set()
+        try:
+            data, dependencies = pytest_httpchain_jsonref.loader.load_json_with_dependencies(
+                path,
+                max_parent_traversal_depth=self.max_parent_traversal_depth,
+                cache=self.document_cache,
+            )
+            modules = function_modules(Scenario.model_validate(data))
+        except ReferenceResolverError as e:
+            logger.debug(f"Cannot resolve {path}: {e}")
+            dependencies = {path}
+        except ValidationError as e:
+            # Fails to collect until the scenario itself changes
+            logger.debug(f"Cannot validate {path}: {e}")
+        self.dependencies[path] = dependencies
+        self.function_modules[path] = modules
+        self.files.watch(dependencies)
+
+    def _calls_module(self, path: Path, module_name: str) -> bool:
+        """Check if a scenario calls user functions from the module or a submodule of the package."""
+        modules = self.function_modules.get(path, set())
+        return modules is None or any(module == module_name or module.startswith(f"{module_name}.") for module in modules)
+
+    def _restart(self) -> None:
+        """Replace the process with a new one running the same command line."""
+        self._write_sep("=", "conftest changed, restarting")
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(sys.executable, [sys.executable, *sys.orig_argv[1:]])
+
+    def _collect(self, session: pytest.Session, paths: set[Path]) -> list[nodes.Item]:
+        """Collect scenario modules again, applying -k/-m selection."""
+        items: list[nodes.Item] = []
+        for path in sorted(paths):
+            old = self.scenarios[path]
+            module = self.module_type.from_parent(old.parent, path=old.path, name=old.name)
+            self.scenarios[path] = module
+            items.extend(session.genitems(module))
+
+        session.config.hook.pytest_collection_modifyitems(session=session, config=session.config, items=items)
+        return items
+
+    def _run(self, session: pytest.Session, items: list[nodes.Item]) -> None:
+        self._reports.clear()
+        started = time.perf_counter()
+
+        for i, item in enumerate(items):
+            nextitem = items[i + 1] if i + 1 < len(items) else None
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+
+        outcomes: dict[str, int] = {}
+        for report in self._reports:
+            if report.when == "call" or report.outcome != "passed":
+                outcomes[report.outcome] = outcomes.get(report.outcome, 0) + 1
+        summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())) or "no tests ran"
+        self._write_sep("=", f"{summary} in {time.perf_counter() - started:.2f}s")
+
+    def _write_sep(self, sep: str, title: str) -> None:
+        reporter = self.config.pluginmanager.get_plugin("terminalreporter")
+        if reporter is not None:
+            reporter.ensure_newline()
+            reporter.write_sep(sep, title)
@@ -0,0 +1,117 @@
+"""Duration-aware xdist scheduling keeping stages of a scenario on one worker.
+
+Stages of a scenario share one session and data context, so they must all run
+on the same worker. xdist's loadscope distribution already sends each test class,
+and so each scenario, to a single worker; this scheduler additionally hands out
+the longest scenarios first. Finishing with short scenarios keeps workers busy
+until the end instead of leaving one worker with a long tail.
+
+Scenario durations are recorded in pytest's cache; scenarios without a recorded
+duration are estimated from their number of stages.
+
+Only imported if xdist is installed.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from _pytest import reports
+from xdist.scheduler import LoadScopeScheduling
+from xdist.workermanage import WorkerController
+
+DURATIONS_CACHE_KEY = "httpchain/scope_durations"
+# Distribution modes taken over by the scheduler, both send tests of a scenario to different workers otherwise
+SCHEDULED_DIST_MODES = ("load", "loadscope")
+
+
+def split_scope(nodeid: str) -> str:
+    """Return the scope of a test: its class or, for plain functions, its module.
+
+    Args:
+        nodeid: Test node id
+
+    Returns:
+        Scope node id, same as xdist's loadscope
+    """
+    return nodeid.rsplit("::", 1)[0]
+
+
+class ScenarioScheduling(LoadScopeScheduling):
+    """Loadscope scheduling handing out work units longest first.
+
+    Args:
+        config: Pytest configuration object
+        log: xdist logger
+        durations: Recorded durations of scopes in seconds
+    """
+
+    def __init__(self, config: pytest.Config, log: Any = None, durations: Mapping[str, float] | None = None):
+        super().__init__(config, log)
+        self.durations = dict(durations or {})
+        self._ordered = False
+
+    def estimate(self, scope: str, work_unit: Mapping[str, bool], seconds_per_test: float) -> float:
+        """Estimate how long a work unit takes.
+
+        Args:
+            scope: Scope of the work unit
+            work_unit: Tests of the work unit
+            seconds_per_test: Average test duration, used if the scope has no recorded duration
+
+        Returns:
+            Estimated duration in seconds
+        """
+        duration = self.durations.get(scope)
+        return duration if duration is not None else len(work_unit) * seconds_per_test
+
+    def _order_workqueue(self) -> None:
+        known = [scope for scope in self.workqueue if scope in self.durations]
+        known_tests = sum(len(self.workqueue[scope]) for scope in known)
+        seconds_per_test = sum(self.durations[scope] for scope in known) / known_tests if known_tests else 1.0
+
+        ordered = sorted(self.workqueue.items(), key=lambda item: -self.estimate(item[0], item[1], seconds_per_test))
+        self.workqueue.clear()
+        self.workqueue.update(ordered)
+        self._ordered = True
+
+    def _assign_work_unit(self, node: WorkerController) -> None:
+        if not self._ordered:
+            self._order_workqueue()
+        super()._assign_work_unit(node)
+
+    def remove_node(self, node: WorkerController) -> str | None:
+        # Work units of a crashed node go back to the queue and need to find their place
+        self._ordered = False
+        return super().remove_node(node)
+
+
+class SchedulingPlugin:
+    """Pytest plugin providing the scheduler and recording scope durations.
+
+    Registered on the xdist controller, or in the only process without xdist,
+    so durations from runs without workers are used by later distributed runs.
+    """
+
+    def __init__(self, config: pytest.Config):
+        self.cache = getattr(config, "cache", None)
+        self.recorded: dict[str, float] = self.cache.get(DURATIONS_CACHE_KEY, {}) if self.cache is not None else {}
+        self.current: dict[str, float] = {}
+
+    @pytest.hookimpl(tryfirst=True, optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config: pytest.Config, log: Any) -> LoadScopeScheduling | None:
+        """Schedule tests for load and loadscope distribution."""
+        if config.getvalue("dist") not in SCHEDULED_DIST_MODES:
+            return None
+        return ScenarioScheduling(config, log, self.recorded)
+
+    def pytest_runtest_logreport(self, report: reports.TestReport) -> None:
+        """Add up durations of setup, call and teardown of every test in a scope."""
+        scope = split_scope(report.nodeid)
+        self.current[scope] = self.current.get(scope, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        """Store durations of scopes that ran, keeping the ones recorded before for the others."""
+        if self.cache is None or not self.current:
+            return
+        self.cache.set(DURATIONS_CACHE_KEY, {**self.recorded, **{scope: round(duration, 3) for scope, duration in self.current.items()}})
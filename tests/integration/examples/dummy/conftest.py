@@ -44,7 +44,8 @@ def answer():
     return {"answer": 42}, HTTPStatus.OK
 
 
-@pytest.fixture
+# Session-scoped, the mock server doesn't close its socket and the port may still be bound when set up again
+@pytest.fixture(scope="session")
 def server():
     with app.run("localhost", 5000):
         yield "http://localhost:5000"
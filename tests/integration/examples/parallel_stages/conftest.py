@@ -0,0 +1,34 @@
+import threading
+
+import pytest
+from flask import Flask, request
+from werkzeug.serving import make_server
+
+app = Flask(__name__)
+# Each fan-out request waits for the other ones, which only succeeds if they are sent concurrently
+fan_out = threading.Barrier(3, timeout=5)
+
+
+@app.post("/login")
+def login():
+    return {"token": "secret"}
+
+
+@app.get("/items/<int:item_id>")
+def item(item_id):
+    if request.headers.get("Authorization") != "Bearer secret":
+        return {}, 401
+    try:
+        fan_out.wait()
+    except threading.BrokenBarrierError:
+        return {}, 500
+    return {"id": item_id}
+
+
+@pytest.fixture(scope="session")
+def server():
+    srv = make_server("localhost", 0, app, threaded=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{srv.server_port}"
+    srv.shutdown()
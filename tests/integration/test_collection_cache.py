@@ -0,0 +1,59 @@
+import importlib.metadata
+import json
+
+import pytest_httpchain_jsonref.loader
+
+
+def test_cache_hit(pytester, monkeypatch):
+    pytester.copy_example("collection_cache/common.json")
+    pytester.copy_example("collection_cache/test_cached.http.json")
+    result = pytester.runpytest("--collect-only", "-q", "-o", "collection_cache=true")
+    result.stdout.fnmatch_lines(["*test_0_first*"])
+    assert list((pytester.path / ".pytest_cache" / "d" / "httpchain-scenarios").glob("*.json"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("scenario must be served from collection cache")
+
+    monkeypatch.setattr(pytest_httpchain_jsonref.loader, "load_json_with_dependencies", fail)
+    result = pytester.runpytest("--collect-only", "-q", "-o", "collection_cache=true")
+    result.stdout.fnmatch_lines(["*test_0_first*"])
+
+
+def test_cache_invalidated_by_ref_change(pytester):
+    pytester.copy_example("collection_cache/common.json")
+    pytester.copy_example("collection_cache/test_cached.http.json")
+    result = pytester.runpytest("--collect-only", "-q", "-o", "collection_cache=true")
+    result.stdout.fnmatch_lines(["*test_0_first*"])
+
+    common = pytester.path / "common.json"
+    data = json.loads(common.read_text())
+    data["stage"]["name"] = "second"
+    common.write_text(json.dumps(data))
+
+    result = pytester.runpytest("--collect-only", "-q", "-o", "collection_cache=true")
+    result.stdout.fnmatch_lines(["*test_0_second*"])
+    result.stdout.no_fnmatch_line("*test_0_first*")
+
+
+def test_cache_invalidated_by_package_upgrade(pytester, monkeypatch):
+    pytester.copy_example("collection_cache/common.json")
+    pytester.copy_example("collection_cache/test_cached.http.json")
+    result = pytester.runpytest("--collect-only", "-q", "-o", "collection_cache=true")
+    result.stdout.fnmatch_lines(["*test_0_first*"])
+
+    version = importlib.metadata.version
+    monkeypatch.setattr(importlib.metadata, "version", lambda name: "99.0" if name == "pytest-httpchain-models" else version(name))
+    loads = []
+    load = pytest_httpchain_jsonref.loader.load_json_with_dependencies
+    monkeypatch.setattr(pytest_httpchain_jsonref.loader, "load_json_with_dependencies", lambda *args, **kwargs: loads.append(args) or load(*args, **kwargs))
+    result = pytester.runpytest("--collect-only", "-q", "-o", "collection_cache=true")
+    result.stdout.fnmatch_lines(["*test_0_first*"])
+    assert loads
+
+
+def test_cache_disabled_by_default(pytester):
+    pytester.copy_example("collection_cache/common.json")
+    pytester.copy_example("collection_cache/test_cached.http.json")
+    result = pytester.runpytest("--collect-only", "-q")
+    result.stdout.fnmatch_lines(["*test_0_first*"])
+    assert not list((pytester.path / ".pytest_cache" / "d" / "httpchain-scenarios").glob("*.json"))
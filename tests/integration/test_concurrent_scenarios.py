@@ -0,0 +1,205 @@
+import importlib.util
+import json
+import socket
+import threading
+
+import pytest
+from flask import Flask
+from werkzeug.serving import make_server
+
+app = Flask(__name__)
+# Each scenario waits for the other ones, which only succeeds if they run concurrently
+rendezvous = threading.Barrier(3, timeout=5)
+
+
+@app.post("/login/<name>")
+def login(name):
+    return {"token": name}
+
+
+@app.get("/wait/<token>")
+def wait(token):
+    try:
+        rendezvous.wait()
+    except threading.BrokenBarrierError:
+        return {}, 500
+    return {"token": token}
+
+
+ENGINES = [
+    pytest.param("async_scenarios", marks=pytest.mark.skipif(importlib.util.find_spec("httpx") is None, reason="httpx not installed")),
+    "parallel_scenarios",
+]
+
+
+@pytest.fixture
+def server():
+    rendezvous.reset()
+    srv = make_server("localhost", 0, app, threaded=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{srv.server_port}"
+    srv.shutdown()
+
+
+def scenario(server: str, name: str, status: int = 200) -> str:
+    return json.dumps(
+        {
+            "stages": [
+                {
+                    "name": "login",
+                    "request": {"url": f"{server}/login/{name}", "method": "POST"},
+                    "response": [{"save": {"vars": {"token": "token"}}}],
+                },
+                {
+                    "name": "wait",
+                    "request": {"url": f"{server}/wait/{{{{ token }}}}"},
+                    "response": [{"verify": {"status": status, "body": {"contains": [name]}}}],
+                },
+                {
+                    "name": "after",
+                    "request": {"url": f"{server}/login/{name}", "method": "POST"},
+                },
+            ]
+        }
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_scenarios_run_concurrently(pytester, server, engine):
+    pytester.makefile(".http.json", **{f"test_s{i}": scenario(server, f"s{i}") for i in range(3)})
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"{engine}=3")
+    result.assert_outcomes(passed=9)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_failure_aborts_scenario(pytester, server, engine):
+    pytester.makefile(".http.json", **{f"test_s{i}": scenario(server, f"s{i}", status=201 if i == 0 else 200) for i in range(3)})
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"{engine}=3")
+    result.assert_outcomes(passed=7, failed=1, skipped=1)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_concurrency_limit(pytester, server, engine):
+    pytester.makefile(".http.json", **{f"test_s{i}": scenario(server, f"s{i}") for i in range(3)})
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"{engine}=2")
+    result.assert_outcomes(passed=3, failed=3, skipped=3)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_skipped_stage_not_run(pytester, server, engine):
+    pytester.makeconftest(
+        """
+        import pytest
+
+        def pytest_collection_modifyitems(items):
+            for item in items:
+                if "wait" in item.name:
+                    item.add_marker(pytest.mark.skip)
+        """
+    )
+    pytester.makefile(".http.json", test_s0=scenario(server, "s0"))
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"{engine}=1")
+    # The wait stage would block on the barrier and fail
+    result.assert_outcomes(passed=2, skipped=1)
+
+
+@pytest.mark.parametrize("engine", ["async_scenarios", "parallel_scenarios"])
+def test_invalid_value(pytester, engine):
+    result = pytester.runpytest("-o", f"{engine}=many")
+    assert result.ret != 0
+
+
+def test_scenario_with_fixtures_runs_as_usual(pytester, server):
+    pytester.makeconftest(
+        f"""
+        import pytest
+
+        @pytest.fixture
+        def name():
+            return "s0"
+
+        @pytest.fixture
+        def base():
+            return "{server}"
+        """
+    )
+    data = json.loads(scenario("{{ base }}", "{{ name }}"))
+    data["fixtures"] = ["base", "name"]
+    data["stages"] = data["stages"][:1]
+    pytester.makefile(".http.json", test_s0=json.dumps(data))
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", "parallel_scenarios=2")
+    result.assert_outcomes(passed=1)
+
+
+@pytest.mark.parametrize("engine", [None, *ENGINES])
+def test_interleaved_stages_kept_together(pytester, server, engine):
+    pytester.makeconftest(
+        """
+        import pytest
+
+        @pytest.hookimpl(trylast=True)
+        def pytest_collection_modifyitems(items):
+            # Like pytest-order with global scope, sorts stages of all scenarios by position
+            items.sort(key=lambda item: item.name)
+        """
+    )
+    for i in range(2):
+        data = json.loads(scenario(server, f"s{i}"))
+        data["stages"][1:] = [
+            {"name": "relogin", "request": {"url": f"{server}/login/{{{{ token }}}}", "method": "POST"}, "response": [{"verify": {"body": {"contains": [f"s{i}"]}}}]}
+        ]
+        pytester.makefile(".http.json", **{f"test_s{i}": json.dumps(data)})
+    args = ["-o", f"{engine}=2"] if engine else []
+    result = pytester.runpytest("-p", "no:cacheprovider", *args)
+    result.assert_outcomes(passed=4)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_scenario_with_autouse_fixture_runs_as_usual(pytester, engine):
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        port = sock.getsockname()[1]
+    pytester.makeconftest(
+        f"""
+        import threading
+
+        import pytest
+        from flask import Flask
+        from werkzeug.serving import make_server
+
+        app = Flask(__name__)
+
+        @app.post("/login/<name>")
+        def login(name):
+            return {{"token": name}}
+
+        @pytest.fixture(scope="session", autouse=True)
+        def server():
+            srv = make_server("localhost", {port}, app, threaded=True)
+            threading.Thread(target=srv.serve_forever, daemon=True).start()
+            yield
+            srv.shutdown()
+            srv.server_close()
+        """
+    )
+    data = json.loads(scenario(f"http://localhost:{port}", "s0"))
+    del data["stages"][1]
+    pytester.makefile(".http.json", test_s0=json.dumps(data))
+    # The server only runs once pytest set up the autouse fixture
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"{engine}=2")
+    result.assert_outcomes(passed=2)
+
+
+@pytest.mark.parametrize("engine", [None, *ENGINES])
+def test_pytest_fail_in_user_function(pytester, server, engine):
+    pytester.makepyfile(checks="import pytest\n\n\ndef reject(response):\n    pytest.fail('rejected')\n")
+    pytester.syspathinsert()
+    data = json.loads(scenario(server, "s0"))
+    del data["stages"][1]
+    data["stages"][0]["response"].append({"verify": {"functions": ["checks:reject"]}})
+    pytester.makefile(".http.json", test_s0=json.dumps(data))
+    args = ["-o", f"{engine}=2"] if engine else []
+    result = pytester.runpytest("-p", "no:cacheprovider", *args)
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*rejected*"])
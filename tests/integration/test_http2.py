@@ -0,0 +1,127 @@
+import importlib.util
+import json
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+
+import pytest
+
+pytest.importorskip("h2")
+pytest.importorskip("httpx")
+
+import h2.config  # noqa: E402
+import h2.connection  # noqa: E402
+import h2.events  # noqa: E402
+
+client_ports: list[int] = []
+
+
+def respond(conn: h2.connection.H2Connection, stream_id: int, headers: dict[str, str]) -> None:
+    path = headers[":path"]
+    response_headers = [(":status", "200"), ("content-type", "application/json")]
+    if path.startswith("/login/"):
+        name = path.removeprefix("/login/")
+        body = {"token": name}
+        response_headers.append(("set-cookie", f"session={name}; Path=/"))
+    else:
+        body = {"cookie": headers.get("cookie"), "protocol": "h2"}
+    data = json.dumps(body).encode()
+    conn.send_headers(stream_id, response_headers + [("content-length", str(len(data)))])
+    conn.send_data(stream_id, data, end_stream=True)
+
+
+def serve_connection(sock: ssl.SSLSocket) -> None:
+    try:
+        sock.do_handshake()
+    except OSError:
+        sock.close()
+        return
+    client_ports.append(sock.getpeername()[1])
+    conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+    conn.initiate_connection()
+    sock.sendall(conn.data_to_send())
+    streams: dict[int, dict[str, str]] = {}
+    with sock:
+        while data := sock.recv(65535):
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    streams[event.stream_id] = dict(event.headers)
+                elif isinstance(event, h2.events.DataReceived):
+                    conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    respond(conn, event.stream_id, streams.pop(event.stream_id))
+            sock.sendall(conn.data_to_send())
+
+
+@pytest.fixture
+def certificate(tmp_path):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl not installed")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost"]
+        + ["-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+@pytest.fixture
+def server(certificate):
+    client_ports.clear()
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*certificate)
+    context.set_alpn_protocols(["h2"])
+    listener = socket.create_server(("localhost", 0))
+
+    def accept():
+        while True:
+            try:
+                sock, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve_connection, args=(context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False),), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield f"https://localhost:{listener.getsockname()[1]}"
+    listener.close()
+
+
+def scenario(server: str, cert: str, name: str) -> str:
+    return json.dumps(
+        {
+            "connection": {"http2": True},
+            "stages": [
+                {"name": "login", "request": {"url": f"{server}/login/{name}", "method": "POST", "body": {"json": {"name": name}}, "ssl": {"verify": cert}}},
+                {
+                    "name": "whoami",
+                    "request": {"url": f"{server}/whoami", "ssl": {"verify": cert}},
+                    "response": [{"verify": {"body": {"contains": [f"session={name}", "h2"]}}}],
+                },
+            ],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "engine",
+    [
+        pytest.param("async_scenarios", marks=pytest.mark.skipif(importlib.util.find_spec("httpx") is None, reason="httpx not installed")),
+        "parallel_scenarios",
+    ],
+)
+def test_scenarios_multiplexed_over_one_connection(pytester, server, certificate, engine):
+    pytester.makefile(".http.json", **{f"test_s{i}": scenario(server, str(certificate[0]), f"s{i}") for i in range(3)})
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"{engine}=3", "-o", "shared_connections=true")
+    result.assert_outcomes(passed=6)
+    assert len(client_ports) == 1
+
+
+def test_connection_per_scenario_without_shared_connections(pytester, server, certificate):
+    pytester.makefile(".http.json", **{f"test_s{i}": scenario(server, str(certificate[0]), f"s{i}") for i in range(2)})
+    result = pytester.runpytest("-p", "no:cacheprovider")
+    result.assert_outcomes(passed=4)
+    assert len(client_ports) == 2
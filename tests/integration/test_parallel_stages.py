@@ -0,0 +1,80 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+received: list[str] = []
+
+
+def test_independent_stages_run_concurrently(pytester):
+    pytester.copy_example("parallel_stages/conftest.py")
+    pytester.copy_example("parallel_stages/test_fan_out.http.json")
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", "parallel_stages=4")
+    result.assert_outcomes(passed=5)
+
+
+def test_deselected_stages_not_run(pytester):
+    pytester.copy_example("parallel_stages/conftest.py")
+    pytester.copy_example("parallel_stages/test_fan_out.http.json")
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", "parallel_stages=4", "-k", "login")
+    result.assert_outcomes(passed=1)
+
+
+def test_invalid_parallel_stages_value(pytester):
+    result = pytester.runpytest("-o", "parallel_stages=many")
+    assert result.ret != 0
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        received.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def recorder():
+    received.clear()
+    srv = ThreadingHTTPServer(("localhost", 0), RecordingHandler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def stages(server: str, *names: str, **kwargs) -> str:
+    return json.dumps({"stages": [{"name": name, "request": {"url": f"{server}/{name}"}, **kwargs.get(name, {})} for name in names]})
+
+
+def test_stages_skipped_by_markers_not_run(pytester, recorder):
+    pytester.makeconftest(
+        """
+        import pytest
+
+        def pytest_collection_modifyitems(items):
+            for item in items:
+                if item.name.endswith("_b"):
+                    item.add_marker(pytest.mark.skip)
+                elif item.name.endswith("_c"):
+                    item.add_marker(pytest.mark.skipif(True, reason="condition"))
+                elif item.name.endswith("_d"):
+                    item.add_marker(pytest.mark.xfail(run=False))
+        """
+    )
+    pytester.makefile(".http.json", test_marks=stages(recorder, "a", "b", "c", "d"))
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", "parallel_stages=4")
+    result.assert_outcomes(passed=1, skipped=2, xfailed=1)
+    assert received == ["/a"]
+
+
+def test_fixture_error_does_not_run_stages_again(pytester, recorder):
+    pytester.makefile(".http.json", test_fixture=stages(recorder, "a", "b", "c", b={"fixtures": ["missing"]}))
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", "parallel_stages=4")
+    result.assert_outcomes(passed=2, errors=1)
+    assert sorted(received) == ["/a", "/c"]
@@ -0,0 +1,18 @@
+def test_prefetch_collects_like_serial(pytester):
+    pytester.copy_example("selection/test_valid.http.json")
+    pytester.copy_example("selection/test_invalid.http.json")
+    result = pytester.runpytest("--collect-only", "-q", "-p", "no:cacheprovider", "--httpchain-collection-workers", "2")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*test_0_checkout*"])
+
+
+def test_prefetch_ini_option(pytester):
+    pytester.copy_example("selection/test_valid.http.json")
+    result = pytester.runpytest("--collect-only", "-q", "-o", "collection_workers=auto")
+    result.assert_outcomes(errors=0)
+    result.stdout.fnmatch_lines(["*test_0_checkout*"])
+
+
+def test_invalid_workers_value(pytester):
+    result = pytester.runpytest("--httpchain-collection-workers", "many")
+    assert result.ret != 0
@@ -0,0 +1,100 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+received: list[dict] = []
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b""
+        while size := int(self.rfile.readline().split(b";")[0], 16):
+            body += self.rfile.read(size)
+            self.rfile.readline()
+        self.rfile.readline()
+        return body
+
+    def do_POST(self):
+        body = self.read_body()
+        received.append({"headers": dict(self.headers), "body": body})
+        data = json.dumps({"size": len(body)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    received.clear()
+    srv = ThreadingHTTPServer(("localhost", 0), EchoHandler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def scenario(server: str, body: dict) -> str:
+    return json.dumps(
+        {
+            "vars": {"name": "ü"},
+            "stages": [{"name": "upload", "request": {"url": f"{server}/upload", "method": "POST", "body": body}, "response": [{"verify": {"status": 200}}]}],
+        }
+    )
+
+
+def test_file_body_sent_with_content_length(pytester, server):
+    data = bytes(range(256)) * 1024
+    (pytester.path / "payload.bin").write_bytes(data)
+    pytester.makefile(".http.json", test_upload=scenario(server, {"file": "payload.bin"}))
+
+    pytester.runpytest("-p", "no:cacheprovider").assert_outcomes(passed=1)
+
+    assert received[0]["headers"]["Content-Length"] == str(len(data))
+    assert received[0]["body"] == data
+
+
+def test_rendered_file_body_sent_chunked(pytester, server):
+    (pytester.path / "payload.txt").write_text("{{ '{' }}{{ name }}}\r\n" * 30000, encoding="utf-8")
+    pytester.makefile(".http.json", test_upload=scenario(server, {"file": "payload.txt", "render": True}))
+
+    pytester.runpytest("-p", "no:cacheprovider").assert_outcomes(passed=1)
+
+    assert received[0]["headers"]["Transfer-Encoding"] == "chunked"
+    assert received[0]["body"] == "{ü}\r\n".encode() * 30000
+
+
+def test_generator_body_sent_chunked(pytester, server):
+    pytester.makepyfile(bodies="def lines(count):\n    for i in range(count):\n        yield f'{i}\\n'\n    yield b''\n")
+    pytester.syspathinsert()
+    pytester.makefile(".http.json", test_upload=scenario(server, {"generator": {"function": "bodies:lines", "kwargs": {"count": 1000}}}))
+
+    pytester.runpytest("-p", "no:cacheprovider").assert_outcomes(passed=1)
+
+    assert received[0]["headers"]["Transfer-Encoding"] == "chunked"
+    assert received[0]["body"] == "".join(f"{i}\n" for i in range(1000)).encode()
+
+
+def test_files_body_streamed_as_multipart(pytester, server):
+    data = b"\x00\xff" * 100000
+    (pytester.path / "report.bin").write_bytes(data)
+    pytester.makefile(".http.json", test_upload=scenario(server, {"files": {"report": "report.bin"}}))
+
+    pytester.runpytest("-p", "no:cacheprovider").assert_outcomes(passed=1)
+
+    headers, body = received[0]["headers"], received[0]["body"]
+    boundary = headers["Content-Type"].removeprefix("multipart/form-data; boundary=").encode()
+    assert headers["Content-Length"] == str(len(body))
+    assert body.startswith(b"--" + boundary + b'\r\nContent-Disposition: form-data; name="report"; filename="report.bin"\r\n\r\n')
+    assert body.endswith(data + b"\r\n--" + boundary + b"--\r\n")
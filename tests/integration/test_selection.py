@@ -0,0 +1,20 @@
+def test_invalid_scenario_fails_collection(pytester):
+    pytester.copy_example("selection/test_valid.http.json")
+    pytester.copy_example("selection/test_invalid.http.json")
+    result = pytester.runpytest("--collect-only", "-p", "no:cacheprovider")
+    result.assert_outcomes(errors=1)
+
+
+def test_deselected_scenario_not_validated(pytester):
+    pytester.copy_example("selection/test_valid.http.json")
+    pytester.copy_example("selection/test_invalid.http.json")
+    result = pytester.runpytest("--collect-only", "-q", "-p", "no:cacheprovider", "-k", "checkout")
+    result.assert_outcomes(errors=0)
+    result.stdout.fnmatch_lines(["*test_0_checkout*"])
+
+
+def test_selected_invalid_scenario_errors_on_setup(pytester):
+    pytester.copy_example("selection/test_invalid.http.json")
+    result = pytester.runpytest("-p", "no:cacheprovider", "-k", "broken")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*Cannot parse test scenario*"])
@@ -0,0 +1,88 @@
+import json
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+client_ports: set[int] = set()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    # Werkzeug's development server closes every connection, http.server keeps them alive with HTTP/1.1
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, body: dict, headers: dict[str, str]) -> None:
+        client_ports.add(self.client_address[1])
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        name = self.path.removeprefix("/login/")
+        self.reply({"token": name}, {"Set-Cookie": f"session={name}; Path=/"})
+
+    def do_GET(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        self.reply({"session": cookie["session"].value if "session" in cookie else None}, {})
+
+
+@pytest.fixture
+def server():
+    client_ports.clear()
+    srv = ThreadingHTTPServer(("localhost", 0), KeepAliveHandler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def scenario(server: str, name: str) -> str:
+    return json.dumps(
+        {
+            "stages": [
+                {"name": "login", "request": {"url": f"{server}/login/{name}", "method": "POST"}},
+                {
+                    "name": "whoami",
+                    "request": {"url": f"{server}/whoami"},
+                    "response": [{"verify": {"body": {"contains": [name]}}}],
+                },
+            ]
+        }
+    )
+
+
+@pytest.mark.parametrize("shared, connections", [("true", 1), ("false", 3)])
+def test_connections_shared_with_separate_cookies(pytester, server, shared, connections):
+    pytester.makefile(".http.json", **{f"test_s{i}": scenario(server, f"s{i}") for i in range(3)})
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"shared_connections={shared}")
+    result.assert_outcomes(passed=6)
+    assert len(client_ports) == connections
+
+
+@pytest.mark.parametrize("shared, connections", [("true", 1), ("false", 3)])
+def test_stages_interleaved_by_ordering_plugins(pytester, server, shared, connections):
+    pytester.makeconftest(
+        """
+        import pytest
+
+        @pytest.hookimpl(trylast=True)
+        def pytest_collection_modifyitems(items):
+            # Like pytest-order with global scope, sorts stages of all scenarios by position
+            items.sort(key=lambda item: item.name)
+        """
+    )
+    pytester.makefile(".http.json", **{f"test_s{i}": scenario(server, f"s{i}") for i in range(3)})
+    result = pytester.runpytest("-p", "no:cacheprovider", "-o", f"shared_connections={shared}")
+    result.assert_outcomes(passed=6)
+    # Scenarios are not set up again between their stages, which would log them out and open new connections
+    assert len(client_ports) == connections
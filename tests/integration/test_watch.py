@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("localhost", 0), OkHandler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_watch_collect_only(pytester):
+    pytester.copy_example("selection/test_valid.http.json")
+    result = pytester.runpytest("--collect-only", "-q", "-p", "no:cacheprovider", "--httpchain-watch")
+    result.assert_outcomes(errors=0)
+    result.stdout.fnmatch_lines(["*test_0_checkout*"])
+
+
+def test_watch_with_xdist(pytester):
+    result = pytester.runpytest("-p", "no:cacheprovider", "--httpchain-watch", "-n", "2")
+    assert result.ret != 0
+
+
+def test_watch_runs_affected_scenario_again(pytester, server, monkeypatch):
+    pytester.makeconftest(
+        """
+        import threading
+        from pathlib import Path
+
+        runs = []
+
+        def change():
+            path = Path("test_a.http.json")
+            path.write_text(path.read_text().replace("/a", "/a?changed=1"))
+
+        def pytest_runtest_logreport(report):
+            if report.when != "call":
+                return
+            runs.append(report.nodeid)
+            Path("runs.txt").write_text("\\n".join(runs))
+            if len(runs) == 2:
+                # Initial run done, the watcher waits for changes next
+                threading.Timer(0.5, change).start()
+            elif len(runs) == 3:
+                raise KeyboardInterrupt
+        """
+    )
+    for name in ("a", "b"):
+        pytester.makefile(".http.json", **{f"test_{name}": json.dumps({"stages": [{"name": name, "request": {"url": f"{server}/{name}"}}]})})
+    # In-process runs pass KeyboardInterrupt on instead of ending the session;
+    # the subprocess doesn't get the ini pythonpath entries on its own
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(sys.path))
+    pytester.runpytest_subprocess("-p", "no:cacheprovider", "--httpchain-watch", timeout=60)
+    assert (pytester.path / "runs.txt").read_text().splitlines() == [
+        "test_a.http.json::a::test_0_a",
+        "test_b.http.json::b::test_0_b",
+        "test_a.http.json::a::test_0_a",
+    ]
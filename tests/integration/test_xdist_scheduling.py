@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+pytest.importorskip("xdist")
+
+
+def durations(pytester: pytest.Pytester) -> dict[str, float]:
+    return json.loads((pytester.path / ".pytest_cache" / "v" / "httpchain" / "scope_durations").read_text())
+
+
+def test_durations_recorded_and_used(pytester):
+    pytester.makepyfile(
+        """
+        import time
+
+        class TestLong:
+            def test_a(self):
+                time.sleep(0.2)
+
+            def test_b(self):
+                pass
+
+        def test_short():
+            pass
+        """
+    )
+    result = pytester.runpytest("-n", "2", "--httpchain-xdist-scheduling")
+    result.assert_outcomes(passed=3)
+    recorded = durations(pytester)
+    assert recorded["test_durations_recorded_and_used.py::TestLong"] >= 0.2
+    assert "test_durations_recorded_and_used.py" in recorded
+
+    result = pytester.runpytest("-n", "2", "-o", "xdist_scheduling=true", "-k", "short")
+    result.assert_outcomes(passed=1)
+    assert durations(pytester)["test_durations_recorded_and_used.py::TestLong"] == recorded["test_durations_recorded_and_used.py::TestLong"]
+
+
+def test_xdist_schedulers_used_by_default(pytester):
+    pytester.makepyfile("def test_a():\n    pass\n")
+    result = pytester.runpytest("-n", "2")
+    result.assert_outcomes(passed=1)
+    assert not (pytester.path / ".pytest_cache" / "v" / "httpchain" / "scope_durations").exists()
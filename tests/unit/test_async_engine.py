@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from pytest_httpchain_models.entities import Scenario
+
+httpx = pytest.importorskip("httpx")
+
+from pytest_httpchain.async_engine import is_eligible, to_requests_response  # noqa: E402
+
+
+def scenario(**kwargs) -> Scenario:
+    stage = {"name": "stage", "request": {"url": "http://localhost"}}
+    return Scenario.model_validate({"stages": [{**stage, **kwargs.pop("stage", {})}], **kwargs})
+
+
+def test_plain_scenario_eligible():
+    assert is_eligible(scenario(vars={"a": 1}))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"fixtures": ["server"]},
+        {"stage": {"fixtures": ["server"]}},
+        {"auth": "module:auth"},
+        {"stage": {"request": {"url": "http://localhost", "auth": "module:auth"}}},
+        {"stage": {"request": {"url": "http://localhost", "stream": True}}},
+        {"stage": {"request": {"url": "http://localhost", "max_body_bytes": 1024}}},
+    ],
+)
+def test_scenario_not_eligible(kwargs):
+    assert not is_eligible(scenario(**kwargs))
+
+
+def test_response_conversion():
+    request = httpx.Request("GET", "http://localhost/items?id=1")
+    response = httpx.Response(
+        200,
+        headers=[("Content-Type", "application/json; charset=utf-8"), ("X-Tag", "a"), ("X-Tag", "b")],
+        content=b'{"id": 1}',
+        request=request,
+    )
+    response.elapsed = timedelta(milliseconds=5)
+
+    converted = to_requests_response(response)
+
+    assert converted.status_code == 200
+    assert converted.reason == "OK"
+    assert converted.url == "http://localhost/items?id=1"
+    assert converted.headers["content-type"] == "application/json; charset=utf-8"
+    assert converted.headers["x-tag"] == "a, b"
+    assert converted.encoding == "utf-8"
+    assert converted.json() == {"id": 1}
+    assert converted.elapsed == timedelta(milliseconds=5)
+    assert converted.request.method == "GET"
@@ -0,0 +1,45 @@
+import pytest
+
+from pytest_httpchain import body_matcher as body_matcher_module
+from pytest_httpchain.body_matcher import BodyMatcher, body_matcher, trie_pattern
+
+LITERALS = ["abc", "ab", "bcd", "b", "cdx", "", "zzz"]
+
+
+@pytest.fixture(params=[1, body_matcher_module.TRIE_MIN_LITERALS], ids=["trie", "one_by_one"])
+def trie_min_literals(request, monkeypatch):
+    monkeypatch.setattr(body_matcher_module, "TRIE_MIN_LITERALS", request.param)
+    body_matcher_module.literal_regex.cache_clear()
+    yield request.param
+    body_matcher_module.literal_regex.cache_clear()
+
+
+def test_trie_pattern_prefers_longest():
+    assert trie_pattern(["ab", "abc", "abd", "x.y"]) == r"(?:ab(?:c|d)?|x\.y)"
+
+
+@pytest.mark.usefixtures("trie_min_literals")
+def test_overlapping_literals():
+    matcher = BodyMatcher(LITERALS, [])
+    assert matcher.find_literals("xxabcdyy", matcher.literals) == {"abc", "ab", "bcd", "b", ""}
+
+
+def test_frequent_literals_rebuild_trie(trie_min_literals, monkeypatch):
+    monkeypatch.setattr(body_matcher_module, "REBUILD_AFTER", 2)
+    matcher = BodyMatcher(LITERALS, [])
+    assert matcher.find_literals("ab " * 10 + "cdx", matcher.literals) == {"ab", "b", "cdx", ""}
+
+
+@pytest.mark.usefixtures("trie_min_literals")
+def test_stop_literal_ends_search():
+    matcher = BodyMatcher(["forbidden", "later"], [])
+    assert "forbidden" in matcher.find_literals("forbidden later", matcher.literals, stop={"forbidden"})
+
+
+def test_patterns():
+    matcher = BodyMatcher([], [r"(?i)HELLO", r"(\w)\1", r"^world"])
+    assert matcher.find_patterns("hello aa world", matcher.patterns) == {r"(?i)HELLO", r"(\w)\1"}
+
+
+def test_matcher_cached():
+    assert body_matcher(frozenset(["a"]), frozenset(["b+"])) is body_matcher(frozenset(["a"]), frozenset(["b+"]))
@@ -0,0 +1,21 @@
+import responses
+from pytest_httpchain_models.entities import Scenario
+
+from pytest_httpchain.carrier import Carrier
+
+
+@responses.activate
+def test_concurrent_stages_run_once_across_class_setups():
+    responses.get("http://localhost/a", json={})
+    responses.get("http://localhost/b", json={})
+    scenario = Scenario.model_validate({"stages": [{"name": "a", "request": {"url": "http://localhost/a"}}, {"name": "b", "request": {"url": "http://localhost/b"}}]})
+    test_class = type("TestScenario", (Carrier,), {"_scenario": scenario, "_stage_workers": 2})
+
+    # Other items running between the stages tear the class down and set it up again
+    for stage_index in range(2):
+        test_class.setup_class()
+        test_class.execute_stage(stage_index, {}, get_fixture=lambda name: None)
+        test_class.teardown_class()
+
+    assert len(responses.calls) == 2
+    assert test_class._stage_outcomes is None
@@ -0,0 +1,88 @@
+import pytest
+from pytest_httpchain_models.entities import Scenario
+
+from pytest_httpchain import connection
+from pytest_httpchain.scenario_state import ScenarioState
+
+
+@pytest.fixture(autouse=True)
+def reset_defaults():
+    yield
+    connection.set_defaults("")
+
+
+def test_scenario_overrides_defaults():
+    connection.set_defaults('{"pool_maxsize": 50, "retries": 3}')
+    scenario = Scenario.model_validate({"connection": {"retries": 1, "keep_alive": False}, "stages": []})
+
+    config = connection.scenario_connection(scenario)
+
+    assert config.pool_maxsize == 50
+    assert config.retries == 1
+    assert not config.keep_alive
+
+
+def test_scenario_without_connection_uses_defaults():
+    defaults = connection.set_defaults('{"pool_block": true}')
+    assert connection.scenario_connection(Scenario.model_validate({"stages": []})) is defaults
+
+
+@pytest.mark.parametrize("value", ["[]", "{", '{"pool_maxsize": 0}', '{"unknown": 1}'])
+def test_invalid_defaults(value):
+    with pytest.raises(ValueError, match="Invalid connection configuration"):
+        connection.set_defaults(value)
+
+
+def test_adapter():
+    scenario = Scenario.model_validate({"connection": {"pool_connections": 2, "pool_maxsize": 20, "pool_block": True, "retries": 3, "backoff_factor": 0.5}, "stages": []})
+
+    adapter = connection.create_adapter(connection.scenario_connection(scenario))
+
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 20
+    assert adapter.poolmanager.connection_pool_kw["block"] is True
+    assert adapter.poolmanager.pools._maxsize == 2
+    assert adapter.max_retries.connect == 3
+    assert adapter.max_retries.read == 3
+    assert adapter.max_retries.backoff_factor == 0.5
+
+
+def test_session_without_keep_alive():
+    state = ScenarioState(Scenario.model_validate({"connection": {"keep_alive": False}, "stages": []}))
+    try:
+        assert state.session.headers["Connection"] == "close"
+        assert state.session.get_adapter("https://example.com") is state.session.get_adapter("http://example.com")
+    finally:
+        state.close()
+
+
+def test_adapter_pool_shares_adapters_per_connection():
+    pool = connection.AdapterPool()
+    first = ScenarioState(Scenario.model_validate({"stages": []}), pool)
+    second = ScenarioState(Scenario.model_validate({"stages": []}), pool)
+    other = ScenarioState(Scenario.model_validate({"connection": {"retries": 2}, "stages": []}), pool)
+    try:
+        adapter = first.session.get_adapter("http://example.com")
+        assert second.session.get_adapter("http://example.com") is adapter
+        assert other.session.get_adapter("http://example.com") is not adapter
+        assert first.session.cookies is not second.session.cookies
+
+        first.close()
+        assert pool.get(connection.scenario_connection(first.scenario)) is adapter
+    finally:
+        second.close()
+        other.close()
+        pool.close()
+
+
+def test_http2_adapter():
+    pytest.importorskip("h2")
+    from pytest_httpchain.http2 import Http2Adapter
+
+    state = ScenarioState(Scenario.model_validate({"connection": {"http2": True, "keep_alive": False}, "stages": []}))
+    try:
+        adapter = state.session.get_adapter("https://example.com")
+        assert isinstance(adapter, Http2Adapter)
+        assert adapter.get_transport(True, None) is adapter.get_transport(True, None)
+        assert adapter.get_transport(False, None) is not adapter.get_transport(True, None)
+    finally:
+        state.close()
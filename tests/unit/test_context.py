@@ -0,0 +1,39 @@
+from collections import ChainMap
+
+from pytest_httpchain.context import ScenarioVarsCache
+
+SCENARIO_VARS = {
+    "table": [{"id": n, "owner": "{{ user }}"} for n in range(3)],
+    "auth": "Bearer {{ token }}",
+    "static": {"key": "value"},
+}
+
+
+def test_reused_while_inputs_unchanged():
+    cache = ScenarioVarsCache()
+    global_context = {"user": "alice", "token": "t1"}
+    first = cache.resolve(SCENARIO_VARS, ChainMap({}, global_context))
+    second = cache.resolve(SCENARIO_VARS, ChainMap({}, global_context))
+    assert first["table"][0] == {"id": 0, "owner": "alice"}
+    assert second["table"] is first["table"]
+    assert second["static"] is SCENARIO_VARS["static"]
+
+
+def test_resolved_again_when_input_saved():
+    cache = ScenarioVarsCache()
+    global_context = {"user": "alice", "token": "t1"}
+    first = cache.resolve(SCENARIO_VARS, ChainMap({}, global_context))
+
+    global_context["token"] = "t2"
+    second = cache.resolve(SCENARIO_VARS, ChainMap({}, global_context))
+    assert second["auth"] == "Bearer t2"
+    assert second["table"] is first["table"]
+
+
+def test_resolved_again_when_fixture_differs():
+    cache = ScenarioVarsCache()
+    global_context = {"token": "t1"}
+    first = cache.resolve(SCENARIO_VARS, ChainMap({"user": "alice"}, global_context))
+    second = cache.resolve(SCENARIO_VARS, ChainMap({"user": "bob"}, global_context))
+    assert first["table"][0]["owner"] == "alice"
+    assert second["table"][0]["owner"] == "bob"
@@ -0,0 +1,98 @@
+from collections import ChainMap
+
+import pytest
+import requests
+import responses
+from pytest_httpchain_models.entities import Poll, Scenario
+
+from pytest_httpchain import poll
+from pytest_httpchain.exceptions import VerificationError
+from pytest_httpchain.stage_executor import execute_stage
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls: list[float] = []
+    monkeypatch.setattr(poll.time, "sleep", calls.append)
+    return calls
+
+
+def make_response(status: int = 200, headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b"{}"
+    return response
+
+
+@responses.activate
+def test_stage_polls_until_condition_holds(sleeps):
+    responses.get("http://localhost/jobs/1", json={"state": "running"})
+    responses.get("http://localhost/jobs/1", json={"state": "running"})
+    responses.get("http://localhost/jobs/1", json={"state": "done", "result": 42})
+    scenario = Scenario.model_validate(
+        {
+            "stages": [
+                {
+                    "name": "wait",
+                    "vars": {"expected": "done"},
+                    "request": {"url": "http://localhost/jobs/1"},
+                    "poll": {"until": {"body": {"contains": ["{{ expected }}"]}}, "interval": 0.1, "multiplier": 3},
+                    "response": [{"save": {"vars": {"result": "result"}}}],
+                }
+            ]
+        }
+    )
+
+    with requests.Session() as session:
+        updates = execute_stage(scenario.stages[0], scenario, session, global_context={}, fixture_kwargs={})
+
+    assert updates == {"result": 42}
+    assert sleeps == pytest.approx([0.1, 0.3])
+    assert len(responses.calls) == 3
+
+
+def test_delay_limited_by_max_interval():
+    poller = poll.Poller(Poll.model_validate({"until": {"status": 200}, "interval": 1, "max_interval": 3}), ChainMap())
+    delays = [poller.next_delay(make_response(202)) for _ in range(4)]
+    assert delays == [1, 2, 3, 3]
+
+
+def test_delay_stays_limited_after_many_attempts():
+    poller = poll.Poller(Poll.model_validate({"until": {"status": 200}, "timeout": 1e9, "interval": 0.5, "max_interval": 3}), ChainMap())
+    delays = [poller.next_delay(make_response(202)) for _ in range(2000)]
+    assert delays[:3] == [0.5, 1, 2]
+    assert set(delays[3:]) == {3}
+
+
+def test_jitter_keeps_delay_between_half_and_full():
+    poller = poll.Poller(Poll.model_validate({"until": {"status": 200}, "interval": 4, "multiplier": 1, "jitter": True}), ChainMap())
+    assert all(2 <= poller.next_delay(make_response(202)) <= 4 for _ in range(20))
+
+
+@pytest.mark.parametrize("retry_after, expected", [(True, 7), (False, 1)])
+def test_retry_after_header(retry_after, expected):
+    poller = poll.Poller(Poll.model_validate({"until": {"status": 200}, "retry_after": retry_after}), ChainMap())
+    assert poller.next_delay(make_response(503, {"Retry-After": "7"})) == expected
+
+
+def test_retry_after_http_date():
+    assert poll.retry_after(make_response(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+    assert poll.retry_after(make_response(503, {"Retry-After": "soon"})) is None
+
+
+def test_delay_limited_by_timeout_then_fails():
+    now = [0.0]
+    poller = poll.Poller(Poll.model_validate({"until": {"status": 200}, "timeout": 2.5, "interval": 2}), ChainMap(), clock=lambda: now[0])
+
+    assert poller.next_delay(make_response(202)) == 2
+    now[0] = 2.0
+    assert poller.next_delay(make_response(202)) == 0.5
+    now[0] = 2.5
+    with pytest.raises(VerificationError, match="Poll condition not met after 3 attempts in 2.5s"):
+        poller.next_delay(make_response(202))
+
+
+def test_condition_met_stops_polling():
+    poller = poll.Poller(Poll.model_validate({"until": {"status": 200}}), ChainMap())
+    assert poller.next_delay(make_response(200)) is None
@@ -0,0 +1,84 @@
+import json
+import tempfile
+
+import pytest
+import requests
+import responses
+from pytest_httpchain_models.entities import Request
+
+from pytest_httpchain.exceptions import RequestError
+from pytest_httpchain.request import SPOOL_MEMORY_BYTES, prepare_and_execute
+
+
+@responses.activate
+def test_json_body_encoded_with_backend():
+    responses.post("http://localhost/items", json={})
+    request_model = Request.model_validate({"url": "http://localhost/items", "method": "POST", "body": {"json": {"name": "ü", "tags": [1, 2]}}})
+
+    with requests.Session() as session:
+        prepare_and_execute(session, request_model)
+
+    sent = responses.calls[0].request
+    assert sent.headers["Content-Type"] == "application/json"
+    assert json.loads(sent.body) == {"name": "ü", "tags": [1, 2]}
+
+
+@responses.activate
+def test_json_body_keeps_explicit_content_type():
+    responses.post("http://localhost/items", json={})
+    request_model = Request.model_validate(
+        {
+            "url": "http://localhost/items",
+            "method": "POST",
+            "headers": {"content-type": "application/vnd.api+json"},
+            "body": {"json": {}},
+        }
+    )
+
+    with requests.Session() as session:
+        prepare_and_execute(session, request_model)
+
+    assert responses.calls[0].request.headers["Content-Type"] == "application/vnd.api+json"
+
+
+@responses.activate
+def test_streamed_body_spooled_to_file():
+    body = b"x" * (SPOOL_MEMORY_BYTES + 1)
+    responses.get("http://localhost/export", body=body)
+    request_model = Request.model_validate({"url": "http://localhost/export", "stream": True})
+
+    with requests.Session() as session:
+        response = prepare_and_execute(session, request_model)
+
+    assert isinstance(response.raw, tempfile.SpooledTemporaryFile)
+    assert response.raw._rolled
+    assert response.content == body
+
+
+@responses.activate
+@pytest.mark.parametrize("stream", [True, False])
+def test_body_size_limit(stream):
+    responses.get("http://localhost/export", body=b"x" * 1001)
+    request_model = Request.model_validate({"url": "http://localhost/export", "stream": stream, "max_body_bytes": 1000})
+
+    with requests.Session() as session, pytest.raises(RequestError, match="exceeds 1000 bytes"):
+        prepare_and_execute(session, request_model)
+
+
+@responses.activate
+def test_body_within_size_limit_read_into_memory():
+    responses.get("http://localhost/export", body=b"x" * 1000)
+    request_model = Request.model_validate({"url": "http://localhost/export", "max_body_bytes": 1000})
+
+    with requests.Session() as session:
+        response = prepare_and_execute(session, request_model)
+
+    assert response.content == b"x" * 1000
+
+
+@pytest.mark.parametrize("body", [{"file": "missing.bin"}, {"files": {"report": "missing.bin"}}])
+def test_missing_body_file(body):
+    request_model = Request.model_validate({"url": "http://localhost/upload", "method": "POST", "body": body})
+
+    with requests.Session() as session, pytest.raises(RequestError, match="File not found"):
+        prepare_and_execute(session, request_model)
@@ -0,0 +1,117 @@
+import tempfile
+from collections import ChainMap
+
+import pytest
+import pytest_httpchain_jsonref.backend
+import requests
+from pytest_httpchain_models.entities import ResponseBody, Save, Stage
+
+from pytest_httpchain import response as response_module
+from pytest_httpchain.exceptions import SaveError, VerificationError
+from pytest_httpchain.response import ResponseView, iter_text, process_save_step, response_json, verify_body_text
+from pytest_httpchain.stage_executor import process_response
+
+
+def make_response(content: bytes, content_type: str = "application/json") -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.headers["Content-Type"] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def test_response_json_utf8():
+    assert response_json(make_response('{"name": "ü"}'.encode())) == {"name": "ü"}
+
+
+def test_response_json_declared_encoding():
+    response = make_response('{"name": "ü"}'.encode("latin-1"), "application/json; charset=latin-1")
+    assert response_json(response) == {"name": "ü"}
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-32-le", "utf-8-sig"])
+def test_response_json_detected_encoding(monkeypatch, backend, encoding):
+    pytest.importorskip(backend)
+    monkeypatch.setattr(pytest_httpchain_jsonref.backend, "_current", pytest_httpchain_jsonref.backend.create_backend(backend))
+    response = make_response('{"name": "ü"}'.encode(encoding), "application/octet-stream")
+    assert response_json(response) == {"name": "ü"}
+
+
+def test_save_invalid_json():
+    with pytest.raises(SaveError, match="not valid JSON"):
+        process_save_step(Save(vars={"name": "name"}), make_response(b"<html>"))
+
+
+@pytest.mark.parametrize(
+    "body, error",
+    [
+        ({"contains": ["needle"], "matches": [r"ne+dle \d+"]}, None),
+        ({"contains": ["haystack"]}, "doesn't contain 'haystack'"),
+        ({"not_contains": ["needle"]}, "contains 'needle' while it shouldn't"),
+        ({"matches": [r"^needle"]}, "doesn't match"),
+        ({"not_matches": [r"dle 4"]}, "matches 'dle 4' while it shouldn't"),
+    ],
+)
+def test_body_checks_across_chunks(body, error):
+    chunks = ["...nee", "dl", "e 42..."]
+    if error is None:
+        verify_body_text(ResponseBody.model_validate(body), chunks)
+    else:
+        with pytest.raises(VerificationError, match=error):
+            verify_body_text(ResponseBody.model_validate(body), chunks)
+
+
+def test_iter_text_reads_spooled_body_back():
+    response = make_response(b"", "text/plain; charset=utf-8")
+    spool = tempfile.SpooledTemporaryFile()
+    spool.write("ü".encode() * 100_000)
+    spool.seek(0)
+    response.raw, response._content, response._content_consumed = spool, False, False
+
+    assert "".join(iter_text(response)) == "ü" * 100_000
+    assert response.text == "ü" * 100_000
+
+
+def test_iter_text_in_memory_body():
+    assert list(iter_text(make_response(b'{"a": 1}'))) == ['{"a": 1}']
+
+
+def has_items(response: requests.Response) -> bool:
+    return isinstance(response, ResponseView) and response.json()["count"] == len(response.json()["items"])
+
+
+def test_body_parsed_once_per_stage(monkeypatch):
+    calls = []
+    monkeypatch.setattr(response_module, "response_json", lambda response: calls.append(response) or response_json(response))
+    stage = Stage.model_validate(
+        {
+            "name": "list",
+            "request": {"url": "http://localhost/items"},
+            "response": [
+                {"save": {"vars": {"count": "count"}}},
+                {"verify": {"body": {"schema": {"type": "object", "required": ["items"]}, "contains": ["a"]}}},
+                {"verify": {"functions": ["has_items"]}},
+                {"save": {"vars": {"first": "items[0]"}}},
+            ],
+        }
+    )
+
+    updates = process_response(stage, ChainMap(), make_response(b'{"count": 2, "items": ["a", "b"]}'))
+
+    assert updates == {"count": 2, "first": "a"}
+    assert len(calls) == 1
+
+
+def test_view_json_errors_like_requests():
+    view = ResponseView.of(make_response(b"<html>"))
+    with pytest.raises(requests.JSONDecodeError):
+        view.json()
+
+
+def test_view_xml():
+    view = ResponseView.of(make_response(b"<items><item>a</item></items>", "application/xml"))
+    assert view.xml.find("item").text == "a"
+    assert view.xml is view.xml
+    assert ResponseView.of(view) is view
@@ -0,0 +1,46 @@
+import pytest
+import responses
+from pytest_httpchain_models.entities import Scenario
+
+from pytest_httpchain.scenario_pool import is_eligible, run_scenarios
+
+
+def scenario(name: str, status: int) -> Scenario:
+    return Scenario.model_validate(
+        {
+            "stages": [
+                {
+                    "name": "login",
+                    "request": {"url": f"http://localhost/{name}/login"},
+                    "response": [{"save": {"vars": {"token": "token"}}}],
+                },
+                {
+                    "name": "check",
+                    "request": {"url": f"http://localhost/{name}/check/{{{{ token }}}}"},
+                    "response": [{"verify": {"status": status}}],
+                },
+                {"name": "after", "request": {"url": f"http://localhost/{name}/login"}},
+                {"name": "cleanup", "always_run": True, "request": {"url": f"http://localhost/{name}/login"}},
+            ]
+        }
+    )
+
+
+@responses.activate
+def test_scenarios_keep_separate_state():
+    for name in ("a", "b"):
+        responses.get(f"http://localhost/{name}/login", json={"token": name})
+        responses.get(f"http://localhost/{name}/check/{name}", json={})
+
+    outcomes = run_scenarios([(scenario("a", 200), [0, 1, 2, 3]), (scenario("b", 201), [0, 1, 2, 3])], workers=2)
+
+    assert outcomes[0] == {0: None, 1: None, 2: None, 3: None}
+    assert outcomes[1][0] is None
+    assert isinstance(outcomes[1][1], pytest.fail.Exception)
+    assert isinstance(outcomes[1][2], pytest.skip.Exception)
+    assert outcomes[1][3] is None
+
+
+def test_scenario_with_fixtures_not_eligible():
+    assert is_eligible(scenario("a", 200))
+    assert not is_eligible(Scenario.model_validate({"fixtures": ["server"], "stages": []}))
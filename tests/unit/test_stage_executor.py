@@ -0,0 +1,31 @@
+import requests
+import responses
+from pytest_httpchain_models.entities import Scenario
+
+from pytest_httpchain.stage_executor import execute_stage
+
+
+def make_scenario(stage: dict) -> Scenario:
+    return Scenario.model_validate({"vars": {"base": "http://localhost"}, "stages": [stage]})
+
+
+@responses.activate
+def test_steps_see_vars_saved_before_them():
+    responses.get("http://localhost/items/1", json={"id": 1, "name": "first"})
+    scenario = make_scenario(
+        {
+            "name": "get",
+            "vars": {"item_id": 1},
+            "request": {"url": "{{ base }}/items/{{ item_id }}"},
+            "response": [
+                {"save": {"vars": {"name": "name"}}},
+                {"verify": {"vars": {"name": "first"}}},
+                {"save": {"vars": {"upper": "'{{ name }}'"}}},
+            ],
+        }
+    )
+
+    with requests.Session() as session:
+        updates = execute_stage(scenario.stages[0], scenario, session, global_context={}, fixture_kwargs={})
+
+    assert updates == {"name": "first", "upper": "first"}
@@ -0,0 +1,105 @@
+from pytest_httpchain_models.entities import Scenario
+
+from pytest_httpchain.stage_graph import build_stage_graph
+
+
+def stage(name: str, url: str = "http://localhost", **kwargs) -> dict:
+    return {"name": name, "request": {"url": url}, **kwargs}
+
+
+def save(**variables: str) -> dict:
+    return {"save": {"vars": variables}}
+
+
+def test_fan_out():
+    scenario = Scenario.model_validate(
+        {
+            "stages": [
+                stage("login", response=[save(token="token")]),
+                stage("a", "http://localhost/a?t={{ token }}"),
+                stage("b", "http://localhost/b?t={{ token }}"),
+                stage("c", "http://localhost/c"),
+            ]
+        }
+    )
+    assert build_stage_graph(scenario) == {0: set(), 1: {0}, 2: {0}, 3: set()}
+
+
+def test_write_after_read_and_write():
+    scenario = Scenario.model_validate(
+        {
+            "stages": [
+                stage("read", "http://localhost/{{ item }}"),
+                stage("write", response=[save(item="id")]),
+                stage("overwrite", response=[save(item="id")]),
+                stage("verify", response=[{"verify": {"vars": {"item": 1}}}]),
+            ]
+        }
+    )
+    assert build_stage_graph(scenario) == {0: set(), 1: {0}, 2: {0, 1}, 3: {1, 2}}
+
+
+def test_scenario_vars_read_by_all_stages():
+    scenario = Scenario.model_validate(
+        {
+            "vars": {"auth": "Bearer {{ token }}"},
+            "stages": [stage("login", response=[save(token="token")]), stage("other")],
+        }
+    )
+    assert build_stage_graph(scenario) == {0: set(), 1: {0}}
+
+
+def test_barriers():
+    scenario = Scenario.model_validate(
+        {
+            "stages": [
+                stage("a"),
+                stage("functions", response=[{"save": {"functions": ["module:func"]}}]),
+                stage("b"),
+                stage("c"),
+                stage("cleanup", always_run=True),
+            ]
+        }
+    )
+    assert build_stage_graph(scenario) == {0: set(), 1: {0}, 2: {1}, 3: {1}, 4: {0, 1, 2, 3}}
+
+
+def test_poll_condition_reads():
+    scenario = Scenario.model_validate(
+        {
+            "stages": [
+                stage("start", response=[save(job="id", state="state")]),
+                stage("wait", poll={"until": {"vars": {"state": "done"}, "body": {"contains": ["{{ job }}"]}}}),
+                stage("other"),
+            ]
+        }
+    )
+    assert build_stage_graph(scenario) == {0: set(), 1: {0}, 2: set()}
+
+
+def test_rendered_body_file_is_barrier():
+    scenario = Scenario.model_validate(
+        {
+            "stages": [
+                stage("login", response=[save(token="token")]),
+                {"name": "upload", "request": {"url": "http://localhost", "method": "POST", "body": {"file": "payload.json", "render": True}}},
+                {"name": "raw", "request": {"url": "http://localhost", "method": "POST", "body": {"file": "payload.bin"}}},
+            ]
+        }
+    )
+    assert build_stage_graph(scenario) == {0: set(), 1: {0}, 2: {1}}
+
+
+def test_state_changing_requests_ordered_before_later_stages():
+    scenario = Scenario.model_validate(
+        {
+            "stages": [
+                stage("a"),
+                {"name": "login", "request": {"url": "http://localhost/login", "method": "POST"}},
+                stage("b"),
+                stage("c"),
+                {"name": "head", "request": {"url": "http://localhost", "method": "HEAD"}},
+            ]
+        }
+    )
+    assert build_stage_graph(scenario) == {0: set(), 1: set(), 2: {1}, 3: {1}, 4: {1}}
@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+
+import pytest
+from pytest_httpchain_jsonref.plumbing.cache import DocumentCache
+from pytest_httpchain_models.entities import Scenario
+
+from pytest_httpchain.plugin import JsonModule
+from pytest_httpchain.watch import FileWatcher, ScenarioWatcher, function_modules
+
+
+def touch(path, content):
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def scenarios(tmp_path):
+    touch(tmp_path / "common.json", json.dumps({"url": "http://localhost"}))
+    touch(tmp_path / "test_a.http.json", json.dumps({"stages": [{"name": "a", "request": {"$ref": "common.json"}}]}))
+    touch(tmp_path / "test_b.http.json", json.dumps({"stages": [{"name": "b", "request": {"url": "http://localhost", "auth": "watched_funcs:auth"}}]}))
+    return tmp_path.resolve()
+
+
+@pytest.fixture
+def watcher(pytestconfig, scenarios):
+    watcher = ScenarioWatcher(pytestconfig, module_type=JsonModule, document_cache=DocumentCache(), max_parent_traversal_depth=3)
+    for name in ("test_a.http.json", "test_b.http.json"):
+        watcher.scenarios[scenarios / name] = None
+        watcher._track(scenarios / name)
+    return watcher
+
+
+def test_file_watcher(tmp_path):
+    path = tmp_path / "file.json"
+    touch(path, "{}")
+    files = FileWatcher()
+    files.watch([path])
+    assert files.poll() == set()
+
+    touch(path, '{"changed": true}')
+    assert files.poll() == {path}
+    assert files.poll() == set()
+
+    path.unlink()
+    assert files.poll() == {path}
+
+
+def test_ref_target_change(watcher, scenarios):
+    touch(scenarios / "common.json", json.dumps({"url": "http://example.com"}))
+    changed = watcher.files.poll()
+    assert changed == {scenarios / "common.json"}
+    assert watcher.affected_scenarios(changed) == {scenarios / "test_a.http.json"}
+
+
+def test_scenario_change(watcher, scenarios):
+    touch(scenarios / "test_b.http.json", json.dumps({"stages": []}))
+    assert watcher.affected_scenarios(watcher.files.poll()) == {scenarios / "test_b.http.json"}
+
+
+def test_user_function_module_change(watcher, scenarios, monkeypatch):
+    module_path = scenarios / "watched_funcs.py"
+    touch(module_path, "VALUE = 1\n")
+    monkeypatch.syspath_prepend(scenarios)
+    import watched_funcs
+
+    monkeypatch.setitem(sys.modules, "watched_funcs", watched_funcs)
+    watcher.modules = {module_path: "watched_funcs"}
+    watcher.files.watch([module_path])
+
+    touch(module_path, "VALUE = 22\n")
+    assert watcher.affected_scenarios(watcher.files.poll()) == {scenarios / "test_b.http.json"}
+    assert watched_funcs.VALUE == 22
+
+
+def test_function_modules():
+    scenario = Scenario.model_validate(
+        {
+            "auth": "pkg.auth:login",
+            "stages": [
+                {
+                    "name": "a",
+                    "request": {"url": "http://localhost", "body": {"generator": {"function": "pkg.bodies:lines", "kwargs": {}}}},
+                    "response": [{"verify": {"functions": ["checks"]}}, {"save": {"functions": [{"function": "pkg.save:extract"}]}}],
+                }
+            ],
+        }
+    )
+    assert function_modules(scenario) == {"pkg.auth", "pkg.bodies", "pkg.save"}
+    assert function_modules(Scenario.model_validate({"auth": "{{ module }}:login"})) is None
+
+
+def test_module_matched_by_name_not_substring(watcher, scenarios, monkeypatch):
+    touch(scenarios / "test_b.http.json", json.dumps({"stages": [{"name": "b", "request": {"url": "http://localhost", "auth": "pkg.watched_funcs:auth"}}]}))
+    watcher._track(scenarios / "test_b.http.json")
+    assert watcher._calls_module(scenarios / "test_b.http.json", "pkg.watched_funcs")
+    assert watcher._calls_module(scenarios / "test_b.http.json", "pkg")
+    assert not watcher._calls_module(scenarios / "test_b.http.json", "watched_funcs")
+    assert not watcher._calls_module(scenarios / "test_b.http.json", "pkg.watched")
+
+
+def test_conftest_change_needs_restart(watcher, scenarios):
+    watcher.modules = {scenarios / "conftest.py": "conftest", scenarios / "funcs.py": "funcs"}
+    assert watcher.needs_restart({scenarios / "conftest.py"})
+    assert not watcher.needs_restart({scenarios / "funcs.py", scenarios / "common.json"})
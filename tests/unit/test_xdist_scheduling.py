@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("xdist")
+
+from pytest_httpchain.xdist_scheduling import ScenarioScheduling  # noqa: E402
+
+
+class MockNode:
+    def __init__(self):
+        self.sent: list[int] = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices: list[int]) -> None:
+        self.sent.extend(indices)
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+COLLECTION = [
+    "test_a.http.json::a::test_0_login",
+    "test_a.http.json::a::test_1_check",
+    "test_b.http.json::b::test_0_login",
+    "test_b.http.json::b::test_1_check",
+    "test_b.http.json::b::test_2_check",
+    "test_b.http.json::b::test_3_check",
+    "test_c.http.json::c::test_0_export",
+]
+
+
+def schedule(pytester: pytest.Pytester, durations: dict[str, float]) -> list[str]:
+    config = pytester.parseconfig("--tx", "popen")
+    scheduler = ScenarioScheduling(config, durations=durations)
+    node = MockNode()
+    scheduler.add_node(node)
+    scheduler.add_node_collection(node, COLLECTION)
+    scheduler.schedule()
+    # Complete tests as they are sent until all work units are handed out
+    completed: set[int] = set()
+    while not node.shutting_down:
+        for index in [index for index in node.sent if index not in completed]:
+            completed.add(index)
+            scheduler.mark_test_complete(node, index)
+    return [COLLECTION[index] for index in node.sent]
+
+
+def test_stage_count_fallback(pytester):
+    sent = schedule(pytester, {})
+    assert [nodeid.split("::")[1] for nodeid in sent] == ["b"] * 4 + ["a"] * 2 + ["c"]
+
+
+def test_recorded_durations(pytester):
+    sent = schedule(pytester, {"test_a.http.json::a": 40.0, "test_c.http.json::c": 50.0})
+    # b has no recorded duration, it is estimated at 30s per test, the average of known scenarios
+    assert [nodeid.split("::")[1] for nodeid in sent] == ["b"] * 4 + ["c"] + ["a"] * 2